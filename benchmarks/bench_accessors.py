@@ -0,0 +1,50 @@
+"""
+Benchmark reading and writing item properties through the mapping paths.
+
+Usage:
+    python benchmarks/bench_accessors.py
+"""
+from common import build_bundle, print_table, timeit
+
+from helixapi.setlists import Setlists
+
+
+def main():
+    data, metadata = build_bundle()
+    setlists = Setlists(data=data)
+    presets = [preset for setlist in setlists for preset in setlist.presets]
+    snapshots = [snapshot for preset in presets for snapshot in preset.snapshots]
+
+    def read_names():
+        for snapshot in snapshots:
+            snapshot.name
+
+    def read_ledcolors():
+        for snapshot in snapshots:
+            snapshot.ledcolor
+
+    def write_names():
+        for snapshot in snapshots:
+            snapshot.name = "SNAP"
+
+    def read_preset_fields():
+        for preset in presets:
+            preset.name, preset.author
+
+    def standardize():
+        for snapshot in snapshots:
+            snapshot.standardize()
+
+    rows = [
+        ["8192 snapshot.name reads", f"{timeit(read_names):.2f}"],
+        ["8192 snapshot.ledcolor reads", f"{timeit(read_ledcolors):.2f}"],
+        ["8192 snapshot.name writes", f"{timeit(write_names):.2f}"],
+        ["1024 x 2 preset field reads", f"{timeit(read_preset_fields):.2f}"],
+        ["standardize 8192 snapshots", f"{timeit(standardize, repeat=3):.2f}"],
+    ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
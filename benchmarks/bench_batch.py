@@ -0,0 +1,61 @@
+"""
+Benchmark a scripted bulk edit with and without a batch.
+
+Usage:
+    python benchmarks/bench_batch.py
+"""
+from common import build_bundle, print_table, timeit
+
+from helixapi.midi import MIDI
+from helixapi.setlists import Setlists
+from helixapi.utils.batch import Batch
+
+
+class CountingTargets(list):
+    """A MIDI target counting the messages sent to it."""
+    def __init__(self):
+        super().__init__(["port"])
+        self.system = self
+        self.sent = 0
+
+    def send_cc(self, port, channel, control, value):
+        self.sent += 1
+
+    def send_pc(self, port, channel, program):
+        self.sent += 1
+
+
+def bulk_edit(setlists):
+    """Rename and activate every preset of a setlist, then every snapshot of one preset."""
+    presets = setlists[0].presets
+    for preset in presets:
+        preset.name = preset.name.lower()
+        presets.active_index = preset.index
+    for snapshot in presets[0].snapshots:
+        presets[0].snapshots.active_index = snapshot.index
+
+
+def main():
+    data, metadata = build_bundle()
+    targets = CountingTargets()
+    MIDI().commands.targets = targets
+    setlists = Setlists(data=data)
+
+    def unbatched():
+        bulk_edit(setlists)
+
+    def batched():
+        with Batch(data):
+            bulk_edit(setlists)
+
+    rows = []
+    for label, func in (("no batch", unbatched), ("batch", batched)):
+        targets.sent = 0
+        func()
+        rows.append([label, targets.sent, f"{timeit(func):.2f}"])
+
+    print_table(['', 'MIDI messages', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
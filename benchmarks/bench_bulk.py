@@ -0,0 +1,55 @@
+"""
+Benchmark setting the LED color of every snapshot of a full bundle.
+
+Usage:
+    python benchmarks/bench_bulk.py
+"""
+import itertools
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.bulk import BulkItems
+from helixapi.setlists import Setlists
+from helixapi.snapshot import LEDColor
+from helixapi.utils.journal import Journal
+
+# every run sets another color, so every snapshot is written
+COLORS = itertools.cycle(LEDColor)
+
+
+def set_each(snapshots):
+    color = next(COLORS)
+    for snapshot in snapshots:
+        snapshot.ledcolor = color
+
+
+def walk_and_set(setlists):
+    color = next(COLORS)
+    for setlist in setlists:
+        for preset in setlist.presets:
+            for snapshot in preset.snapshots:
+                snapshot.ledcolor = color
+
+
+def main():
+    data, _ = build_bundle()
+    setlists = Setlists(data=data)
+    snapshots = [snapshot for setlist in setlists for preset in setlist.presets for snapshot in preset.snapshots]
+    bulk = BulkItems(data, 'snapshot')
+    assert bulk.set_where(ledcolor=LEDColor.RED) == len(snapshots) == 8192
+
+    rows = [
+        ["walk the items, snapshot.ledcolor = ...", f"{timeit(lambda: walk_and_set(setlists), repeat=3):.2f}"],
+        ["snapshot.ledcolor = ... x 8192 (items kept)", f"{timeit(lambda: set_each(snapshots), repeat=3):.2f}"],
+        ["set_where(ledcolor=...)", f"{timeit(lambda: bulk.set_where(ledcolor=next(COLORS)), repeat=3):.2f}"],
+        ["set_where(name_regex=..., ledcolor=...), 1024 matches", f"{timeit(lambda: bulk.set_where(snapshot_index=3, name_regex='^SNAPSHOT', ledcolor=next(COLORS)), repeat=3):.2f}"],
+    ]
+    journal = Journal(data)
+    rows.append(["set_where(ledcolor=...), journaled", f"{timeit(lambda: bulk.set_where(ledcolor=next(COLORS)), repeat=3):.2f}"])
+    journal.clear()
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark importing a full bundle with and without the decoded cache.
+
+Usage:
+    python benchmarks/bench_cache.py
+"""
+import os
+import tempfile
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.utils.files import Files
+from helixapi.utils.json_backend import available_backends, set_backend
+from helixapi.utils.settings import Settings
+
+
+def main():
+    data, metadata = build_bundle()
+    settings = Settings().settings
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "bundle.hlb")
+        Files._export_file(file_path, data, metadata)
+
+        for backend in available_backends():
+            set_backend(backend)
+            settings["cache"] = None
+            cold = timeit(lambda: Files._import_file(file_path), repeat=3)
+            cold_lazy = timeit(lambda: Files._import_file(file_path, lazy=True), repeat=3)
+
+            settings["cache"] = {"directory": os.path.join(directory, backend), "max_size": 256}
+            Files._import_file(file_path)
+            hit = timeit(lambda: Files._import_file(file_path), repeat=3)
+            hit_lazy = timeit(lambda: Files._import_file(file_path, lazy=True), repeat=3)
+            rows.append([
+                backend,
+                f"{cold:.1f}",
+                f"{hit:.1f}",
+                f"{cold / hit:.1f}x",
+                f"{cold_lazy:.1f}",
+                f"{hit_lazy:.1f}",
+                f"{cold / hit_lazy:.0f}x",
+            ])
+
+    print_table(['backend', 'cold (ms)', 'hit (ms)', 'speedup', 'cold lazy (ms)', 'hit lazy (ms)', 'lazy hit vs cold'], rows)
+
+
+if __name__ == '__main__':
+    main()
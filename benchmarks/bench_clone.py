@@ -0,0 +1,28 @@
+"""
+Benchmark cloning presets, snapshots and setlists of a full bundle.
+
+Usage:
+    python benchmarks/bench_clone.py
+"""
+from common import build_bundle, print_table, timeit
+
+from helixapi.setlists import Setlists
+
+
+def main():
+    data, metadata = build_bundle()
+    setlists = Setlists(data=data)
+    presets = setlists[0].presets
+    snapshots = presets[0].snapshots
+
+    rows = [
+        ["presets.clone(0, 1)", f"{timeit(lambda: presets.clone(0, 1)):.2f}"],
+        ["snapshots.clone(0, 1)", f"{timeit(lambda: snapshots.clone(0, 1)):.2f}"],
+        ["setlists.clone(0, 1)", f"{timeit(lambda: setlists.clone(0, 1), repeat=3):.2f}"],
+    ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Benchmark reading the metadata of every preset and snapshot of a full bundle.
+
+Usage:
+    python benchmarks/bench_columns.py
+"""
+from common import build_bundle, print_table, timeit
+
+from helixapi.columns import to_columns
+from helixapi.setlists import Setlists
+
+
+def walk(setlists):
+    # the previous way: one property at a time through the items (band and song raise when not set)
+    rows = []
+    for setlist in setlists:
+        for preset in setlist.presets:
+            for snapshot in preset.snapshots:
+                rows.append((
+                    setlist.index, preset.index, snapshot.index, setlist.name, preset.name, preset.author,
+                    preset._get_data("band", None), preset._get_data("song", None), preset.tempo, snapshot.name, snapshot.ledcolor,
+                ))
+    return rows
+
+
+def main():
+    data, _ = build_bundle()
+    setlists = Setlists(data=data)
+    assert len(walk(setlists)) == len(to_columns(data)) == 8192
+
+    columns = to_columns(data)
+    rows = [
+        ["walk the items (8192 snapshots)", f"{timeit(lambda: walk(setlists), repeat=3):.2f}"],
+        ["to_columns()", f"{timeit(lambda: to_columns(data)):.2f}"],
+        ["to_columns(level='preset')", f"{timeit(lambda: to_columns(data, level='preset')):.2f}"],
+        ["Columns.to_csv()", f"{timeit(columns.to_csv):.2f}"],
+    ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark the export compression profiles on a full bundle.
+
+Usage:
+    python benchmarks/bench_compression.py
+"""
+import os
+import tempfile
+import zlib
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.utils.files import CompressionProfile, Files
+
+
+def compress(data, profile):
+    compressor = zlib.compressobj(**profile.options)
+    return compressor.compress(data) + compressor.flush()
+
+
+def main():
+    data, metadata = build_bundle()
+    compact = Files._dumps_compact(data)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in CompressionProfile:
+            file_path = os.path.join(directory, f"{profile.value}.hlb")
+            export_time = timeit(lambda: Files._export_file(file_path, data, dict(metadata), compression=profile), repeat=3)
+            compress_time = timeit(lambda: compress(compact, profile), repeat=3)
+            import_time = timeit(lambda: Files._import_file(file_path), repeat=3)
+            rows.append([
+                profile.value,
+                f"{len(compress(compact, profile)) / 1024:.0f}",
+                f"{os.path.getsize(file_path) / 1024:.0f}",
+                f"{compress_time:.1f}",
+                f"{export_time:.1f}",
+                f"{import_time:.1f}",
+            ])
+
+    print(f"decompressed size: {len(compact) / 1024:.0f} KiB")
+    print_table(['profile', 'compressed (KiB)', 'file (KiB)', 'compress (ms)', 'export (ms)', 'import (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
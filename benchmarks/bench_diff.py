@@ -0,0 +1,69 @@
+"""
+Benchmark diffing two full bundles that differ in one preset.
+
+Usage:
+    python benchmarks/bench_diff.py
+"""
+import marshal
+import os
+import tempfile
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.diff import MerkleTree, diff, diff_files
+from helixapi.utils.files import Files
+
+
+def naive_diff(old, new, path, changes):
+    # compare every value of both bundles
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old.keys() | new.keys():
+            naive_diff(old.get(key), new.get(key), path + [key], changes)
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for index, (old_value, new_value) in enumerate(zip(old, new)):
+            naive_diff(old_value, new_value, path + [index], changes)
+    elif old != new:
+        changes.append(('.'.join(str(part) for part in path), old, new))
+    return changes
+
+
+def main():
+    old, metadata = build_bundle()
+    new = marshal.loads(marshal.dumps(old))
+    new['setlists'][5]['presets'][77]['data']['tone']['dsp0']['inputA']['@input'] = 7
+    # a bundle with a change in every setlist, where nothing can be skipped
+    changed = marshal.loads(marshal.dumps(new))
+    for setlist in changed['setlists']:
+        setlist['presets'][0]['data']['tone']['dsp0']['inputA']['@input'] = 7
+
+    naive_changes = naive_diff(old, new, [], [])
+    changes = diff(old, new)
+    assert len(naive_changes) == len(changes) == 1, (naive_changes, changes)
+
+    old_tree, new_tree = MerkleTree(old), MerkleTree(new)
+    diff(old_tree, new_tree)
+    with tempfile.TemporaryDirectory() as directory:
+        old_path = os.path.join(directory, "old.hlb")
+        new_path = os.path.join(directory, "new.hlb")
+        Files._export_file(file_path=old_path, data=old, metadata=metadata)
+        Files._export_file(file_path=new_path, data=new, metadata=metadata)
+        changed_path = os.path.join(directory, "changed.hlb")
+        Files._export_file(file_path=changed_path, data=changed, metadata=metadata)
+        assert len(diff_files(old_path, new_path)) == 1
+        rows = [
+            ["full recursive compare", f"{timeit(lambda: naive_diff(old, new, [], []), repeat=3):.2f}"],
+            ["diff(old, new)", f"{timeit(lambda: diff(old, new), repeat=3):.2f}"],
+            ["diff(old_tree, new), old tree kept", f"{timeit(lambda: diff(old_tree, new), repeat=3):.2f}"],
+            ["diff(old_tree, new_tree), both trees kept", f"{timeit(lambda: diff(old_tree, new_tree)):.2f}"],
+            ["diff_files(old, new), lazy import", f"{timeit(lambda: diff_files(old_path, new_path), repeat=3):.2f}"],
+            ["import both files, diff(old, new)", f"{timeit(lambda: diff(Files._import_file(old_path)[0], Files._import_file(new_path)[0]), repeat=3):.2f}"],
+            ["import both files only", f"{timeit(lambda: (Files._import_file(old_path), Files._import_file(new_path)), repeat=3):.2f}"],
+            ["diff_files(old, changed), every setlist changed", f"{timeit(lambda: diff_files(old_path, changed_path), repeat=3):.2f}"],
+            ["import both files, diff(old, changed)", f"{timeit(lambda: diff(Files._import_file(old_path)[0], Files._import_file(changed_path)[0]), repeat=3):.2f}"],
+        ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
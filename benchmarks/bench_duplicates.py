@@ -0,0 +1,65 @@
+"""
+Benchmark finding duplicate presets in a bundle and in a library of preset files.
+
+Usage:
+    python benchmarks/bench_duplicates.py
+"""
+import os
+import tempfile
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.duplicates import ToneHashCache, find_duplicate_files, find_duplicates
+from helixapi.utils.files import Files
+from helixapi.utils.settings import Settings
+
+
+def main():
+    data, _ = build_bundle()
+    # every fourth preset is a copy of the one before it, under another name
+    for setlist in data['setlists']:
+        for index in range(1, len(setlist['presets']), 4):
+            copy = dict(setlist['presets'][index - 1])
+            copy['data'] = dict(copy['data'], meta=dict(copy['data']['meta'], name=f"COPY {index}", modifieddate=index))
+            setlist['presets'][index] = copy
+    presets = [preset for setlist in data['setlists'] for preset in setlist['presets']]
+    groups = find_duplicates(data)
+    assert len(groups) == len(presets) // 4, len(groups)
+
+    with tempfile.TemporaryDirectory() as directory:
+        library = os.path.join(directory, "library")
+        os.makedirs(library)
+        file_paths = []
+        for index, preset in enumerate(presets):
+            file_path = os.path.join(library, f"{index:04}.hlx")
+            Files._export_file(file_path=file_path, data=preset, metadata=None)
+            file_paths.append(file_path)
+        Settings().settings["cache"] = {"directory": os.path.join(directory, "cache"), "max_size": 256}
+
+        def cold():
+            ToneHashCache._entries = {}
+            ToneHashCache._loaded_from = ToneHashCache()._path
+            find_duplicate_files(library)
+
+        def saved():
+            ToneHashCache.clear()
+            find_duplicate_files(library)
+
+        def changed():
+            for file_path in file_paths[:10]:
+                os.utime(file_path, ns=(os.stat(file_path).st_mtime_ns + 1,) * 2)
+            find_duplicate_files(library)
+
+        rows = [
+            ["find_duplicates(bundle), 1024 presets", f"{timeit(lambda: find_duplicates(data)):.2f}"],
+            ["first scan of 1024 .hlx files", f"{timeit(cold, repeat=3):.2f}"],
+            ["rescan, hashes in memory", f"{timeit(lambda: find_duplicate_files(library)):.2f}"],
+            ["rescan, hashes loaded from the cache directory", f"{timeit(saved):.2f}"],
+            ["rescan, 10 files changed", f"{timeit(changed):.2f}"],
+        ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark reading the envelope of a full bundle: parsing the whole file against decoding
+"encoded_data" in place from a memory map.
+
+Usage:
+    python benchmarks/bench_envelope.py
+"""
+import mmap
+import os
+import tempfile
+import tracemalloc
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.utils.files import CompressionProfile, Files
+from helixapi.utils.json_backend import available_backends, get_backend, set_backend
+
+
+def read_parse(file_path):
+    with open(file_path, 'rb') as file:
+        metadata = get_backend().loads(file.read())
+    return Files._decode_stream(metadata.pop('encoded_data'))
+
+
+def read_mmap(file_path):
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as raw_data:
+            return Files._decode_envelope(raw_data)
+
+
+def peak(func):
+    """Peak memory allocated by a function, in KiB."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    data, metadata = build_bundle()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in (CompressionProfile.FAST, CompressionProfile.SMALLEST):
+            file_path = os.path.join(directory, f"{profile.value}.hlb")
+            Files._export_file(file_path, data, dict(metadata), compression=profile)
+            for backend in available_backends():
+                set_backend(backend)
+                rows.append([
+                    f"{os.path.getsize(file_path) / 1024:.0f}",
+                    backend,
+                    f"{timeit(lambda: read_parse(file_path), repeat=20):.2f}",
+                    f"{timeit(lambda: read_mmap(file_path), repeat=20):.2f}",
+                    f"{peak(lambda: read_parse(file_path)):.0f}",
+                    f"{peak(lambda: read_mmap(file_path)):.0f}",
+                ])
+
+    print_table(['file (KiB)', 'backend', 'read + parse (ms)', 'mmap (ms)', 'read + parse peak (KiB)', 'mmap peak (KiB)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark serial and parallel bulk exports of preset and setlist files.
+
+Usage:
+    python benchmarks/bench_export.py
+"""
+import os
+import tempfile
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.setlists import Setlists
+
+
+def main():
+    data, metadata = build_bundle()
+    setlists = Setlists(data=data)
+
+    def export_presets(max_workers):
+        with tempfile.TemporaryDirectory() as directory:
+            for setlist in setlists:
+                setlist.presets._export_files(directory, generic_names=True, max_workers=max_workers)
+
+    def export_setlists(max_workers):
+        with tempfile.TemporaryDirectory() as directory:
+            setlists.export_setlists(directory, max_workers=max_workers)
+
+    rows = []
+    for max_workers in (1, 2, 4, None):
+        rows.append([
+            max_workers or f"None ({os.cpu_count()})",
+            f"{timeit(lambda: export_presets(max_workers), repeat=3):.0f}",
+            f"{timeit(lambda: export_setlists(max_workers), repeat=3):.0f}",
+        ])
+
+    print_table(['max_workers', '1024 .hlx from 8 setlists (ms)', '8 .hls of 128 presets (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark serial and parallel bulk imports of preset and setlist files.
+
+Usage:
+    python benchmarks/bench_import.py
+"""
+import os
+import tempfile
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.setlists import Setlists
+from helixapi.utils.files import Files
+
+
+def main():
+    data, metadata = build_bundle()
+    setlists = Setlists(data=data)
+
+    with tempfile.TemporaryDirectory() as directory:
+        preset_paths = []
+        for setlist_index, setlist in enumerate(setlists):
+            for preset_index, preset in enumerate(setlist.presets):
+                file_path = os.path.join(directory, f"preset_{setlist_index}_{preset_index}.hlx")
+                preset.export_preset(file_path)
+                preset_paths.append(file_path)
+        setlist_paths = []
+        for setlist_index, setlist in enumerate(setlists):
+            file_path = os.path.join(directory, f"setlist_{setlist_index}.hls")
+            setlist.export_setlist(file_path)
+            setlist_paths.append(file_path)
+
+        def import_presets(max_workers):
+            for setlist_index, setlist in enumerate(setlists):
+                setlist.presets.import_presets(preset_paths[setlist_index * 128:(setlist_index + 1) * 128], max_workers=max_workers)
+
+        rows = []
+        for max_workers in (1, 2, 4, None):
+            rows.append([
+                max_workers or f"None ({os.cpu_count()})",
+                f"{timeit(lambda: import_presets(max_workers), repeat=3):.0f}",
+                f"{timeit(lambda: setlists.import_setlists(setlist_paths, max_workers=max_workers), repeat=3):.0f}",
+            ])
+
+    print_table(['max_workers', '1024 .hlx into 8 setlists (ms)', '8 .hls of 128 presets (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark undoing edits with the journal, against the previous ways to get a bundle back.
+
+Usage:
+    python benchmarks/bench_journal.py
+"""
+import copy
+import os
+import tempfile
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.setlists import Setlists
+from helixapi.utils.files import Files
+from helixapi.utils.journal import Journal
+
+
+def rename_all(presets):
+    for preset in presets:
+        preset.name = preset.name.lower()
+
+
+def main():
+    data, metadata = build_bundle()
+    setlists = Setlists(data=data)
+    presets = [preset for setlist in setlists for preset in setlist.presets]
+    rename_all(presets)
+    unjournaled = timeit(lambda: rename_all(presets))
+
+    journal = Journal(data)
+    journaled = timeit(lambda: rename_all(presets))
+
+    def undo_all():
+        while journal.undo():
+            pass
+
+    def redo_all():
+        while journal.redo():
+            pass
+
+    journal.clear()
+    rename_all(presets)
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "bundle.hlb")
+        Files._export_file(file_path=file_path, data=data, metadata=metadata)
+        rows = [
+            ["rename 1024 presets, no journal", f"{unjournaled:.2f}"],
+            ["rename 1024 presets, journaled", f"{journaled:.2f}"],
+            ["journal.undo() x 1024", f"{timeit(lambda: (undo_all(), redo_all()), repeat=3) / 2:.2f}"],
+            ["checkpoint: copy.deepcopy(bundle)", f"{timeit(lambda: copy.deepcopy(data), repeat=3):.2f}"],
+            ["re-import the bundle", f"{timeit(lambda: Files._import_file(file_path), repeat=3):.2f}"],
+        ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark the JSON backends on the encode/decode steps used by import and export.
+
+Usage:
+    python benchmarks/bench_json_backend.py
+"""
+import base64
+import zlib
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.utils.json_backend import available_backends, get_backend, set_backend
+
+
+def main():
+    data, metadata = build_bundle()
+    presets = [preset for setlist in data['setlists'] for preset in setlist['presets']]
+
+    rows = []
+    for name in available_backends():
+        set_backend(name)
+        backend = get_backend()
+        compact = backend.dumps_compact(data)
+        envelope = dict(metadata, encoded_data=base64.b64encode(zlib.compress(compact)).decode('utf-8'))
+        rows.append([
+            name,
+            f"{timeit(lambda: backend.loads(compact)):.1f}",
+            f"{timeit(lambda: backend.dumps_compact(data)):.1f}",
+            f"{timeit(lambda: backend.dumps_pretty(envelope)):.1f}",
+            f"{timeit(lambda: [backend.dumps_pretty(preset) for preset in presets]):.1f}",
+        ])
+    set_backend()
+
+    print_table(['backend', 'bundle loads (ms)', 'bundle compact dumps (ms)', 'bundle envelope dumps (ms)', '1024 .hlx pretty dumps (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark the memory used by the item objects of a loaded bundle.
+
+Usage:
+    python benchmarks/bench_memory.py
+"""
+import gc
+import tracemalloc
+
+from common import build_bundle, print_table
+
+from helixapi.setlists import Setlists
+
+
+def create_all(setlists):
+    """Access every setlist, preset and snapshot so all item objects exist."""
+    for setlist in setlists:
+        for preset in setlist.presets:
+            for snapshot in preset.snapshots:
+                pass
+    return setlists
+
+
+def main():
+    data, metadata = build_bundle()
+    # create (and cache) everything shared between bundles first, so only per-bundle objects are counted
+    create_all(Setlists(data=data))
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    setlists = create_all(Setlists(data=data))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    presets = [preset for setlist in setlists for preset in setlist.presets]
+    snapshots = [snapshot for preset in presets for snapshot in preset.snapshots]
+    items = len(setlists) + len(presets) + len(snapshots)
+
+    print_table(['item objects', 'bytes per bundle', 'bytes per item'], [[items, used, f"{used / items:.0f}"]])
+
+
+if __name__ == '__main__':
+    main()
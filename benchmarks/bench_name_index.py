@@ -0,0 +1,47 @@
+"""
+Benchmark finding a preset by name in a full bundle, with and without the name index.
+
+Usage:
+    python benchmarks/bench_name_index.py
+"""
+from common import build_bundle, print_table, timeit
+
+from helixapi.setlists import Setlists
+from helixapi.utils.name_index import NameIndex
+
+NAME = "SET7 PRE100"
+
+
+def linear_scan(setlists):
+    """Find the preset by walking every preset."""
+    return [(setlist.index, preset.index) for setlist in setlists for preset in setlist.presets if preset.name == NAME]
+
+
+def rename_all(presets):
+    for preset in presets:
+        preset.name = preset.name
+
+
+def main():
+    data, metadata = build_bundle()
+    setlists = Setlists(data=data)
+    linear_scan(setlists)
+    presets = [preset for setlist in setlists for preset in setlist.presets]
+    unindexed = timeit(lambda: rename_all(presets))
+
+    index = setlists.name_index
+
+    rows = [
+        ["linear scan over 1024 presets", f"{timeit(lambda: linear_scan(setlists)):.3f}"],
+        ["build the index (1024 presets, 8192 snapshots)", f"{timeit(lambda: NameIndex(data), repeat=3):.3f}"],
+        ["index.find_presets(name)", f"{timeit(lambda: index.find_presets(NAME)):.3f}"],
+        ["index.find_presets(prefix, ignore_case=True)", f"{timeit(lambda: index.find_presets('set7 pre10', prefix=True, ignore_case=True)):.3f}"],
+        ["rename 1024 presets, no index", f"{unindexed:.3f}"],
+        ["rename 1024 presets, indexed", f"{timeit(lambda: rename_all(presets)):.3f}"],
+    ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark finding presets in a full bundle and in a library of bundle files.
+
+Usage:
+    python benchmarks/bench_query.py
+"""
+import os
+import re
+import tempfile
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.query import Query
+from helixapi.setlists import Setlists
+from helixapi.utils.files import Files
+
+LIBRARY_SIZE = 8
+PATTERN = re.compile("PRE1[0-9]$")
+
+
+def nested_loops(data):
+    """Find presets the way it was done before, through the item objects."""
+    return [
+        preset for setlist in Setlists(data=data) for preset in setlist.presets
+        if PATTERN.search(preset.name) and preset.tempo <= 0.5
+    ]
+
+
+def main():
+    data, metadata = build_bundle()
+    found = len(Query(data).presets(name=PATTERN, tempo_range=(None, 0.5)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_paths = [os.path.join(directory, f"bundle_{index}.hlb") for index in range(LIBRARY_SIZE)]
+        for file_path in file_paths:
+            Files._export_file(file_path=file_path, data=data, metadata=metadata)
+
+        rows = [
+            [f"nested loops over the items ({found} found)", f"{timeit(lambda: nested_loops(data), repeat=3):.2f}"],
+            ["Query(data).presets(...)", f"{timeit(lambda: Query(data).presets(name=PATTERN, tempo_range=(None, 0.5))):.2f}"],
+            [f"read {LIBRARY_SIZE} bundle files", f"{timeit(lambda: [Files._import_file(file_path) for file_path in file_paths], repeat=3):.2f}"],
+            [f"Query.files({LIBRARY_SIZE} bundle files).presets(...)", f"{timeit(lambda: Query.files(file_paths).presets(name=PATTERN, tempo_range=(None, 0.5)), repeat=3):.2f}"],
+        ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
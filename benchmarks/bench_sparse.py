@@ -0,0 +1,47 @@
+"""
+Benchmark browsing a sparse bundle (every preset slot empty).
+
+Usage:
+    python benchmarks/bench_sparse.py
+"""
+import gc
+import tracemalloc
+
+from common import print_table, timeit
+
+from helixapi.setlists import Setlists
+from helixapi.utils.files import Files, TemplatePath
+
+
+def read_names(data):
+    """Read the name and author of every preset."""
+    setlists = Setlists(data=data)
+    for setlist in setlists:
+        for preset in setlist.presets:
+            preset.name, preset.author
+    return setlists
+
+
+def main():
+    data, _ = Files._import_file(TemplatePath.BUNDLE.value)
+    read_names(Files._import_file(TemplatePath.BUNDLE.value)[0])
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    setlists = read_names(data)
+    del setlists
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    filled = sum(1 for setlist in data['setlists'] for preset in setlist['presets'] if preset)
+    elapsed = timeit(lambda: read_names(Files._import_file(TemplatePath.BUNDLE.value)[0]), repeat=3)
+
+    print_table(['operation', 'time (ms)', 'slots filled', 'bundle data growth (bytes)'], [
+        ["read 1024 preset names and authors", f"{elapsed:.2f}", filled, used],
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark standardizing the setlist, preset and snapshot names of a full bundle.
+
+Usage:
+    python benchmarks/bench_standards.py
+"""
+import re
+import time
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.bulk import standardize_all
+from helixapi.setlists import Setlists
+from helixapi.utils.standards import Standards
+
+
+def apply_uncompiled(standards, item_name, item_type):
+    # the rules applied as they were before they were compiled: re.sub per pattern, per call
+    rules = standards.get(item_type, {})
+    for replacement, patterns in rules.get('replacements', {}).items():
+        for pattern in patterns:
+            item_name = re.sub(pattern, replacement, item_name, flags=re.IGNORECASE)
+    casing = rules.get('casing', '').lower()
+    if casing == 'uppercase':
+        item_name = item_name.upper()
+    return item_name
+
+
+def rename(data):
+    # names the standards change: lowercase, with underscores
+    for setlist in data['setlists']:
+        for preset in setlist['presets']:
+            preset['data']['meta']['name'] = preset['data']['meta']['name'].lower().replace(' ', '_')
+            for key, snapshot in preset['data']['tone'].items():
+                if key.startswith('snapshot'):
+                    snapshot['@name'] = snapshot['@name'].lower().replace(' ', '_')
+
+
+def time_with_setup(setup, func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    data, _ = build_bundle()
+    setlists = Setlists(data=data)
+    standards = Standards()
+    rules = Standards._standards_cache
+    rename(data)
+    names = [(snapshot._get_data('name'), 'snapshot') for setlist in setlists for preset in setlist.presets for snapshot in preset.snapshots]
+    names += [(preset._get_data('name'), 'preset') for setlist in setlists for preset in setlist.presets]
+    items = [item for setlist in setlists for preset in setlist.presets for item in (preset, *preset.snapshots)]
+    assert len(standardize_all(data)) == len(names) == 9216
+
+    rows = [
+        [f"Standards.apply, uncompiled (before) x {len(names)}", f"{timeit(lambda: [apply_uncompiled(rules, name, item_type) for name, item_type in names], repeat=3):.2f}"],
+        [f"Standards.apply, compiled and memoized x {len(names)}", f"{timeit(lambda: [standards.apply(name, item_type) for name, item_type in names], repeat=3):.2f}"],
+        [f"Standards().compile(type).apply x {len(names)}", f"{timeit(lambda: [standards.compile(item_type).apply(name) for name, item_type in names], repeat=3):.2f}"],
+        ["walk the items, item.standardize()", f"{time_with_setup(lambda: rename(data), lambda: [item.standardize() for item in items]):.2f}"],
+        ["standardize_all(), every name changed", f"{time_with_setup(lambda: rename(data), lambda: standardize_all(data)):.2f}"],
+        ["standardize_all(), nothing to change", f"{timeit(lambda: standardize_all(data), repeat=3):.2f}"],
+    ]
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Benchmark creating the setlists of a full bundle, with items created on first access.
+
+Usage:
+    python benchmarks/bench_startup.py
+"""
+from common import build_bundle, print_table, timeit
+
+from helixapi.setlists import Setlists
+
+
+def create_all(setlists):
+    """Access every setlist, preset and snapshot, which is what used to happen up front."""
+    for setlist in setlists:
+        for preset in setlist.presets:
+            for snapshot in preset.snapshots:
+                pass
+    return setlists
+
+
+def main():
+    data, metadata = build_bundle()
+
+    rows = [
+        ["Setlists(data)", f"{timeit(lambda: Setlists(data=data)):.2f}"],
+        ["Setlists(data), then one preset's snapshot names", f"{timeit(lambda: [snapshot.name for snapshot in Setlists(data=data)[3].presets[64].snapshots]):.2f}"],
+        ["Setlists(data), then every item (the previous eager cost)", f"{timeit(lambda: create_all(Setlists(data=data)), repeat=3):.2f}"],
+    ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark exporting a full bundle by streaming it to the file against building every stage
+in memory first.
+
+Usage:
+    python benchmarks/bench_stream_export.py
+"""
+import base64
+import binascii
+import copy
+import os
+import tempfile
+import tracemalloc
+import zlib
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.utils.files import Files
+from helixapi.utils.json_backend import get_backend
+
+
+def export_in_memory(file_path, data, metadata):
+    """Export the way `Files._export_file` did before streaming: one full copy per stage."""
+    compact = Files._dumps_compact(data)
+    metadata = dict(metadata, encoded_data=base64.b64encode(zlib.compress(compact)).decode('utf-8'))
+    metadata["compression"]["decompressed_size"] = len(compact)
+    metadata["compression"]["crc32"] = binascii.crc32(compact)
+    with open(file_path, 'w') as file:
+        file.write(get_backend().dumps_pretty(metadata))
+
+
+def peak(func):
+    """Peak memory allocated by a function, in KiB."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    data, metadata = build_bundle()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "bundle.hlb")
+        for name, export in [("in memory", export_in_memory), ("streaming", Files._export_file)]:
+            rows.append([
+                name,
+                f"{timeit(lambda: export(file_path, data, copy.deepcopy(metadata)), repeat=7):.1f}",
+                f"{peak(lambda: export(file_path, data, copy.deepcopy(metadata))):.0f}",
+            ])
+
+    print_table(['export', 'time (ms)', 'peak (KiB)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark copying the preset template into empty slots and resetting presets and setlists
+from their templates.
+
+Usage:
+    python benchmarks/bench_templates.py
+"""
+import copy
+
+import yaml
+from common import build_bundle, print_table, timeit
+
+from helixapi.setlists import Setlists
+from helixapi.utils.files import TemplatePath
+
+
+def main():
+    with open(TemplatePath.PRESET.value, 'r') as file:
+        parsed = yaml.safe_load(file)
+
+    data, metadata = build_bundle()
+    setlists = Setlists(data=data)
+
+    def reset_presets():
+        for preset in setlists[0].presets:
+            preset.import_preset()
+
+    rows = [
+        ["fill 128 empty slots (yaml parsed once + deepcopy)", f"{timeit(lambda: [copy.deepcopy(parsed) for _ in range(128)]):.1f}"],
+        ["fill 128 empty slots (TemplatePath.load)", f"{timeit(lambda: [TemplatePath.load(TemplatePath.PRESET.value) for _ in range(128)]):.1f}"],
+        ["reset 128 presets (import_preset())", f"{timeit(reset_presets):.1f}"],
+        ["reset a setlist (import_setlist())", f"{timeit(lambda: setlists[1].import_setlist()):.1f}"],
+    ]
+
+    print_table(['operation', 'time (ms)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Benchmark checking a full bundle with `Files.verify` against importing it.
+
+Usage:
+    python benchmarks/bench_verify.py
+"""
+import os
+import tempfile
+import tracemalloc
+
+from common import build_bundle, print_table, timeit
+
+from helixapi.utils.files import Files
+
+
+def peak(func):
+    """Peak memory allocated by a function, in KiB."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    data, metadata = build_bundle()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "bundle.hlb")
+        Files._export_file(file_path, data, metadata)
+
+        rows = [
+            ["Files._import_file", f"{timeit(lambda: Files._import_file(file_path), repeat=5):.1f}", f"{peak(lambda: Files._import_file(file_path)):.0f}"],
+            ["Files.verify", f"{timeit(lambda: Files.verify(file_path), repeat=5):.1f}", f"{peak(lambda: Files.verify(file_path)):.0f}"],
+        ]
+
+    print_table(['', 'time (ms)', 'peak (KiB)'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from helixapi.utils.constants import MAX_PRESETS, MAX_SETLISTS
+from helixapi.utils.files import Files, TemplatePath
+
+
+def _vary(value, rng):
+    """Randomize the numeric parameters of a preset so presets are not identical."""
+    if isinstance(value, dict):
+        return {key: _vary(item, rng) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_vary(item, rng) for item in value]
+    if isinstance(value, float):
+        return round(rng.random(), 2)
+    return value
+
+
+def build_bundle(seed=0):
+    """
+    Build a full bundle (8 setlists of 128 presets) from the preset template.
+
+    Returns:
+        tuple: (data, metadata) as returned by `Files._import_file`.
+    """
+    rng = random.Random(seed)
+    preset, _ = Files._import_file(TemplatePath.PRESET.value)
+    data, metadata = Files._import_file(TemplatePath.BUNDLE.value)
+
+    for setlist_index in range(MAX_SETLISTS):
+        presets = data['setlists'][setlist_index]['presets']
+        for preset_index in range(MAX_PRESETS):
+            item = copy.deepcopy(preset)
+            item['data']['tone'] = _vary(item['data']['tone'], rng)
+            item['data']['meta']['name'] = f"SET{setlist_index + 1} PRE{preset_index + 1}"
+            item['data']['meta']['author'] = "BENCH"
+            presets[preset_index] = item
+
+    return data, metadata
+
+
+def timeit(func, repeat=5):
+    """
+    Time a function, returning the best of several runs in milliseconds.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def print_table(headers, rows):
+    """
+    Print rows as a markdown table.
+    """
+    print('| ' + ' | '.join(headers) + ' |')
+    print('|' + '|'.join('---' for _ in headers) + '|')
+    for row in rows:
+        print('| ' + ' | '.join(str(cell) for cell in row) + ' |')
@@ -0,0 +1,327 @@
+"""
+Set the fields of many presets or snapshots of a bundle at once, and standardize every name.
+"""
+import logging
+import re
+from typing import NamedTuple
+
+from .query import _get, _matcher
+from .snapshot import LEDColor
+from .utils.constants import MAX_SNAPSHOTS
+from .utils.data_manager import DataManager, _MISSING, _preset_view, default_author
+from .utils.journal import Journal
+from .utils.standards import Standards
+
+# The text fields limited to 16 characters, by item
+_TEXT_FIELDS = {
+    'preset': ('name', 'author', 'band', 'song'),
+    'snapshot': ('name',),
+}
+
+
+class NameChange(NamedTuple):
+    """
+    A name changed by `standardize_all`.
+
+    Attributes:
+        item (str): The item: "setlist", "preset" or "snapshot".
+        setlist_index (int): The index of the setlist.
+        preset_index (int): The index of the preset, or None for a setlist.
+        snapshot_index (int): The index of the snapshot, or None for a setlist or preset.
+        old (str): The name before.
+        new (str): The standardized name.
+    """
+    item: str
+    setlist_index: int
+    preset_index: int
+    snapshot_index: int
+    old: str
+    new: str
+
+
+def _indexes(value):
+    # None selects every index, an int one index and an iterable several
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return {value}
+    return set(value)
+
+
+def _field_paths(kind: str) -> dict:
+    # the mapping paths of the fields of an item, relative to the item
+    mapping = DataManager._load_mapping()[kind]
+    prefix = mapping['root'] + '.'
+    return {key: tuple(path[len(prefix):].split('.')) for key, path in mapping.items() if key != 'root'}
+
+
+def _snapshot_keys() -> tuple:
+    # the path of the snapshots relative to their preset, and the key of each snapshot there
+    mapping = DataManager._load_mapping()
+    parts = mapping['snapshot']['root'][len(mapping['preset']['root']) + 1:].split('.')
+    return tuple(parts[:-1]), [parts[-1].replace('snapshot_snapshot_index', f'snapshot{index}') for index in range(MAX_SNAPSHOTS)]
+
+
+def _normalize(kind: str, key: str, value):
+    # checked the way the item setters check them, so the data holds what the setters would write
+    if key in _TEXT_FIELDS[kind] and value is not None and len(value) > 16:
+        raise ValueError(f"{key.capitalize()} must be 16 characters or fewer.")
+    if key == 'ledcolor':
+        if not isinstance(value, LEDColor):
+            raise ValueError("Invalid LED color value.")
+        return value.value
+    return value
+
+
+class BulkItems:
+    """
+    Every preset or snapshot of a bundle, to set their fields in bulk.
+
+    The items are selected in one pass over the bundle data and the values are written with
+    the compiled mapping paths directly, without creating preset or snapshot objects. Values
+    equal to the current ones are not written. As with the preset setters, a preset changed
+    without setting its author gets the default author of the settings. When a journal, name index or batch is
+    following the bundle, each write is also reported to it, and the whole call is a single
+    journal step. Empty preset slots are skipped, unless `include_empty` is set (they are then
+    filled when written to).
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is created by `Helix.presets` and `Helix.snapshots`.
+
+    Examples:
+    ``` py
+    helix.snapshots.set_where(name_regex="SOLO", ledcolor=LEDColor.RED)
+    helix.presets.set_where(setlist_index=2, band="My Band")
+    ```
+    """
+
+    def __init__(self, data: dict, mapping_key: str) -> None:
+        """
+        Initialize the items.
+
+        Args:
+            data (dict): The bundle data.
+            mapping_key (str): The items: "preset" or "snapshot".
+        """
+        self._data = data
+        self._mapping_key = mapping_key
+
+    def _items(self, include_empty: bool):
+        # ((setlist_index, preset_index, snapshot_index), item data, empty slot) of every item, in the order of to_columns
+        snapshots = self._mapping_key == 'snapshot'
+        tone_path, snapshot_keys = _snapshot_keys()
+        for setlist_index, setlist in enumerate(self._data['setlists']):
+            for preset_index, preset in enumerate(setlist['presets']):
+                empty = not preset
+                if empty:
+                    if not include_empty:
+                        continue
+                    preset = _preset_view()
+                if not snapshots:
+                    yield (setlist_index, preset_index, None), preset, empty
+                    continue
+                tone = _get(preset, tone_path) or {}
+                for snapshot_index, key in enumerate(snapshot_keys):
+                    snapshot = tone.get(key)
+                    if snapshot is not None:
+                        yield (setlist_index, preset_index, snapshot_index), snapshot, empty
+
+    def _select(self, setlist_index, preset_index, snapshot_index, name_regex, mask, include_empty) -> list:
+        if snapshot_index is not None and self._mapping_key != 'snapshot':
+            raise Exception('Presets cannot be selected by snapshot index.')
+
+        setlists, presets, snapshots = _indexes(setlist_index), _indexes(preset_index), _indexes(snapshot_index)
+        name_filter = _matcher(re.compile(name_regex)) if name_regex is not None else None
+        name_path = _field_paths(self._mapping_key)['name']
+
+        items = self._items(include_empty)
+        if mask is not None:
+            items = list(items)
+            mask = list(mask)
+            if len(mask) != len(items):
+                raise Exception(f'The mask has {len(mask)} values for {len(items)} items.')
+            items = [item for item, selected in zip(items, mask) if selected]
+
+        if setlists is None and presets is None and snapshots is None and name_filter is None:
+            return list(items)
+
+        selected = []
+        for item in items:
+            location = item[0]
+            if (setlists is not None and location[0] not in setlists) or (presets is not None and location[1] not in presets) or (snapshots is not None and location[2] not in snapshots):
+                continue
+            if name_filter is not None and not name_filter(_get(item[1], name_path)):
+                continue
+            selected.append(item)
+        return selected
+
+    def select(self, setlist_index=None, preset_index=None, snapshot_index=None, name_regex=None, mask=None, include_empty: bool = False) -> list:
+        """
+        Find the items matching every given selector.
+
+        Args:
+            setlist_index (int | list, optional): The setlist index or indexes. Defaults to None (all).
+            preset_index (int | list, optional): The preset index or indexes. Defaults to None (all).
+            snapshot_index (int | list, optional): The snapshot index or indexes (snapshots only). Defaults to None (all).
+            name_regex (str | re.Pattern, optional): A regular expression searched for in the name. Defaults to None.
+            mask (list, optional): A boolean per item, in the order of the rows of `to_columns` (same level and include_empty). Defaults to None.
+            include_empty (bool, optional): Include the empty preset slots. Defaults to False.
+
+        Raises:
+            Exception: If a snapshot index is given for presets, or the mask does not have one value per item.
+
+        Returns:
+            list: The (setlist_index, preset_index, snapshot_index) of the matching items (snapshot_index is None for presets).
+
+        Examples:
+        ``` py
+        helix.snapshots.select(setlist_index=0, name_regex="^SOLO")
+        ```
+        """
+        return [item[0] for item in self._select(setlist_index, preset_index, snapshot_index, name_regex, mask, include_empty)]
+
+    def set_where(self, setlist_index=None, preset_index=None, snapshot_index=None, name_regex=None, mask=None, include_empty: bool = False, **values) -> int:
+        """
+        Set fields of every item matching the selectors (see `select`).
+
+        Each value is either a single value for every matching item, or a list (or array) with
+        one value per matching item, in order. Values are checked before anything is written.
+
+        Args:
+            setlist_index (int | list, optional): The setlist index or indexes. Defaults to None (all).
+            preset_index (int | list, optional): The preset index or indexes. Defaults to None (all).
+            snapshot_index (int | list, optional): The snapshot index or indexes (snapshots only). Defaults to None (all).
+            name_regex (str | re.Pattern, optional): A regular expression searched for in the name. Defaults to None.
+            mask (list, optional): A boolean per item, in the order of the rows of `to_columns` (same level and include_empty). Defaults to None.
+            include_empty (bool, optional): Include the empty preset slots. Defaults to False.
+            **values: The fields to set (name, tempo, ledcolor, etc) and their values.
+
+        Raises:
+            Exception: If a field is unknown, or a list of values does not have one value per matching item.
+            ValueError: If a value is not valid for its field.
+
+        Returns:
+            int: The number of items changed.
+
+        Examples:
+        ``` py
+        helix.snapshots.set_where(name_regex="SOLO", ledcolor=LEDColor.RED)
+        helix.presets.set_where(setlist_index=0, preset_index=range(4), tempo=[90, 100, 110, 120])
+        helix.snapshots.set_where(snapshot_index=0, name="INTRO")
+        ```
+        """
+        kind = self._mapping_key
+        paths = _field_paths(kind)
+        for key in values:
+            if key not in paths:
+                raise Exception(f'Unknown {kind} field: {key}')
+
+        rows = self._select(setlist_index, preset_index, snapshot_index, name_regex, mask, include_empty)
+        columns = []
+        for key, value in values.items():
+            if isinstance(value, (str, bytes, LEDColor)) or not hasattr(value, '__len__'):
+                value = [_normalize(kind, key, value)] * len(rows)
+            elif len(value) != len(rows):
+                raise Exception(f'{len(value)} values given for {key}, for {len(rows)} items.')
+            else:
+                value = [_normalize(kind, key, item) for item in value]
+            # the values are written in the dict holding the field, found from the item data
+            columns.append((key, paths[key][:-1], paths[key][-1], value))
+
+        return self._write(rows, columns)
+
+    def _write(self, rows: list, columns: list) -> int:
+        # writes the column values of each row, as a single journal step, and counts the rows changed
+        kind = self._mapping_key
+        changed = 0
+        # as with the preset setters, a preset changed without setting its author gets the default author
+        author_column = None
+        if kind == 'preset':
+            author_path = _field_paths(kind)['author']
+            author_column = next((column for key, _, _, column in columns if key == 'author'), [None] * len(rows))
+        # reported to the journal, name index and batch when they follow this bundle
+        notify = any(getattr(reference(), '_data', None) is self._data for reference in DataManager._listeners)
+        with Journal.group():
+            for position, (location, item, empty) in enumerate(rows):
+                row_changed = False
+                for key, parent_path, field, column in columns:
+                    value = column[position]
+                    if value is None:
+                        # as with the item setters, None leaves the value as it is
+                        continue
+                    parent = _get(item, parent_path) if parent_path else item
+                    current = parent.get(field, _MISSING) if isinstance(parent, dict) else _MISSING
+                    if current == value and type(current) is type(value):
+                        continue
+                    if notify or empty or not isinstance(parent, dict):
+                        # through a data manager, which fills an empty slot with its own copy of the template
+                        DataManager(kind, self._data, None, *location).set_data(key, value)
+                        if empty:
+                            empty = False
+                            item = DataManager(kind, self._data, None, *location).get_data('root')
+                    else:
+                        parent[field] = value
+                    row_changed = True
+                if row_changed and author_column is not None and author_column[position] is None:
+                    current = _get(item, author_path)
+                    author = default_author(current)
+                    if author != current:
+                        if notify:
+                            DataManager(kind, self._data, None, *location).set_data('author', author)
+                        else:
+                            _get(item, author_path[:-1])[author_path[-1]] = author
+                changed += row_changed
+        return changed
+
+
+def standardize_all(data: dict) -> list:
+    """
+    Standardize the name of every setlist, preset and snapshot of a bundle, in one pass.
+
+    The names are standardized with the compiled rules of each item type (see
+    `Standards.compile`), so each distinct name is only standardized once, and only the names
+    that change are written. The whole call is a single journal step. Empty preset slots are
+    skipped.
+
+    Args:
+        data (dict): The bundle data.
+
+    Returns:
+        list: The names changed (NameChange), setlists first, then presets, then snapshots.
+
+    Examples:
+    ``` py
+    for change in standardize_all(helix.bundle.data):
+        print(change.item, change.old, "->", change.new)
+    ```
+    """
+    standards = Standards()
+    changes = []
+    with Journal.group():
+        standardize = standards.compile('setlist').apply
+        name_path = tuple(DataManager._load_mapping()['setlist']['name'].split('.')[2:])
+        for setlist_index, setlist in enumerate(data['setlists']):
+            name = _get(setlist, name_path)
+            new_name = standardize(name) if isinstance(name, str) else name
+            if new_name != name:
+                changes.append(NameChange('setlist', setlist_index, None, None, name, new_name))
+                DataManager('setlist', data, None, setlist_index).set_data('name', new_name)
+
+        for kind in ('preset', 'snapshot'):
+            standardize = standards.compile(kind).apply
+            items = BulkItems(data, kind)
+            name_path = _field_paths(kind)['name']
+            rows, names = [], []
+            for location, item, empty in items._select(None, None, None, None, None, False):
+                name = _get(item, name_path)
+                new_name = standardize(name) if isinstance(name, str) else name
+                if new_name != name:
+                    rows.append((location, item, empty))
+                    names.append(new_name)
+                    changes.append(NameChange(kind, *location, name, new_name))
+            items._write(rows, [('name', name_path[:-1], name_path[-1], names)])
+
+    logging.debug(f"Standardized {len(changes)} names")
+    return changes
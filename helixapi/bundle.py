@@ -24,12 +24,13 @@ class Bundle:
         ```
     """
 
-    def __init__(self, file_path=None, setlists_callback=None):
+    def __init__(self, file_path=None, setlists_callback=None, lazy=False):
         """
         Initialize the Bundle class.
 
         Args:
             file_path (str, optional): Path to the bundle file to load. Defaults to None.
+            lazy (bool, optional): Only parse each setlist when it is first accessed. Defaults to False.
 
         Examples:
         ``` py
@@ -40,7 +41,7 @@ class Bundle:
             None
         """
         self._setlists_callback = setlists_callback
-        self.import_bundle(file_path)
+        self.import_bundle(file_path, lazy=lazy)
 
     @property
     def name(self):
@@ -62,12 +63,13 @@ class Bundle:
         """
         self.data['meta']['name'] = value
 
-    def export_bundle(self, file_path=None):
+    def export_bundle(self, file_path=None, compression=None):
         """
         Export the bundle to a file.
 
         Args:
             file_path (str): Path to export the bundle file to.
+            compression (str | CompressionProfile, optional): The compression profile ("fast", "default" or "smallest"). Defaults to None (the profile in the settings).
 
         Raises:
             Exception: If the file path is not specified or the file type is incorrect.
@@ -77,16 +79,20 @@ class Bundle:
         if not file_path:
             raise Exception('File path must be specified.')
         elif FileType.get_type(file_path) == FileType.BUNDLE:
-            Files._export_file(file_path=file_path, data=self.data, metadata=self.metadata)
+            Files._export_file(file_path=file_path, data=self.data, metadata=self.metadata, compression=compression)
         else:
             raise Exception('File type must be a bundle.')
 
-    def import_bundle(self, file_path=None):
+    def import_bundle(self, file_path=None, lazy=False):
         """
         Import the bundle from a file.
 
+        When lazy is enabled, each setlist is only parsed the first time it is accessed and
+        setlists that were never accessed are written back verbatim on export.
+
         Args:
             file_path (str): Path to the bundle file to import.
+            lazy (bool, optional): Only parse each setlist when it is first accessed. Defaults to False.
 
         Raises:
             Exception: If the file path is not specified or the file type is incorrect.
@@ -94,9 +100,9 @@ class Bundle:
         logging.debug(f"Importing bundle: {file_path}")
 
         if not file_path:
-            self.data, self.metadata = Files._import_file(TemplatePath.BUNDLE.value)            
+            self.data, self.metadata = TemplatePath.load(TemplatePath.BUNDLE.value)
         elif FileType.get_type(file_path) == FileType.BUNDLE:
-            self.data, self.metadata = Files._import_file(file_path)
+            self.data, self.metadata = Files._import_file(file_path, lazy=lazy)
         else:
             raise Exception('File path must be a bundle or None (to load the bundle template).')
         
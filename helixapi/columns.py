@@ -0,0 +1,242 @@
+"""
+Export the metadata of a bundle as columns, for analysis.
+"""
+import csv
+import io
+import math
+from array import array
+
+from .query import PRESET_FIELDS, _field_paths, _get
+from .utils.constants import MAX_SNAPSHOTS
+from .utils.data_manager import DataManager, _preset_view
+
+# The columns of each level, with the array type code of the numeric columns (None for a list)
+PRESET_COLUMNS = {
+    'setlist_index': 'i',
+    'preset_index': 'i',
+    'setlist_name': None,
+    'name': None,
+    'author': None,
+    'band': None,
+    'song': None,
+    'tempo': 'd',
+}
+SNAPSHOT_COLUMNS = dict(PRESET_COLUMNS, snapshot_index='i', snapshot_name=None, ledcolor='i')
+
+
+def _snapshot_paths() -> tuple:
+    # the path of each snapshot relative to its preset, and of the snapshot fields relative to the snapshot
+    mapping = DataManager._load_mapping()
+    preset_prefix = mapping['preset']['root'] + '.'
+    snapshot_root = mapping['snapshot']['root']
+    roots = [
+        tuple(snapshot_root[len(preset_prefix):].replace('snapshot_snapshot_index', f'snapshot{snapshot_index}').split('.'))
+        for snapshot_index in range(MAX_SNAPSHOTS)
+    ]
+    fields = {field: tuple(mapping['snapshot'][field][len(snapshot_root) + 1:].split('.')) for field in ('name', 'ledcolor')}
+    return roots, fields
+
+
+class Columns:
+    """
+    A table of bundle metadata stored as columns (a struct of arrays).
+
+    Numeric columns are `array.array` (indexes and LED colors as integers, tempos as floats,
+    with NaN for a missing tempo and -1 for a missing LED color) and text columns are lists
+    (None for a missing value). The columns can be used directly, or converted to CSV,
+    NumPy arrays or a pandas DataFrame.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is created by `Helix.to_columns`.
+
+    Examples:
+    ``` py
+    columns = helix.to_columns()
+    sum(columns["tempo"]) / len(columns)
+    ```
+    """
+
+    def __init__(self, columns: dict) -> None:
+        """
+        Initialize the table.
+
+        Args:
+            columns (dict): The columns by name, all of the same length.
+        """
+        self.columns = columns
+
+    @property
+    def names(self) -> list:
+        """
+        Get the names of the columns.
+
+        Returns:
+            list: The column names, in order.
+        """
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def rows(self):
+        """
+        Iterate over the rows of the table.
+
+        Returns:
+            iterator: A tuple per row, with the values in the order of the columns.
+        """
+        return zip(*self.columns.values())
+
+    def to_csv(self, file_path: str = None) -> str:
+        """
+        Write the table as CSV, with a header row of the column names.
+
+        Args:
+            file_path (str, optional): The file to write. Defaults to None (return the CSV instead).
+
+        Returns:
+            str: The CSV, or None if it was written to a file.
+
+        Examples:
+        ``` py
+        helix.to_columns().to_csv("bundle.csv")
+        ```
+        """
+        output = io.StringIO() if file_path is None else open(file_path, 'w', newline='', encoding='utf-8')
+        try:
+            writer = csv.writer(output)
+            writer.writerow(self.columns)
+            # missing values are written as empty cells (None is written empty by csv, NaN is not)
+            writer.writerows(
+                tuple('' if value != value else value for value in row)
+                for row in self.rows()
+            )
+            return output.getvalue() if file_path is None else None
+        finally:
+            output.close()
+
+    def to_numpy(self) -> dict:
+        """
+        Convert the columns to NumPy arrays (numeric columns are not copied, text columns become object arrays).
+
+        Raises:
+            Exception: If NumPy is not installed.
+
+        Returns:
+            dict: The arrays by column name.
+
+        Examples:
+        ``` py
+        helix.to_columns().to_numpy()["tempo"].mean()
+        ```
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise Exception('NumPy is not installed.')
+        return {
+            name: numpy.frombuffer(column, dtype=column.typecode) if isinstance(column, array) else numpy.array(column, dtype=object)
+            for name, column in self.columns.items()
+        }
+
+    def to_pandas(self):
+        """
+        Convert the table to a pandas DataFrame.
+
+        Raises:
+            Exception: If pandas is not installed.
+
+        Returns:
+            pandas.DataFrame: The table.
+
+        Examples:
+        ``` py
+        helix.to_columns().to_pandas().groupby("author").size()
+        ```
+        """
+        try:
+            import pandas
+        except ImportError:
+            raise Exception('pandas is not installed.')
+        return pandas.DataFrame(self.to_numpy())
+
+
+def to_columns(data: dict, level: str = 'snapshot', include_empty: bool = False) -> Columns:
+    """
+    Read the metadata of every preset (and snapshot) of a bundle into columns, in a single pass over the data.
+
+    Args:
+        data (dict): The bundle data.
+        level (str, optional): One row per "snapshot", or per "preset" (without the snapshot columns). Defaults to "snapshot".
+        include_empty (bool, optional): Include the empty preset slots, with the values of a new preset. Defaults to False.
+
+    Raises:
+        Exception: If the level is unknown.
+
+    Returns:
+        Columns: The table.
+
+    Examples:
+    ``` py
+    to_columns(helix.bundle.data, level="preset")
+    ```
+    """
+    if level not in ('snapshot', 'preset'):
+        raise Exception(f'Unknown level: {level}')
+    snapshots = level == 'snapshot'
+    layout = SNAPSHOT_COLUMNS if snapshots else PRESET_COLUMNS
+    columns = {name: array(typecode) if typecode else [] for name, typecode in layout.items()}
+
+    paths = _field_paths()
+    name, author, band, song, tempo = (paths[field] for field in PRESET_FIELDS)
+    setlist_name = tuple(DataManager._load_mapping()['setlist']['name'].split('.')[2:])
+    snapshot_roots, snapshot_fields = _snapshot_paths()
+    snapshot_name, ledcolor = snapshot_fields['name'], snapshot_fields['ledcolor']
+
+    # the snapshots are read from the tone of each preset, by key
+    tone_path = snapshot_roots[0][:-1]
+    snapshot_keys = [root[-1] for root in snapshot_roots]
+
+    # the preset values are added once per row of the preset, with the column methods bound once
+    preset_extends = [columns[column_name].extend for column_name in PRESET_COLUMNS]
+    if snapshots:
+        extend_snapshot_index = columns['snapshot_index'].extend
+        append_snapshot_name = columns['snapshot_name'].append
+        append_ledcolor = columns['ledcolor'].append
+
+    for setlist_index, setlist in enumerate(data['setlists']):
+        setlist_label = _get(setlist, setlist_name)
+        for preset_index, preset in enumerate(setlist['presets']):
+            if not preset:
+                if not include_empty:
+                    continue
+                preset = _preset_view()
+
+            count = 1
+            if snapshots:
+                tone = _get(preset, tone_path) or {}
+                indexes = [snapshot_index for snapshot_index, key in enumerate(snapshot_keys) if key in tone]
+                count = len(indexes)
+                extend_snapshot_index(indexes)
+                for snapshot_index in indexes:
+                    snapshot = tone[snapshot_keys[snapshot_index]]
+                    color = _get(snapshot, ledcolor)
+                    append_snapshot_name(_get(snapshot, snapshot_name))
+                    append_ledcolor(-1 if color is None else color)
+
+            preset_tempo = _get(preset, tempo)
+            values = (
+                setlist_index, preset_index, setlist_label, _get(preset, name), _get(preset, author),
+                _get(preset, band), _get(preset, song), math.nan if preset_tempo is None else preset_tempo,
+            )
+            for extend, value in zip(preset_extends, values):
+                extend((value,) * count)
+    return Columns(columns)
@@ -0,0 +1,307 @@
+"""
+Structural diff of bundles, setlists and presets using Merkle hashes.
+"""
+import hashlib
+import marshal
+import re
+from typing import Any, NamedTuple
+
+from .utils.data_manager import DataManager
+from .utils.files import Files, FileType
+from .utils.json_backend import get_backend
+from .utils.lazy import LazyArray
+
+# The number of levels whose hashes are built from the hashes below them, by the root of the tree
+# (bundle: the bundle, setlists, each setlist and its presets; the presets themselves are hashed whole)
+MERKLE_DEPTH = {
+    'bundle': 4,
+    'setlist': 2,
+    'preset': 0,
+}
+
+# The items whose paths are recognized in a diff, most specific first
+_ITEMS = ('snapshot', 'preset', 'setlist')
+_PLACEHOLDER_PATTERNS = {
+    'setlist_index': r'(?P<setlist_index>\d+)',
+    'preset_index': r'(?P<preset_index>\d+)',
+    'snapshot_snapshot_index': r'snapshot(?P<snapshot_index>\d+)',
+}
+
+
+class Change(NamedTuple):
+    """
+    A difference found by a diff.
+
+    Attributes:
+        path (str): The path of the value, with the keys and indexes separated by dots.
+        kind (str): "added", "removed" or "changed".
+        old (Any): The old value (None if added).
+        new (Any): The new value (None if removed).
+        item (str): The item containing the value (setlist, preset or snapshot), or None.
+        key (str): The mapping key of the value in its item (name, tempo, root, etc), or None if it has none.
+        setlist_index (int): The index of the setlist, or None.
+        preset_index (int): The index of the preset, or None.
+        snapshot_index (int): The index of the snapshot, or None.
+    """
+    path: str
+    kind: str
+    old: Any
+    new: Any
+    item: str = None
+    key: str = None
+    setlist_index: int = None
+    preset_index: int = None
+    snapshot_index: int = None
+
+
+def _digest(value) -> bytes:
+    # marshal version 2 writes no references or interning flags, so equal values always give the same bytes
+    try:
+        serialized = marshal.dumps(value, 2)
+    except ValueError:
+        serialized = get_backend().dumps_compact(value)
+    return hashlib.blake2b(serialized, digest_size=16).digest()
+
+
+class _Node:
+    """A value in a Merkle tree, with its hash and the nodes of its children built on first use."""
+    __slots__ = ('_value', '_source', '_raw', '_depth', '_digest', '_children')
+
+    def __init__(self, value=None, depth: int = 0, source: tuple = None, raw: bytes = None) -> None:
+        self._value = value
+        # an element of a LazyArray that was not parsed: (array, index) and its JSON bytes
+        self._source = source
+        self._raw = raw
+        self._depth = depth
+        self._digest = None
+        self._children = None
+
+    @property
+    def value(self):
+        if self._source is not None:
+            array, index = self._source
+            self._value = array[index]
+            self._source = None
+        return self._value
+
+    @property
+    def digest(self) -> bytes:
+        if self._digest is None:
+            if self._raw is not None:
+                self._digest = hashlib.blake2b(self._raw, digest_size=16, person=b'raw').digest()
+            elif self._depth and isinstance(self._value, (dict, list, LazyArray)):
+                # the upper levels are hashed from the hashes of their children (a Merkle tree)
+                digest = hashlib.blake2b(digest_size=16)
+                children = self.children
+                for key, child in (children.items() if isinstance(children, dict) else enumerate(children)):
+                    digest.update(repr(key).encode('utf-8'))
+                    digest.update(child.digest)
+                self._digest = digest.digest()
+            else:
+                self._digest = _digest(self._value)
+        return self._digest
+
+    @property
+    def children(self):
+        if self._children is None:
+            value = self.value
+            depth = max(self._depth - 1, 0)
+            if isinstance(value, dict):
+                self._children = {key: _Node(child, depth) for key, child in value.items()}
+            elif isinstance(value, LazyArray):
+                self._children = []
+                for index in range(len(value)):
+                    raw = None if value.is_loaded(index) else value.raw(index)
+                    if raw is None:
+                        self._children.append(_Node(value[index], depth))
+                    else:
+                        self._children.append(_Node(depth=depth, source=(value, index), raw=raw))
+            else:
+                self._children = [_Node(child, depth) for child in value]
+        return self._children
+
+
+class MerkleTree:
+    """
+    The Merkle hashes of a bundle, setlist or preset.
+
+    The bundle, its setlists and their preset lists are hashed from the hashes of their
+    children, and each preset is hashed whole, so every preset is serialized and hashed once.
+    The parts of a preset are only hashed when a diff reaches a preset that changed. Setlists
+    of a lazily imported bundle that were never accessed are hashed from their file contents,
+    without parsing them. A tree can be reused for several diffs, as long as its data does not
+    change in the meantime.
+
+    Examples:
+    ``` py
+    backup = MerkleTree(backup_data)
+    backup.digest == MerkleTree(helix.bundle.data).digest
+    ```
+    """
+
+    def __init__(self, data: dict, root: str = 'bundle') -> None:
+        """
+        Initialize the tree.
+
+        Args:
+            data (dict): The data of the bundle, setlist or preset.
+            root (str, optional): What the data is ("bundle", "setlist" or "preset"). Defaults to "bundle".
+
+        Raises:
+            Exception: If the root is unknown.
+        """
+        if root not in MERKLE_DEPTH:
+            raise Exception(f'Unknown diff root: {root}')
+        self.root = root
+        self._node = _Node(data, MERKLE_DEPTH[root])
+
+    @property
+    def digest(self) -> str:
+        """
+        Get the hash of the whole data.
+
+        Returns:
+            str: The hash, as hexadecimal.
+        """
+        return self._node.digest.hex()
+
+
+def _item_patterns(root: str) -> list:
+    # (item, regex of the item's root path, {mapping key: regex of the key's path}), relative to the diff root
+    mapping = DataManager._load_mapping()
+    prefix = '' if root == 'bundle' else mapping[root]['root'] + '.'
+    patterns = []
+    for item in _ITEMS:
+        paths = mapping[item]
+        if not (paths['root'] + '.').startswith(prefix):
+            continue
+        compiled = {}
+        for key, path in paths.items():
+            parts = path[len(prefix):].split('.') if len(path) > len(prefix) else []
+            compiled[key] = r'\.'.join(_PLACEHOLDER_PATTERNS.get(part, re.escape(part)) for part in parts)
+        # the item is the root of the diff when its root path is empty
+        root_pattern = compiled.pop('root')
+        patterns.append((item, re.compile(root_pattern + r'(?:\.|$)' if root_pattern else ''), {key: re.compile(pattern) for key, pattern in compiled.items()}))
+    return patterns
+
+
+def _change(patterns: list, path: list, kind: str, old, new) -> Change:
+    path = '.'.join(str(part) for part in path)
+    for item, root_pattern, key_patterns in patterns:
+        match = root_pattern.match(path)
+        if not match:
+            continue
+        key = 'root' if match.end() == len(path) else None
+        for name, pattern in key_patterns.items():
+            if pattern.fullmatch(path):
+                key = name
+                break
+        indexes = {name: int(index) for name, index in match.groupdict().items() if index is not None}
+        return Change(path, kind, old, new, item, key, **indexes)
+    return Change(path, kind, old, new)
+
+
+def _diff_nodes(old: _Node, new: _Node, path: list, patterns: list, changes: list) -> None:
+    if old._source is not None and new._source is not None and old.digest == new.digest:
+        # neither side was parsed and the file contents are the same
+        return
+    old_value, new_value = old.value, new.value
+    old_container = isinstance(old_value, (dict, list, LazyArray))
+    new_container = isinstance(new_value, (dict, list, LazyArray))
+    if not old_container and not new_container:
+        if old_value != new_value or type(old_value) is not type(new_value):
+            changes.append(_change(patterns, path, 'changed', old_value, new_value))
+        return
+    if old.digest == new.digest:
+        return
+
+    if old_container and new_container and old_value and new_value and isinstance(old_value, dict) == isinstance(new_value, dict):
+        old_children, new_children = old.children, new.children
+        if isinstance(old_children, dict):
+            keys = list(old_children) + [key for key in new_children if key not in old_children]
+        else:
+            keys = range(max(len(old_children), len(new_children)))
+            old_children = dict(enumerate(old_children))
+            new_children = dict(enumerate(new_children))
+        for key in keys:
+            old_child = old_children.get(key)
+            new_child = new_children.get(key)
+            if old_child is None:
+                changes.append(_change(patterns, path + [key], 'added', None, new_child.value))
+            elif new_child is None:
+                changes.append(_change(patterns, path + [key], 'removed', old_child.value, None))
+            else:
+                _diff_nodes(old_child, new_child, path + [key], patterns, changes)
+    elif old_container and not old_value:
+        # an empty slot was filled
+        changes.append(_change(patterns, path, 'added', None, new_value))
+    elif new_container and not new_value:
+        changes.append(_change(patterns, path, 'removed', old_value, None))
+    else:
+        changes.append(_change(patterns, path, 'changed', old_value, new_value))
+
+
+def diff(old, new, root: str = 'bundle') -> list:
+    """
+    Find the differences between two bundles, setlists or presets.
+
+    Both sides are compared top down by their Merkle hashes, so identical setlists, presets
+    and parts of presets are skipped without comparing their contents. Each difference is
+    reported at the deepest path where it is found, except that a filled or emptied preset
+    slot is reported once for the whole preset. Paths follow the mapping paths (mappings.yaml)
+    and are relative to the root, so a preset name in a bundle is at
+    `setlists.<setlist index>.presets.<preset index>.data.meta.name`.
+
+    Args:
+        old (dict | MerkleTree): The old data, or its tree.
+        new (dict | MerkleTree): The new data, or its tree.
+        root (str, optional): What the data is ("bundle", "setlist" or "preset"). Defaults to "bundle".
+
+    Returns:
+        list: The changes (Change), in the order of the paths in the data.
+
+    Examples:
+    ``` py
+    for change in diff(backup_data, helix.bundle.data):
+        print(change.kind, change.item, change.key, change.path)
+    ```
+    """
+    old_tree = old if isinstance(old, MerkleTree) else MerkleTree(old, root)
+    new_tree = new if isinstance(new, MerkleTree) else MerkleTree(new, root)
+    if old_tree.root != new_tree.root:
+        raise Exception(f'Cannot diff a {old_tree.root} against a {new_tree.root}.')
+
+    changes = []
+    _diff_nodes(old_tree._node, new_tree._node, [], _item_patterns(old_tree.root), changes)
+    return changes
+
+
+def diff_files(old_path: str, new_path: str) -> list:
+    """
+    Find the differences between two bundle, setlist or preset files of the same type.
+
+    Bundles are imported lazily, so setlists with the same contents in both files are
+    compared by their hashes without being parsed. The lazy import still scans each file, so
+    when most setlists differ, importing both files and calling `diff` is faster.
+
+    Args:
+        old_path (str): The path to the old file.
+        new_path (str): The path to the new file.
+
+    Raises:
+        Exception: If the files are not of the same type.
+
+    Returns:
+        list: The changes (Change).
+
+    Examples:
+    ``` py
+    diff_files("backup.hlb", "live.hlb")
+    ```
+    """
+    file_type = FileType.get_type(old_path)
+    if FileType.get_type(new_path) != file_type:
+        raise Exception('Both files must be of the same type.')
+    old_data, _ = Files._import_file(old_path, lazy=True)
+    new_data, _ = Files._import_file(new_path, lazy=True)
+    return diff(old_data, new_data, root=file_type.name.lower())
@@ -0,0 +1,274 @@
+"""
+Find presets with the same tone across bundles, setlists and preset files.
+"""
+import hashlib
+import logging
+import marshal
+import os
+from typing import NamedTuple
+
+from .query import PRESET_FIELDS, PresetRecord, _field_paths, _get
+from .utils.files import Files, FileType
+from .utils.json_backend import get_backend
+from .utils.settings import Settings
+
+# Editor state kept in the tone that does not change how the preset sounds
+VOLATILE_GLOBAL_KEYS = frozenset(('@current_snapshot', '@cursor_dsp', '@cursor_group', '@cursor_path', '@cursor_position'))
+
+# The file the tone hashes are kept in, in the cache directory of the settings
+_HASH_CACHE_FILE = 'tone_hashes.marshal'
+_HASH_CACHE_VERSION = 1
+
+
+class DuplicateGroup(NamedTuple):
+    """
+    Presets with the same tone.
+
+    Attributes:
+        tone_hash (str): The hash of the tone.
+        presets (list): The presets (PresetRecord), in the order they were found.
+    """
+    tone_hash: str
+    presets: list
+
+
+def tone_hash(preset: dict) -> str:
+    """
+    Get the hash of the tone of a preset.
+
+    Only the tone is hashed (`data.tone`, with the keys sorted), so presets with the same
+    blocks, settings and snapshots have the same hash whatever their name, author or
+    modification date. The editor state kept in the tone (current snapshot, cursor) is ignored.
+
+    Args:
+        preset (dict): The data of the preset.
+
+    Returns:
+        str: The hash, as hexadecimal, or None for an empty preset slot.
+
+    Examples:
+    ``` py
+    tone_hash(helix.setlists[0].presets[0]._get_data("root"))
+    ```
+    """
+    tone = _get(preset, ('data', 'tone')) if preset else None
+    if tone is None:
+        return None
+    if isinstance(tone.get('global'), dict):
+        tone = dict(tone)
+        tone['global'] = {key: value for key, value in tone['global'].items() if key not in VOLATILE_GLOBAL_KEYS}
+    return hashlib.blake2b(get_backend().dumps_canonical(tone), digest_size=16).hexdigest()
+
+
+def _fields() -> list:
+    paths = _field_paths()
+    return [paths[field] for field in PRESET_FIELDS]
+
+
+def _setlist_entries(setlist_index: int, setlist: dict, fields: list) -> list:
+    # (tone hash, setlist index, preset index, *fields) for every preset that is not empty
+    entries = []
+    for preset_index, preset in enumerate(setlist['presets']):
+        digest = tone_hash(preset)
+        if digest is not None:
+            entries.append((digest, setlist_index, preset_index, *(_get(preset, parts) for parts in fields)))
+    return entries
+
+
+def _group(entries) -> list:
+    groups = {}
+    for file_path, entry in entries:
+        groups.setdefault(entry[0], []).append(PresetRecord(file_path, *entry[1:]))
+    return [DuplicateGroup(digest, presets) for digest, presets in groups.items() if len(presets) > 1]
+
+
+def find_duplicates(data: dict) -> list:
+    """
+    Find the presets of a bundle with the same tone.
+
+    Args:
+        data (dict): The bundle data.
+
+    Returns:
+        list: The groups of presets with the same tone (DuplicateGroup), in the order they were found.
+
+    Examples:
+    ``` py
+    find_duplicates(helix.bundle.data)
+    ```
+    """
+    fields = _fields()
+    return _group(
+        (None, entry)
+        for setlist_index, setlist in enumerate(data['setlists'])
+        for entry in _setlist_entries(setlist_index, setlist, fields)
+    )
+
+
+class ToneHashCache:
+    """
+    The tone hashes of the presets of each file, keyed by the file modification time and size.
+
+    A file that has not changed since it was hashed is not read again. The hashes are kept
+    in memory for the process and, when a cache directory is set in the settings, in a file
+    in that directory so they are kept between runs.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is used by `find_duplicate_files`.
+    """
+
+    # hashes by absolute file path, shared by every scan in the process
+    _entries = None
+    _loaded_from = None
+
+    def __init__(self) -> None:
+        """
+        Initialize the cache, loading the saved hashes the first time.
+        """
+        directory = Settings().cache_directory
+        self._path = os.path.join(os.path.abspath(directory), _HASH_CACHE_FILE) if directory else None
+        if ToneHashCache._entries is None or ToneHashCache._loaded_from != self._path:
+            ToneHashCache._entries = self._load()
+            ToneHashCache._loaded_from = self._path
+        self._changed = False
+
+    def _load(self) -> dict:
+        if not self._path:
+            return {}
+        try:
+            with open(self._path, 'rb') as file:
+                version, entries = marshal.load(file)
+            if version != _HASH_CACHE_VERSION:
+                raise ValueError('unknown version')
+            return entries
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, EOFError, TypeError) as e:
+            logging.debug(f"Discarding tone hash cache {self._path}: {e}")
+            return {}
+
+    def get(self, file_path: str) -> list:
+        """
+        Get the entries of a file, hashing it if it changed since it was last hashed.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            list: The entries of the presets of the file, as tuples (tone hash, setlist index, preset index, name, author, band, song, tempo).
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        cached = ToneHashCache._entries.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        fields = _fields()
+        data, _ = Files._import_file(file_path)
+        file_type = FileType.get_type(file_path)
+        if file_type == FileType.BUNDLE:
+            entries = [entry for setlist_index, setlist in enumerate(data['setlists']) for entry in _setlist_entries(setlist_index, setlist, fields)]
+        elif file_type == FileType.SETLIST:
+            entries = _setlist_entries(0, data, fields)
+        else:
+            entries = _setlist_entries(None, {'presets': [data]}, fields)
+        ToneHashCache._entries[key] = (stat.st_mtime_ns, stat.st_size, entries)
+        self._changed = True
+        return entries
+
+    def prune(self) -> None:
+        """
+        Forget the hashes of the files that no longer exist, so the cache does not grow without bound.
+        """
+        removed = [key for key in ToneHashCache._entries if not os.path.isfile(key)]
+        for key in removed:
+            del ToneHashCache._entries[key]
+        if removed:
+            self._changed = True
+
+    def save(self) -> None:
+        """
+        Write the hashes to the cache directory, if any were added since they were loaded.
+
+        The hashes are only kept to speed up the next scan, so a cache directory that cannot
+        be written is logged and otherwise ignored.
+        """
+        if not self._changed or not self._path:
+            return
+        temp_path = f"{self._path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with open(temp_path, 'wb') as file:
+                marshal.dump((_HASH_CACHE_VERSION, ToneHashCache._entries), file)
+            os.replace(temp_path, self._path)
+        except OSError as e:
+            logging.warning(f"Could not save the tone hashes to {self._path}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        self._changed = False
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Forget the hashes kept in memory (the saved hashes are loaded again on the next scan).
+        """
+        cls._entries = None
+        cls._loaded_from = None
+
+
+def find_duplicate_files(paths, recursive: bool = True) -> list:
+    """
+    Find the presets with the same tone across bundle, setlist and preset files.
+
+    Only the files that changed (by modification time and size) since they were last hashed
+    are read, so scanning a large library again is quick. Files that cannot be read or
+    decoded are skipped with a warning.
+
+    Args:
+        paths (str | list): A directory, or a list of files and directories, to scan.
+        recursive (bool, optional): Scan the subdirectories too. Defaults to True.
+
+    Returns:
+        list: The groups of presets with the same tone (DuplicateGroup), in the order they were found.
+
+    Examples:
+    ``` py
+    for group in find_duplicate_files("~/Documents/Line 6/Tones"):
+        print([preset.file_path for preset in group.presets])
+    ```
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    file_paths = []
+    for path in paths:
+        path = os.path.expanduser(path)
+        if not os.path.isdir(path):
+            file_paths.append(path)
+            continue
+        for directory, directories, file_names in os.walk(path):
+            directories.sort()
+            if not recursive:
+                directories.clear()
+            file_paths.extend(os.path.join(directory, file_name) for file_name in sorted(file_names) if FileType.get_type(file_name) is not None)
+
+    cache = ToneHashCache()
+    entries = []
+    try:
+        for file_path in file_paths:
+            try:
+                file_entries = cache.get(file_path)
+            except Exception as e:
+                # a file that cannot be read or decoded does not stop the scan
+                logging.warning(f"Skipping file that could not be read: {file_path}: {e}")
+                continue
+            entries.extend((file_path, entry) for entry in file_entries)
+        cache.prune()
+    finally:
+        cache.save()
+    return _group(entries)
@@ -3,6 +3,12 @@ import colorlog
 
 from .bundle import Bundle
 from .setlists import Setlists
+from .query import Query
+from .duplicates import find_duplicates
+from .columns import Columns, to_columns
+from .bulk import BulkItems, standardize_all
+from .utils.batch import Batch
+from .utils.journal import Journal
 from .utils.settings import Settings
 from .midi import MIDI
 
@@ -13,12 +19,16 @@ class Helix:
     This class provides methods for loading Helix bundle files and managing setlists.
     """
 
-    def __init__(self, file_path=None) -> None:
+    def __init__(self, file_path=None, lazy=False) -> None:
         """
         Initialize the Helix class.
 
         Args:
             file_path (str, optional): Path to the bundle file to load. Defaults to None.
+            lazy (bool, optional): Only parse each setlist of the bundle when it is first accessed. Defaults to False.
+                With the `cache` setting, a bundle that was already imported loads about a hundred times
+                faster with `lazy=True`; without it, every setlist is still built from the cache entry,
+                which is only a few times faster than decoding the file.
 
         Examples:
         ``` py
@@ -38,9 +48,10 @@ class Helix:
 
         # Initialize _setlists to None
         self._setlists = None
+        self._journal = None
 
         # Load the bundle (which also loads the setlist, presets, snapshots, etc)
-        self._bundle = Bundle(file_path=file_path, setlists_callback=self._reload_setlists)
+        self._bundle = Bundle(file_path=file_path, setlists_callback=self._reload_setlists, lazy=lazy)
 
     def _reload_setlists(self, bundle_data) -> None:
         """
@@ -53,6 +64,8 @@ class Helix:
             None
         """
         self._setlists = Setlists(data=bundle_data)
+        # a journal only covers the bundle it was created for
+        self._journal = None
 
     @property
     def setlists(self) -> Setlists:
@@ -82,6 +95,149 @@ class Helix:
         """
         self._setlists = value
     
+    @property
+    def query(self) -> Query:
+        """
+        Get a query over the presets of the loaded bundle.
+
+        Returns:
+            Query: The query.
+
+        Examples:
+        ``` py
+        helix.query.presets(author="Me")
+        ```
+        """
+        return Query(data=self._bundle.data, setlists=self._setlists)
+
+    @property
+    def presets(self) -> BulkItems:
+        """
+        Get every preset of the loaded bundle, to set their fields in bulk.
+
+        Returns:
+            BulkItems: The presets.
+
+        Examples:
+        ``` py
+        helix.presets.set_where(name_regex="^LEAD", tempo=140)
+        ```
+        """
+        return BulkItems(self._bundle.data, 'preset')
+
+    @property
+    def snapshots(self) -> BulkItems:
+        """
+        Get every snapshot of the loaded bundle, to set their fields in bulk.
+
+        Returns:
+            BulkItems: The snapshots.
+
+        Examples:
+        ``` py
+        helix.snapshots.set_where(name_regex="SOLO", ledcolor=LEDColor.RED)
+        ```
+        """
+        return BulkItems(self._bundle.data, 'snapshot')
+
+    def find_duplicates(self) -> list:
+        """
+        Find the presets of the loaded bundle with the same tone, ignoring their names and meta data.
+
+        Returns:
+            list: The groups of presets with the same tone (DuplicateGroup).
+
+        Examples:
+        ``` py
+        for group in helix.find_duplicates():
+            print([(preset.setlist_index, preset.preset_index) for preset in group.presets])
+        ```
+        """
+        return find_duplicates(self._bundle.data)
+
+    def to_columns(self, level: str = 'snapshot', include_empty: bool = False) -> Columns:
+        """
+        Read the metadata of every preset and snapshot of the loaded bundle into columns.
+
+        The bundle data is read in a single pass, without creating setlist, preset or snapshot
+        objects. Each row has the setlist, preset and snapshot indexes, the setlist name, the
+        preset name, author, band, song and tempo, and the snapshot name and LED color.
+
+        Args:
+            level (str, optional): One row per "snapshot", or per "preset" (without the snapshot columns). Defaults to "snapshot".
+            include_empty (bool, optional): Include the empty preset slots, with the values of a new preset. Defaults to False.
+
+        Returns:
+            Columns: The table.
+
+        Examples:
+        ``` py
+        helix.to_columns().to_csv("bundle.csv")
+        helix.to_columns(level="preset").to_pandas()
+        ```
+        """
+        return to_columns(self._bundle.data, level=level, include_empty=include_empty)
+
+    def standardize_all(self) -> list:
+        """
+        Standardize the name of every setlist, preset and snapshot of the loaded bundle, in one pass.
+
+        The rules of the standards settings are compiled once per item type and each distinct
+        name is standardized once. Only the names that change are written, as a single journal step.
+
+        Returns:
+            list: The names changed (NameChange), with the item, its indexes and the old and new names.
+
+        Examples:
+        ``` py
+        for change in helix.standardize_all():
+            print(change.item, change.old, "->", change.new)
+        ```
+        """
+        return standardize_all(self._bundle.data)
+
+    @property
+    def journal(self) -> Journal:
+        """
+        Get the journal of the changes made to the bundle, for undo and redo.
+
+        The journal is created on first access and records the changes made from then on.
+        Importing a bundle starts a new journal.
+
+        Returns:
+            Journal: The journal.
+
+        Examples:
+        ``` py
+        helix.journal
+        helix.setlists[0].name = "LIVE"
+        helix.journal.undo()
+        ```
+        """
+        if self._journal is None:
+            self._journal = Journal(self._bundle.data)
+        return self._journal
+
+    def batch(self) -> Batch:
+        """
+        Group changes so their side effects are applied together, and undone if the batch fails.
+
+        Only the last setlist, preset and snapshot selected in the batch are sent over MIDI,
+        when the batch ends. If the batch ends with an exception, the setlists and presets
+        changed in it and the active setlist and preset are put back and nothing is sent.
+
+        Returns:
+            Batch: The batch, to use in a with statement.
+
+        Examples:
+        ``` py
+        with helix.batch():
+            helix.setlists.active_index = 2
+            helix.setlists[2].presets.active_index = 10
+        ```
+        """
+        return Batch(self._bundle.data)
+
     @property
     def bundle(self):
         """
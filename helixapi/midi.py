@@ -231,6 +231,44 @@ class MIDI:
         """
         def __init__(self, targets) -> None:
             self.targets = targets
+            # the last setlist, preset and snapshot selected while a batch defers the changes (None when not deferring)
+            self._deferred = None
+
+        def _defer(self, command: str, index: int) -> bool:
+            """
+            Keep a setlist, preset or snapshot change for later while changes are deferred.
+
+            Args:
+                command (str): The change (setlist, preset or snapshot).
+                index (int): The index to change to.
+
+            Returns:
+                bool: True if the change was deferred, False if it should be sent now.
+            """
+            if self._deferred is None:
+                return False
+            self._deferred[command] = index
+            return True
+
+        def defer(self) -> None:
+            """
+            Defer setlist, preset and snapshot changes until `flush`, keeping only the last of each.
+            """
+            self._deferred = {}
+
+        def flush(self, send: bool = True) -> None:
+            """
+            Stop deferring changes and send the last setlist, preset and snapshot selected (in that order).
+
+            Args:
+                send (bool, optional): Send the deferred changes, or drop them when False. Defaults to True.
+            """
+            deferred, self._deferred = self._deferred, None
+            if not deferred or not send:
+                return
+            for command in ('setlist', 'preset', 'snapshot'):
+                if command in deferred:
+                    getattr(self, f"change_to_{command}")(deferred[command])
 
         def change_to_setlist(self, setlist_index: int) -> None:
             """
@@ -239,6 +277,8 @@ class MIDI:
             Args:
                 setlist_index (int): The index of the setlist to change to.
             """
+            if self._defer('setlist', setlist_index):
+                return
             for target in self.targets:
                 self.targets.system.send_cc(port=target, channel=0, control=69, value=setlist_index)
                 logging.debug("Changed to setlist %d on target %s", setlist_index, target)
@@ -250,6 +290,8 @@ class MIDI:
             Args:
                 preset_index (int): The index of the preset to change to.
             """
+            if self._defer('preset', preset_index):
+                return
             for target in self.targets:
                 self.targets.system.send_pc(port=target, channel=0, program=preset_index)
                 logging.debug("Changed to preset %d on target %s", preset_index, target)
@@ -261,6 +303,8 @@ class MIDI:
             Args:
                 snapshot_index (int): The index of the snapshot to change to.
             """
+            if self._defer('snapshot', snapshot_index):
+                return
             for target in self.targets:
                 self.targets.system.send_cc(port=target, channel=0, control=69, value=snapshot_index)
                 logging.debug("Changed to snapshot %d on target %s", snapshot_index, target)
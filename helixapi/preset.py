@@ -1,11 +1,13 @@
 from helixapi.utils.item_base import ItemBase
 from .snapshots import Snapshots
-from .utils.settings import Settings
+from .utils.data_manager import default_author
+from .utils.journal import Journal
 
 class Preset(ItemBase):
     """
     Represents a Helix preset for a given setlist. This contains specific metadata (index, name) and all snapshots.
     """
+    __slots__ = ('index', '_active', '_set_active_callback', '_snapshots', '_author_applied')
 
     def __init__(self, data: dict, setlist_index: int, index: int, set_active_callback=None, metadata: dict = {}):
         """
@@ -28,12 +30,9 @@ class Preset(ItemBase):
         self._active = False
         self._set_active_callback = set_active_callback
 
-        # set author if not set or if overwrite is enabled
-        # setting here allows us to change it later if needed
-        settings = Settings()
-        author = self.author
-        if not author or settings.author_overwrite:
-            self.author = settings.author_name
+        # the author from the settings is only written with the first change to the preset,
+        # so loading a bundle does not modify (or fill empty slots of) its data
+        self._author_applied = False
 
         # Load the snapshots
         self._snapshots = Snapshots(
@@ -44,6 +43,17 @@ class Preset(ItemBase):
             set_active_callback=self._set_active_snapshot_index
         )
 
+    def _set_data(self, key, value):
+        if not self._author_applied:
+            self._author_applied = True
+            # set author if not set or if overwrite is enabled (an explicit author or imported preset is kept as is)
+            if key not in ('author', 'root'):
+                with Journal.group():
+                    super()._set_data("author", default_author(self._get_data("author", default=None)))
+                    super()._set_data(key, value)
+                return
+        super()._set_data(key, value)
+
     @property
     def _active_snapshot_index(self):
         """
@@ -132,7 +142,7 @@ class Preset(ItemBase):
         preset.author
         ```
         """
-        return str(self._get_data("author"))
+        return str(self._get_data("author", default=""))
 
     @author.setter
     def author(self, value: str) -> None:
@@ -223,6 +233,36 @@ class Preset(ItemBase):
             raise ValueError("Song name must be 16 characters or fewer.")
         self._set_data("song", value)
 
+    @property
+    def tempo(self) -> float:
+        """
+        Get the tempo of the preset in BPM.
+
+        Returns:
+            float: The tempo of the preset.
+
+        Examples:
+        ``` py
+        preset.tempo
+        ```
+        """
+        return self._get_data("tempo")
+
+    @tempo.setter
+    def tempo(self, value: float) -> None:
+        """
+        Set the tempo of the preset in BPM.
+
+        Args:
+            value (float): The tempo to set for the preset.
+
+        Examples:
+        ``` py
+        preset.tempo = 120
+        ```
+        """
+        self._set_data("tempo", value)
+
 
     def import_preset(self, file_path=None) -> None:
         """
@@ -268,6 +308,8 @@ class Preset(ItemBase):
         """
         Reset the preset to its default values.
 
+        The values are a copy of the preset template, which is only parsed once (see `TemplatePath.load`).
+
         Examples:
         ``` py
         preset.reset_preset()
@@ -1,5 +1,5 @@
 from typing import List
-from .utils.collection_base import CollectionBase
+from .utils.collection_base import CollectionBase, LazyItems
 from .preset import Preset
 from .utils.constants import MAX_PRESETS
 from .midi import MIDI
@@ -8,6 +8,7 @@ class Presets(CollectionBase):
     """
     Represents a collection of Helix presets for a given setlist.
     """
+    __slots__ = ('_midi', '_data', '_setlist_index', '_item_callback')
     def __init__(self, data: dict=None, setlist_index: int=None):
         """
         Initialize the Presets class.
@@ -22,10 +23,14 @@ class Presets(CollectionBase):
         ```
         """
         self._midi = MIDI()
+        self._data = data
+        self._setlist_index = setlist_index
+        # bound once and shared by every preset of the setlist
+        self._item_callback = self._set_active_preset
 
-        super().__init__(cls=Preset, items=[Preset(data=data, setlist_index=setlist_index, index=i, set_active_callback=self._set_active_preset) for i in range(MAX_PRESETS)])
+        # presets are created when first accessed
+        super().__init__(cls=Preset, items=LazyItems(MAX_PRESETS, self._create_preset))
         
-        self._setlist_index = setlist_index
         self._active_index = 0  # Set the first preset as active initially
 
         # Ensure the initial active preset is correctly marked as active
@@ -33,6 +38,9 @@ class Presets(CollectionBase):
             self._items[self._active_index].active = True
             self._set_active_preset(self._active_index)
 
+    def _create_preset(self, index):
+        return Preset(data=self._data, setlist_index=self._setlist_index, index=index, set_active_callback=self._item_callback)
+
     def _set_active_preset(self, index):
         self._active_index = index
         self._midi.commands.change_to_preset(index)
@@ -78,19 +86,25 @@ class Presets(CollectionBase):
         self._active_item = item
         self._set_active_preset(item.index)
 
-    def export_presets(self, file_path=None):
+    def export_presets(self, file_path=None, max_workers: int = 1):
         """
         Export presets to a single file.
 
         Args:
             file_path (str): The path to the file to export presets to. 
+            max_workers (int, optional): Number of worker processes used to encode the files. Defaults to 1 (export in this process). None uses one per CPU.
+
+        Examples:
+        ``` py
+        failures = presets.export_presets(file_path="/path/to/presets", max_workers=None)
+        ```
             
         Returns:
-            None
+            dict: The files that failed to export mapped to their errors (the other files are still exported).
         """
-        self._export_files(file_path)
+        return self._export_files(file_path, max_workers=max_workers)
 
-    def import_presets(self, file_paths: List[str]):
+    def import_presets(self, file_paths: List[str], max_workers: int = 1):
         """
         Import presets from multiple files.
 
@@ -102,8 +116,14 @@ class Presets(CollectionBase):
 
         Args:
             file_paths (List[str]): List of file paths to import presets from.
+            max_workers (int, optional): Number of worker processes used to read the files. Defaults to 1 (read in this process). None uses one per CPU.
+
+        Examples:
+        ``` py
+        presets.import_presets(file_paths=["/path/to/preset1.hlx", "/path/to/preset2.hlx"], max_workers=None)
+        ```
 
         Returns:
             None
         """
-        self._import_files(file_paths)
\ No newline at end of file
+        self._import_files(file_paths, max_workers=max_workers)
\ No newline at end of file
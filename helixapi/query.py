@@ -0,0 +1,183 @@
+"""
+Query presets across bundles and files without creating setlist, preset or snapshot objects.
+"""
+import re
+from typing import NamedTuple
+
+from .utils.data_manager import DataManager
+from .utils.files import Files, FileType
+
+# The preset fields that can be queried (their paths come from the preset mappings)
+PRESET_FIELDS = ('name', 'author', 'band', 'song', 'tempo')
+
+
+class PresetRecord(NamedTuple):
+    """
+    A preset found by a query.
+
+    Attributes:
+        file_path (str): The file the preset was found in (None for a loaded bundle).
+        setlist_index (int): The index of the setlist (None for a preset file).
+        preset_index (int): The index of the preset within its setlist.
+        name (str): The name of the preset.
+        author (str): The author of the preset (None if not set).
+        band (str): The band of the preset (None if not set).
+        song (str): The song of the preset (None if not set).
+        tempo (float): The tempo of the preset.
+    """
+    file_path: str
+    setlist_index: int
+    preset_index: int
+    name: str
+    author: str
+    band: str
+    song: str
+    tempo: float
+
+
+def _field_paths() -> dict:
+    # the mapping paths of the preset fields, relative to the preset
+    mapping = DataManager._load_mapping()['preset']
+    prefix = mapping['root'] + '.'
+    return {field: tuple(mapping[field][len(prefix):].split('.')) for field in PRESET_FIELDS}
+
+
+def _get(preset: dict, parts: tuple):
+    value = preset
+    try:
+        for part in parts:
+            value = value[part]
+    except (KeyError, TypeError):
+        return None
+    return value
+
+
+def _matcher(value):
+    # a compiled pattern is searched for, a callable is used as is, anything else must be equal
+    if isinstance(value, re.Pattern):
+        return lambda field: isinstance(field, str) and value.search(field) is not None
+    if callable(value):
+        return value
+    return lambda field: field == value
+
+
+def _in_range(low, high):
+    return lambda field: field is not None and (low is None or field >= low) and (high is None or field <= high)
+
+
+class Query:
+    """
+    Query presets by scanning the raw data of bundles, setlists and presets in a single pass.
+
+    Filters are checked against the data of each preset directly and a record is only built
+    for the presets that match, so no setlist, preset or snapshot objects are created.
+    Files are read one at a time while they are scanned.
+
+    Examples:
+    ``` py
+    helix.query.presets(name=re.compile("CLEAN"), tempo_range=(100, 140))
+    Query.files(["live.hlb", "studio.hlb"]).presets(author="Me")
+    ```
+    """
+
+    def __init__(self, data: dict = None, setlists=None, file_paths: list = None) -> None:
+        """
+        Initialize the Query class.
+
+        Args:
+            data (dict, optional): The data of a loaded bundle. Defaults to None.
+            setlists (Setlists, optional): The setlists of the loaded bundle, for live results. Defaults to None.
+            file_paths (list, optional): Bundle, setlist or preset files to scan. Defaults to None.
+        """
+        self._data = data
+        self._setlists = setlists
+        self._file_paths = list(file_paths) if file_paths else []
+
+    @classmethod
+    def files(cls, file_paths: list) -> 'Query':
+        """
+        Create a query over bundle, setlist and preset files that have not been loaded.
+
+        Args:
+            file_paths (list): The paths to the files.
+
+        Returns:
+            Query: The query.
+
+        Examples:
+        ``` py
+        Query.files(glob.glob("library/*.hlb")).presets(band="My Band")
+        ```
+        """
+        return cls(file_paths=file_paths)
+
+    def _iter_setlists(self):
+        # yield (file_path, setlist_index, setlist) for every source, reading files as they are reached
+        if self._data is not None:
+            for setlist_index, setlist in enumerate(self._data['setlists']):
+                yield None, setlist_index, setlist
+        for file_path in self._file_paths:
+            file_type = FileType.get_type(file_path)
+            data, _ = Files._import_file(file_path)
+            if file_type == FileType.BUNDLE:
+                for setlist_index, setlist in enumerate(data['setlists']):
+                    yield file_path, setlist_index, setlist
+            elif file_type == FileType.SETLIST:
+                yield file_path, 0, data
+            else:
+                yield file_path, None, {'presets': [data]}
+
+    def presets(self, name=None, author=None, band=None, song=None, tempo_range: tuple = None, live: bool = False) -> list:
+        """
+        Find the presets matching every given filter. Empty preset slots are skipped.
+
+        A string filter must be equal to the field, a compiled regular expression is searched
+        for in the field and a callable is called with the field and must return True.
+
+        Args:
+            name (str | re.Pattern | callable, optional): Filter on the name. Defaults to None.
+            author (str | re.Pattern | callable, optional): Filter on the author. Defaults to None.
+            band (str | re.Pattern | callable, optional): Filter on the band. Defaults to None.
+            song (str | re.Pattern | callable, optional): Filter on the song. Defaults to None.
+            tempo_range (tuple, optional): The (lowest, highest) tempo, inclusive. Either can be None. Defaults to None.
+            live (bool, optional): Return the Preset items of the loaded bundle instead of records. Defaults to False.
+
+        Raises:
+            Exception: If live results are requested without a loaded bundle.
+
+        Returns:
+            list: The matching presets, as PresetRecord (or Preset when live is True).
+
+        Examples:
+        ``` py
+        helix.query.presets(name=re.compile("^LEAD"), live=True)
+        ```
+        """
+        if live and self._setlists is None:
+            raise Exception('Live results are only available for the loaded bundle.')
+
+        paths = _field_paths()
+        filters = []
+        for field, value in (('name', name), ('author', author), ('band', band), ('song', song)):
+            if value is not None:
+                filters.append((paths[field], _matcher(value)))
+        if tempo_range is not None:
+            filters.append((paths['tempo'], _in_range(*tempo_range)))
+        fields = [paths[field] for field in PRESET_FIELDS]
+
+        results = []
+        for file_path, setlist_index, setlist in self._iter_setlists():
+            if live and file_path is not None:
+                break
+            for preset_index, preset in enumerate(setlist['presets']):
+                if not preset:
+                    continue
+                for parts, predicate in filters:
+                    if not predicate(_get(preset, parts)):
+                        break
+                else:
+                    if live:
+                        results.append(self._setlists[setlist_index].presets[preset_index])
+                    else:
+                        results.append(PresetRecord(file_path, setlist_index, preset_index, *(_get(preset, parts) for parts in fields)))
+        return results
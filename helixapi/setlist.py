@@ -56,21 +56,24 @@ class Setlist(ItemBase):
         """
         self._import_file(file_path=file_path)
 
-    def export_setlist(self, file_path=None):
+    def export_setlist(self, file_path=None, compression=None):
         """
         Export a setlist to a file.
 
         Args:
             file_path (str, optional): The path to the file to export. Defaults to None.
+            compression (str | CompressionProfile, optional): The compression profile ("fast", "default" or "smallest"). Defaults to None (the profile in the settings).
 
         Raises:
             Exception: If the file path is not specified or the file type is incorrect.
         """
-        self._export_file(file_path=file_path)
+        self._export_file(file_path=file_path, compression=compression)
 
     def reset_setlist(self):
         """
         Reset the setlist to its default state.
+
+        The presets are a copy of the setlist template, which is only parsed once (see `TemplatePath.load`).
         """
         self.import_setlist()
         self.name = f"SETLIST {self.index + 1}"
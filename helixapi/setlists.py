@@ -1,8 +1,9 @@
 from typing import List
-from .utils.collection_base import CollectionBase
+from .utils.collection_base import CollectionBase, LazyItems
 from .setlist import Setlist
 from .utils.constants import MAX_SETLISTS
 from .midi import MIDI
+from .utils.name_index import NameIndex
 
 class Setlists(CollectionBase):
     """
@@ -10,8 +11,11 @@ class Setlists(CollectionBase):
     """
     def __init__(self, data: dict=None):
         self._midi = MIDI()
+        self._data = data
+        self._name_index = None
         
-        super().__init__(cls=Setlist, items=[Setlist(data=data, index=i, set_active_callback=self._set_active_setlist) for i in range(MAX_SETLISTS)])
+        # setlists are created when first accessed
+        super().__init__(cls=Setlist, items=LazyItems(MAX_SETLISTS, self._create_setlist))
         
         self._set_active_setlist(0)  # Set the first setlist as active initially
 
@@ -19,10 +23,32 @@ class Setlists(CollectionBase):
         if self._items:
             self._items[self._active_index].active = True
             
+    def _create_setlist(self, index):
+        return Setlist(data=self._data, index=index, set_active_callback=self._set_active_setlist)
+
     def _set_active_setlist(self, index):
         self._active_index = index
         self._midi.commands.change_to_setlist(self._active_index)
 
+    @property
+    def name_index(self) -> NameIndex:
+        """
+        Get the index of the setlist, preset and snapshot names.
+
+        The index is built on first access and kept up to date as names are changed.
+
+        Returns:
+            NameIndex: The name index.
+
+        Examples:
+        ``` py
+        locations = helix.setlists.name_index.find_presets("CLEAN", prefix=True)
+        ```
+        """
+        if self._name_index is None:
+            self._name_index = NameIndex(self._data)
+        return self._name_index
+
     @property
     def active_index(self):
         """
@@ -64,12 +90,13 @@ class Setlists(CollectionBase):
         self._active_item = item
         self._set_active_setlist(item.index)
 
-    def export_setlists(self, file_path=None):
+    def export_setlists(self, file_path=None, max_workers: int = 1):
         """
         Export each setlist to individual files.
         
         Args:
             file_path (str): The path to export the setlists to.
+            max_workers (int, optional): Number of worker processes used to encode the files. Defaults to 1 (export in this process). None uses one per CPU.
 
         Examples:
         ``` py
@@ -77,11 +104,11 @@ class Setlists(CollectionBase):
         ```
 
         Returns:
-            None
+            dict: The files that failed to export mapped to their errors (the other files are still exported).
         """
-        self._export_files(file_path)
+        return self._export_files(file_path, max_workers=max_workers)
 
-    def import_setlists(self, file_paths: List[str]):
+    def import_setlists(self, file_paths: List[str], max_workers: int = 1):
         """
         Import each setlist from individual files.
 
@@ -92,6 +119,7 @@ class Setlists(CollectionBase):
 
         Args:
             file_paths (List[str]): The paths to import the setlists from.
+            max_workers (int, optional): Number of worker processes used to read the files. Defaults to 1 (read in this process). None uses one per CPU.
 
         Examples:
         ``` py
@@ -101,4 +129,4 @@ class Setlists(CollectionBase):
         Returns:
             None
         """
-        self._import_files(file_paths)
\ No newline at end of file
+        self._import_files(file_paths, max_workers=max_workers)
\ No newline at end of file
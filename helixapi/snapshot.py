@@ -20,6 +20,7 @@ class Snapshot(ItemBase):
     """
     Represents a Helix snapshot for a given preset. This contains specific metadata (index, name).
     """
+    __slots__ = ('index', '_active', '_get_active_callback', '_set_active_callback')
 
     def __init__(self, data: dict, setlist_index: int, preset_index: int, index: int, get_active_callback=None, set_active_callback=None, metadata: dict = {}) -> None:
         """
@@ -92,7 +93,7 @@ class Snapshot(ItemBase):
         prnit(snapshot.ledcolor)
         ```
         """
-        return self._get_data("ledcolor")
+        return LEDColor(self._get_data("ledcolor"))
 
     @ledcolor.setter
     def ledcolor(self, value: LEDColor) -> None:
@@ -112,7 +113,8 @@ class Snapshot(ItemBase):
         """
         if not isinstance(value, LEDColor):
             raise ValueError("Invalid LED color value.")
-        self._set_data("ledcolor", value)
+        # the data keeps the number of the color, as in the files
+        self._set_data("ledcolor", value.value)
 
     @property
     def active(self) -> bool:
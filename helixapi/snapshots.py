@@ -1,4 +1,4 @@
-from .utils.collection_base import CollectionBase
+from .utils.collection_base import CollectionBase, LazyItems
 from .snapshot import Snapshot
 from .utils.constants import MAX_SNAPSHOTS
 from .midi import MIDI
@@ -8,6 +8,7 @@ class Snapshots(CollectionBase):
     """
     Represents a collection of Helix snapshots for a given preset.
     """
+    __slots__ = ('_midi', '_data', '_setlist_index', '_preset_index', '_get_active_callback', '_set_active_callback', '_item_callbacks')
     def __init__(self, data: dict=None, setlist_index: int=None, preset_index: int=None, get_active_callback=None, set_active_callback=None):
         """
         Initialize the Snapshots class.
@@ -31,17 +32,22 @@ class Snapshots(CollectionBase):
         self._get_active_callback = get_active_callback
         self._set_active_callback = set_active_callback
 
-        self._items = [
-            Snapshot(
-                data=data, 
-                index=i, 
-                setlist_index=setlist_index, 
-                preset_index=preset_index, 
-                get_active_callback=self._get_active_index,
-                set_active_callback=self._set_active_snapshot
-            ) 
-            for i in range(MAX_SNAPSHOTS)
-        ]
+        self._data = data
+        # bound once and shared by every snapshot of the preset
+        self._item_callbacks = (self._get_active_index, self._set_active_snapshot)
+
+        # snapshots are created when first accessed
+        self._items = LazyItems(MAX_SNAPSHOTS, self._create_snapshot)
+
+    def _create_snapshot(self, index):
+        return Snapshot(
+            data=self._data, 
+            index=index, 
+            setlist_index=self._setlist_index, 
+            preset_index=self._preset_index, 
+            get_active_callback=self._item_callbacks[0],
+            set_active_callback=self._item_callbacks[1]
+        )
 
     @property
     def active_index(self):
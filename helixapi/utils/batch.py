@@ -0,0 +1,156 @@
+"""
+Batches of changes whose side effects are applied together.
+"""
+import contextlib
+import copy
+import marshal
+
+from ..midi import MIDI
+from .data_manager import DataManager
+from .journal import Journal
+
+
+def _copy(value):
+    # bundle data is plain JSON values, which marshal copies much faster than deepcopy
+    try:
+        return marshal.loads(marshal.dumps(value))
+    except ValueError:
+        return copy.deepcopy(value)
+
+
+class Batch:
+    """
+    A batch of changes to a bundle, used as a context manager.
+
+    While the batch is open, setlist, preset and snapshot changes are not sent over MIDI
+    right away: only the last setlist, preset and snapshot selected are sent when the batch
+    ends. The state of every setlist and preset changed through the items is saved before
+    its first change, so if the batch ends with an exception the bundle data and the active
+    setlist and preset are put back and nothing is sent. The steps a journal recorded in a
+    batch that is rolled back are dropped, so they cannot be undone or redone.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is created by `Helix.batch`. Batches cannot be nested.
+
+    Examples:
+    ``` py
+    with helix.batch():
+        for preset in helix.setlists[0].presets:
+            preset.name = preset.name.upper()
+        helix.setlists[0].presets.active_index = 3
+    ```
+    """
+
+    _current = None
+
+    def __init__(self, data: dict) -> None:
+        """
+        Initialize the batch.
+
+        Args:
+            data (dict): The bundle data.
+        """
+        self._data = data
+        # saved states by location, in the order they were first changed
+        self._saved = {}
+        # callables putting back the active item of each collection changed
+        self._restores = {}
+        # the steps of the journals following the bundle when the batch began
+        self._checkpoints = []
+
+    @classmethod
+    def current(cls) -> 'Batch':
+        """
+        Get the open batch.
+
+        Returns:
+            Batch: The open batch, or None.
+        """
+        return cls._current
+
+    def __enter__(self) -> 'Batch':
+        if Batch._current is not None:
+            raise Exception('Batches cannot be nested.')
+        Batch._current = self
+        journals = [reference() for reference in DataManager._listeners]
+        self._checkpoints = [(journal, journal._checkpoint()) for journal in journals if isinstance(journal, Journal) and journal._data is self._data]
+        DataManager.add_listener(self)
+        MIDI().commands.defer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        Batch._current = None
+        DataManager.remove_listener(self)
+        if exc_type is None:
+            MIDI().commands.flush()
+        else:
+            # MIDI is still deferred, so putting the state back sends nothing
+            self._rollback()
+            MIDI().commands.flush(send=False)
+        self._saved = {}
+        self._restores = {}
+        self._checkpoints = []
+        return False
+
+    def record(self, owner, restore) -> None:
+        """
+        Keep a way to put back state that is not in the bundle data, before its first change in the batch.
+
+        Args:
+            owner (object): The object whose state changes (only the first restore of each owner is kept).
+            restore (callable): Called without arguments to put the state back.
+        """
+        if owner not in self._restores:
+            self._restores[owner] = restore
+
+    def data_changing(self, data_manager: DataManager, key: str) -> None:
+        """
+        Save the setlist or preset about to be changed, the first time it changes in the batch.
+
+        Args:
+            data_manager (DataManager): The data manager of the item being changed.
+            key (str): The mapping key being set (name, root, etc).
+        """
+        if data_manager.data is not self._data:
+            return
+
+        setlist_index = data_manager.setlist_index
+        if data_manager.mapping_key != 'setlist':
+            # snapshots are saved with their preset (the raw slot, so an empty slot is put back empty)
+            location = ('preset', setlist_index, data_manager.preset_index)
+            if location not in self._saved:
+                self._saved[location] = _copy(self._data['setlists'][setlist_index]['presets'][data_manager.preset_index])
+        else:
+            location = ('setlist', setlist_index, key)
+            if location not in self._saved:
+                self._saved[location] = _copy(data_manager.get_data(key, None))
+
+    def data_changed(self, data_manager: DataManager, key: str) -> None:
+        """
+        Called after a value is set through a data manager (the batch only saves state before).
+
+        Args:
+            data_manager (DataManager): The data manager of the item that was changed.
+            key (str): The mapping key that was set (name, root, etc).
+        """
+
+    def _rollback(self) -> None:
+        with contextlib.ExitStack() as stack:
+            # the journals do not record putting the state back, and forget the changes it undoes
+            for journal, _ in self._checkpoints:
+                stack.enter_context(journal._paused())
+            self._restore_state()
+        for journal, checkpoint in self._checkpoints:
+            journal._restore(checkpoint)
+
+    def _restore_state(self) -> None:
+        # latest first, so the state saved first for a location is the one left in place
+        for (kind, setlist_index, key), value in reversed(list(self._saved.items())):
+            if kind == 'preset':
+                DataManager('preset', self._data, None, setlist_index=setlist_index, preset_index=key).set_data('root', value)
+            else:
+                DataManager('setlist', self._data, None, setlist_index=setlist_index).set_data(key, value)
+        for restore in reversed(list(self._restores.values())):
+            restore()
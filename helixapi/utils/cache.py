@@ -0,0 +1,221 @@
+"""
+On-disk cache of decoded bundle and setlist files.
+"""
+import gc
+import hashlib
+import logging
+import marshal
+import os
+import re
+import struct
+
+from .lazy import LazyArray
+from .settings import Settings
+
+# The crc32 of the decompressed data is read from the raw envelope, without parsing it
+_CRC32_RE = re.compile(rb'"crc32"\s*:\s*(-?[0-9]+)')
+_MAGIC = b'HXC1'
+_HEADER = struct.Struct('<4sQ')
+_EXTENSION = '.cache'
+
+
+class DecodedCache:
+    """
+    A size bounded cache of decoded bundle and setlist files.
+
+    Entries are keyed by the file path, modification time, size and the crc32 stored in the
+    file, so a changed file is never served from the cache. Each entry is written with
+    `marshal`, with the setlists of a bundle stored separately so a lazy import only loads
+    the setlists that are accessed. An eager hit still builds every object of the bundle, so
+    it is only a few times faster than decoding the file; a lazy hit only reads the setlists
+    that are used. When the cache grows over its maximum size the least
+    recently used entries are removed.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is used by `Files._import_file` when a cache directory is set in the settings.
+
+    Examples:
+    ``` py
+    cache = DecodedCache.from_settings()
+    ```
+    """
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str): The cache directory (created if it does not exist).
+            max_size (int): The maximum total size of the cache entries in bytes.
+        """
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+
+    @classmethod
+    def from_settings(cls) -> 'DecodedCache':
+        """
+        Get the cache configured in the settings.
+
+        Returns:
+            DecodedCache: The cache, or None if no cache directory is set.
+        """
+        directory = Settings().cache_directory
+        if not directory:
+            return None
+        return cls(directory, Settings().cache_max_size * 1024 * 1024)
+
+    def key(self, file_path: str, file_data: bytes) -> str:
+        """
+        Get the cache key of a file.
+
+        Args:
+            file_path (str): The path to the file.
+            file_data (bytes): The raw contents of the file.
+
+        Returns:
+            str: The cache key, or None if the file has no crc32.
+        """
+        match = _CRC32_RE.search(file_data)
+        if not match:
+            return None
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}\0{stat.st_mtime_ns}\0{len(file_data)}\0{int(match.group(1))}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _EXTENSION)
+
+    def get(self, key: str, lazy: bool = False):
+        """
+        Load a decoded file from the cache.
+
+        Args:
+            key (str): The cache key.
+            lazy (bool, optional): Only load each setlist of a bundle when it is first accessed. Defaults to False.
+
+        Returns:
+            tuple: (data, metadata), or None if the file is not in the cache.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as file:
+                buffer = file.read()
+            magic, header_size = _HEADER.unpack_from(buffer)
+            if magic != _MAGIC:
+                raise ValueError('not a cache entry')
+            data, metadata, array_key, sizes = marshal.loads(buffer[_HEADER.size:_HEADER.size + header_size])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, TypeError, struct.error) as e:
+            logging.debug(f"Discarding cache entry {entry_path}: {e}")
+            self._remove(entry_path)
+            return None
+
+        if array_key is not None:
+            spans = []
+            start = _HEADER.size + header_size
+            for size in sizes:
+                spans.append((start, start + size))
+                start += size
+            if lazy:
+                data[array_key] = LazyArray(buffer, spans, loads=marshal.loads)
+            else:
+                # building every object of the bundle is the cost of an eager hit, the garbage
+                # collector would scan them repeatedly as they are created (none can be garbage)
+                collect = gc.isenabled()
+                gc.disable()
+                try:
+                    data[array_key] = [marshal.loads(buffer[start:end]) for start, end in spans]
+                finally:
+                    if collect:
+                        gc.enable()
+
+        # mark the entry as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        logging.debug(f"Loaded from cache: {entry_path}")
+        return data, metadata
+
+    def put(self, key: str, data: dict, metadata: dict, array_key: str = None) -> None:
+        """
+        Store a decoded file in the cache.
+
+        Args:
+            key (str): The cache key.
+            data (dict): The decoded data.
+            metadata (dict): The file metadata.
+            array_key (str, optional): A top level key of the data whose elements are stored separately. Defaults to None.
+        """
+        try:
+            chunks = []
+            if array_key is not None and isinstance(data.get(array_key), list):
+                chunks = [marshal.dumps(item) for item in data[array_key]]
+                data = {k: ([] if k == array_key else v) for k, v in data.items()}
+            else:
+                array_key = None
+            header = marshal.dumps((data, metadata, array_key, [len(chunk) for chunk in chunks]))
+        except ValueError as e:
+            logging.debug(f"Not caching {key}: {e}")
+            return
+
+        entry_path = self._entry_path(key)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, 'wb') as file:
+                file.write(_HEADER.pack(_MAGIC, len(header)))
+                file.write(header)
+                for chunk in chunks:
+                    file.write(chunk)
+            os.replace(temp_path, entry_path)
+            self._evict()
+        except OSError as e:
+            # a cache that cannot be written never fails the import
+            logging.warning(f"Could not write cache entry {entry_path}: {e}")
+            self._remove(temp_path)
+
+    def _entries(self) -> list:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(_EXTENSION):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        # remove the least recently used entries until the cache fits
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in entries:
+            if total <= self.max_size:
+                break
+            self._remove(entry_path)
+            total -= size
+
+    def _remove(self, entry_path: str) -> None:
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+
+        Examples:
+        ``` py
+        DecodedCache.from_settings().clear()
+        ```
+        """
+        if not os.path.isdir(self.directory):
+            return
+        for _, _, entry_path in self._entries():
+            self._remove(entry_path)
@@ -1,25 +1,159 @@
 import logging
 import copy
 import os
-from .files import Files, FileType
+from collections.abc import MutableSequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from .files import Files, FileType, TemplatePath
+from .settings import Settings
 from .constants import MAX_SETLISTS, MAX_PRESETS
+from .batch import Batch
+
+class LazyItems(MutableSequence):
+    """
+    The items of a collection, each created the first time it is accessed.
+
+    Slots that have not been accessed hold the index the item will be created with, so
+    swapping or moving them behaves as if every item had been created up front.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is created by the collections (setlists, presets, snapshots).
+    """
+
+    def __init__(self, size: int, factory) -> None:
+        """
+        Initialize the items.
+
+        Args:
+            size (int): The number of items.
+            factory (callable): Creates the item for an index.
+        """
+        self._items = list(range(size))
+        self._factory = factory
+
+    def _materialize(self, position: int):
+        item = self._items[position]
+        if type(item) is int:
+            item = self._factory(item)
+            self._items[position] = item
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(position) for position in range(len(self._items))[index]]
+        return self._materialize(range(len(self._items))[index])
+
+    def __setitem__(self, index, value) -> None:
+        self._items[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        for position in range(len(self._items)):
+            yield self._materialize(position)
+
+    def __contains__(self, value) -> bool:
+        # an item that has not been created yet cannot be the one being looked for
+        return any(item is value or item == value for item in self._items if type(item) is not int)
+
+    def __repr__(self) -> str:
+        return f"LazyItems({len(self._items)} items, {self.created_count()} created)"
+
+    def insert(self, index: int, value) -> None:
+        self._items.insert(index, value)
+
+    def index(self, value, start: int = 0, stop: int = None) -> int:
+        for position, item in enumerate(self._items[start:stop], start):
+            if type(item) is not int and (item is value or item == value):
+                return position
+        raise ValueError(f"{value!r} is not in list")
+
+    def is_created(self, index: int) -> bool:
+        """
+        Check if the item at an index has been created.
+
+        Args:
+            index (int): The index of the item.
+
+        Returns:
+            bool: True if the item has been created, False otherwise.
+        """
+        return type(self._items[index]) is not int
+
+    def created_count(self) -> int:
+        """
+        Get the number of items that have been created.
+
+        Returns:
+            int: The number of created items.
+        """
+        return sum(1 for item in self._items if type(item) is not int)
+
 
 class CollectionBase:
-    def _export_files(self, file_path, generic_names=False):
+    __slots__ = ('_items', '_cls_name', '__active_index')
+
+    def _export_files(self, file_path, generic_names=False, max_workers=1):
         if not FileType.get_member_by_name(self._cls_name) in [FileType.SETLIST, FileType.PRESET]:
             raise Exception(f'Export is only supported setlist or preset.')
         
         filetype = FileType.get_member_by_name(self._cls_name).name.lower()
         fileextension = FileType.get_member_by_name(self._cls_name).value.lower()
 
+        # name every file up front, reserving names so items with the same name still get unique suffixes
+        export_paths = []
+        reserved = set()
         for index, item in enumerate(self._items):
             if generic_names:
                 export_path = os.path.abspath(os.path.join(file_path, f"{filetype}_{index}.{fileextension}"))
-            else:       
-                export_path = Files._get_unique_filename(os.path.abspath(os.path.join(file_path, f"{item.name}.{fileextension}")))
-            item._export_file(export_path)
+            else:
+                export_path = Files._get_unique_filename(os.path.abspath(os.path.join(file_path, f"{item.name}.{fileextension}")), reserved=reserved)
+            reserved.add(export_path)
+            export_paths.append(export_path)
+
+        failures = {}
+        if max_workers == 1:
+            for item, export_path in zip(self._items, export_paths):
+                try:
+                    item._export_file(export_path)
+                except Exception as e:
+                    failures[export_path] = e
+            return self._report_failures(failures)
+
+        # encode the files in worker processes and write them from a thread pool as they are ready
+        compression = Settings().compression
+        writes = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as encoders, ThreadPoolExecutor(max_workers=max_workers) as writers:
+            encodes = {}
+            for item, export_path in zip(self._items, export_paths):
+                logging.debug(f"Exporting {self._cls_name}: {export_path}")
+                encodes[encoders.submit(Files._encode_file, export_path, item._get_data(key='root'), item._data_manager.metadata, compression)] = export_path
+            for future in as_completed(encodes):
+                export_path = encodes[future]
+                try:
+                    contents = future.result()
+                except Exception as e:
+                    failures[export_path] = e
+                    continue
+                writes[writers.submit(Files._write_file, export_path, contents)] = export_path
+            for future in as_completed(writes):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures[writes[future]] = e
+        return self._report_failures(failures)
+
+    def _report_failures(self, failures):
+        for export_path, error in failures.items():
+            logging.error(f"Failed to export {self._cls_name}: {export_path}: {error}")
+        return failures
     
-    def _import_files(self, file_paths):
+    def _import_files(self, file_paths, max_workers=1):
         if not FileType.get_member_by_name(self._cls_name) in [FileType.SETLIST, FileType.PRESET]:
             raise Exception(f'Import is only supported setlist or preset.')
 
@@ -27,10 +161,26 @@ class CollectionBase:
         if len(file_paths) > max_items:
             raise Exception(f"Number of items to import exceeds maximum ({max_items})")
 
-        for index, item in enumerate(self._items):
-            if index >= len(file_paths):
-                break
-            item._import_file(file_paths[index])
+        if max_workers == 1:
+            for index, item in enumerate(self._items):
+                if index >= len(file_paths):
+                    break
+                item._import_file(file_paths[index])
+            return
+
+        # decode the files in worker processes, then load them into the items in the caller's order
+        file_paths = file_paths[:len(self._items)]
+        if not file_paths:
+            return
+        template_path = TemplatePath.get_by_file_type_name(self._cls_name)
+        chunksize = max(1, len(file_paths) // ((max_workers or os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(Files._import_file, [file_path for file_path in file_paths if file_path], chunksize=chunksize)
+            for item, file_path in zip(self._items, file_paths):
+                # items without a file path are reset from the template, which is already parsed
+                data, metadata = next(results) if file_path else TemplatePath.load(template_path)
+                logging.debug(f"Importing {self._cls_name}: {file_path or template_path}")
+                item._load_imported(data, metadata)
 
     def __init__(self, cls=None, items=None):
         self._items = items if items else []
@@ -42,6 +192,11 @@ class CollectionBase:
         else:
             self._cls_name = cls.__name__.lower()
 
+    @property
+    def _slots(self):
+        # the underlying list, so items can be reordered without creating them
+        return self._items._items if isinstance(self._items, LazyItems) else self._items
+
     def __getitem__(self, index):
         return self._items[index]
 
@@ -73,7 +228,8 @@ class CollectionBase:
         Returns:
             None
         """
-        self._items[index1], self._items[index2] = self._items[index2], self._items[index1]
+        slots = self._slots
+        slots[index1], slots[index2] = slots[index2], slots[index1]
 
     def move(self, from_index, to_index):
         """
@@ -91,13 +247,16 @@ class CollectionBase:
         Returns:
             None
         """
-        item = self._items.pop(from_index)
-        self._items.insert(to_index, item)
+        slots = self._slots
+        slots.insert(to_index, slots.pop(from_index))
 
     def clone(self, source_index, target_index):
         """
         Clone an item from the source index and overwrite the item at the target index.
 
+        Only the data of the source item (one setlist, preset or snapshot) is copied, into the
+        slot of the target item, so the target item keeps its own index.
+
         Args:
             source_index (int): The index of the item to clone.
             target_index (int): The index where the cloned item should be stored.
@@ -116,8 +275,9 @@ class CollectionBase:
         if not (0 <= target_index < len(self._items)):
             raise IndexError("Target index out of range")
 
-        # Deep copy the source item and overwrite the target item
-        self._items[target_index] = copy.deepcopy(self._items[source_index])
+        # Deep copy the data of the source item into the target item
+        source = self._items[source_index]._get_data('root')
+        self._items[target_index]._set_data('root', copy.deepcopy(source))
 
     @property
     def _active_index(self):
@@ -126,6 +286,10 @@ class CollectionBase:
     @_active_index.setter
     def _active_index(self, index):
         if self.__active_index != index:
+            batch = Batch.current()
+            if batch is not None:
+                previous = self.__active_index
+                batch.record(self, lambda: setattr(self, '_active_index', previous))
             if 0 <= self.__active_index < len(self._items):
                 # Deactivate the previous active item
                 self._items[self.__active_index].active = False
@@ -1,58 +1,236 @@
 import os
+import sys
+import weakref
 import yaml
 import logging
-import copy
 from .files import TemplatePath
+from .settings import Settings
+
+# Placeholders in the mapping paths and the accessor arguments they are replaced with
+PLACEHOLDERS = {
+    'setlist_index': 'setlist_index',
+    'preset_index': 'preset_index',
+    'snapshot_snapshot_index': 'snapshot_key',
+}
+
+# Raised by get_data when a key is missing and no default is given
+_MISSING = object()
+
+# The parsed preset template, shared by every empty preset slot until the slot is written to
+_template_view = None
+
+def _preset_view():
+    """
+    Get the shared preset template read by empty preset slots.
+
+    The template is parsed once and never copied, so reading an empty slot costs nothing.
+    It must not be modified: writes to an empty slot go to a copy made by `_new_preset`.
+
+    Returns:
+        dict: The preset template data.
+    """
+    global _template_view
+    if _template_view is None:
+        _template_view, _ = TemplatePath.load(TemplatePath.PRESET.value)
+    return _template_view
+
+def _new_preset():
+    """
+    Get a copy of the preset template to fill an empty preset slot with, author included.
+
+    Returns:
+        dict: The preset data.
+    """
+    data, _ = TemplatePath.load(TemplatePath.PRESET.value)
+    apply_author(data)
+    return data
+
+def default_author(author):
+    """
+    Get the author a preset is written with, given the author it has.
+
+    Args:
+        author (str): The author of the preset (None or empty if not set).
+
+    Returns:
+        str: The author name from the settings if the preset has none or overwrite is enabled, the given author otherwise.
+    """
+    settings = Settings()
+    if not author or settings.author_overwrite:
+        return settings.author_name
+    return author
+
+def apply_author(preset):
+    """
+    Write the default author into the data of a preset (see `default_author`).
+
+    Args:
+        preset (dict): The preset data (an empty slot is left empty).
+    """
+    if not preset:
+        return
+    meta = preset['data']['meta']
+    meta['author'] = default_author(meta.get('author'))
 
 class DataManager:
+    __slots__ = ('mapping_key', 'setlist_index', 'preset_index', '_snapshot_index', '_snapshot_key', 'data', 'metadata', '_accessors')
+
     _mapping_cache = None
-    _preset_cache = None
+    _accessor_cache = {}
+    # weak references to the objects told about every value set through a data manager (see NameIndex)
+    _listeners = []
 
     def __init__(self, cls, data, metadata, setlist_index=None, preset_index=None, snapshot_index=None):
-        script_dir = os.path.dirname(__file__)
-        if DataManager._mapping_cache is None:
-            file_path = os.path.join(script_dir, 'mappings.yaml')
-            with open(file_path, 'r') as file:
-                DataManager._mapping_cache = yaml.safe_load(file)['data']
+        DataManager._load_mapping()
 
-        self.mapping = DataManager._mapping_cache
-        self.mapping_key = cls.__name__.lower()
+        self.mapping_key = sys.intern(cls if isinstance(cls, str) else cls.__name__.lower())
         self.setlist_index = setlist_index
         self.preset_index = preset_index
         self.snapshot_index = snapshot_index
         self.data = data
         self.metadata = metadata
+        self._accessors = DataManager._compile(self.mapping_key)
 
-    def get_data(self, key):
-        path = self.mapping[self.mapping_key][key]
-        return self._navigate_path(path)
+    @classmethod
+    def _load_mapping(cls):
+        """
+        Load the mapping paths of every class from mappings.yaml, once.
+
+        Returns:
+            dict: The mapping paths by class (setlist, preset or snapshot) and key.
+        """
+        if DataManager._mapping_cache is None:
+            file_path = os.path.join(os.path.dirname(__file__), 'mappings.yaml')
+            with open(file_path, 'r') as file:
+                DataManager._mapping_cache = yaml.safe_load(file)['data']
+        return DataManager._mapping_cache
+
+    @classmethod
+    def add_listener(cls, listener):
+        """
+        Tell a listener about every value set through a data manager.
+
+        `listener.data_changing(data_manager, key)` is called before the value is set and
+        `listener.data_changed(data_manager, key)` after. The listener is only weakly referenced
+        and stops being called once it is garbage collected.
+
+        Args:
+            listener (object): The listener, with data_changing and data_changed methods.
+        """
+        cls._listeners.append(weakref.ref(listener, cls._forget_listener))
+
+    @classmethod
+    def remove_listener(cls, listener):
+        """
+        Stop telling a listener about the values set through a data manager.
+
+        Args:
+            listener (object): The listener added with `add_listener`.
+        """
+        cls._forget_listener(weakref.ref(listener))
+
+    @classmethod
+    def _forget_listener(cls, reference):
+        if reference in cls._listeners:
+            cls._listeners.remove(reference)
+
+    @property
+    def mapping(self):
+        return DataManager._mapping_cache
+
+    @property
+    def snapshot_index(self):
+        return self._snapshot_index
+
+    @snapshot_index.setter
+    def snapshot_index(self, index):
+        self._snapshot_index = index
+        # the key of the snapshot in the preset data, kept so it is not formatted on every access
+        # (interned, so the snapshots of every preset share the same few strings)
+        self._snapshot_key = sys.intern(f"snapshot{index}")
+
+    @classmethod
+    def _compile(cls, mapping_key):
+        """
+        Compile the mapping paths of a class into getter, setter and deleter functions, once per class.
+
+        Each path becomes a chain of subscripts taking the item's indices as arguments, so
+        accessing a value does not split or scan the path. Reading through an empty preset
+        slot reads the shared preset template; writing fills the slot with a copy of it.
+
+        Args:
+            mapping_key (str): The mapping key of the class (setlist, preset or snapshot).
+
+        Returns:
+            tuple: (getters, setters, deleters), dictionaries of functions by mapping key (name, author, etc).
+        """
+        if mapping_key not in cls._accessor_cache:
+            getters = {}
+            setters = {}
+            deleters = {}
+            for key, path in cls._mapping_cache[mapping_key].items():
+                getters[key], setters[key], deleters[key] = cls._compile_path(path)
+            cls._accessor_cache[mapping_key] = (getters, setters, deleters)
+        return cls._accessor_cache[mapping_key]
+
+    @staticmethod
+    def _compile_path(path):
+        getter_lines = []
+        setter_lines = []
+        target = 'data'
+        parts = path.split('.')
+        for position, part in enumerate(parts):
+            subscript = PLACEHOLDERS.get(part, repr(part))
+            if part == 'preset_index' and position < len(parts) - 1:
+                # An empty preset slot is read from the shared template and only filled with a copy when written to
+                getter_lines.append(f"preset = {target}[preset_index] or _preset_view()")
+                setter_lines.append(f"presets = {target}")
+                setter_lines.append("preset = presets[preset_index]")
+                setter_lines.append("if not preset:")
+                setter_lines.append("    preset = presets[preset_index] = _new_preset()")
+                parent, target = target, 'preset'
+                continue
+            if part == 'preset_index':
+                # The whole preset of an empty slot is handed out as a copy, so the shared template is never exposed
+                getter_lines.append(f"preset = {target}[preset_index] or _new_preset()")
+                parent, target = target, 'preset'
+                continue
+            parent, target = target, f"{target}[{subscript}]"
+
+        getter_body = ''.join(f"    {line}\n" for line in getter_lines)
+        setter_body = ''.join(f"    {line}\n" for line in setter_lines)
+        source = (
+            f"def getter(data, setlist_index, preset_index, snapshot_key):\n{getter_body}    return {target}\n"
+            f"def setter(data, setlist_index, preset_index, snapshot_key, value):\n{setter_body}"
+            f"    if value is not None:\n        {parent}[{subscript}] = value\n"
+            f"def deleter(data, setlist_index, preset_index, snapshot_key):\n{setter_body}"
+            f"    {parent}.pop({subscript}, None)\n"
+        )
+        namespace = {'_preset_view': _preset_view, '_new_preset': _new_preset}
+        exec(compile(source, f"<mapping {path}>", 'exec'), namespace)
+        return namespace['getter'], namespace['setter'], namespace['deleter']
+
+    def get_data(self, key, default=_MISSING):
+        try:
+            return self._accessors[0][key](self.data, self.setlist_index, self.preset_index, self._snapshot_key)
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+
+    def _notify(self, event, key):
+        for reference in DataManager._listeners:
+            listener = reference()
+            if listener is not None:
+                getattr(listener, event)(self, key)
 
     def set_data(self, key, value):
-        path = self.mapping[self.mapping_key][key]
-        self._navigate_path(path, value)
-
-    def _navigate_path(self, path, value=None):
-        keys = path.split('.')
-        data = self.data
-
-        for i, key in enumerate(keys):
-            if key == 'setlist_index':
-                key = self.setlist_index
-            elif key == 'preset_index':
-                key = self.preset_index
-                if not data[key]:
-                    # If the value is empty and it's a preset, load template data
-                    if DataManager._preset_cache is None:
-                        file_path = TemplatePath.PRESET.value
-                        with open(file_path, 'r') as file:
-                            DataManager._preset_cache = yaml.safe_load(file)
-                    data[key] = copy.deepcopy(DataManager._preset_cache)
-            elif key == 'snapshot_snapshot_index':
-                key = f"snapshot{self.snapshot_index}"
-
-            if i == len(keys) - 1:
-                if value is not None:
-                    data[key] = value
-                return data[key]
-            else:
-                data = data[key]
\ No newline at end of file
+        self._notify('data_changing', key)
+        self._accessors[1][key](self.data, self.setlist_index, self.preset_index, self._snapshot_key, value)
+        self._notify('data_changed', key)
+
+    def delete_data(self, key):
+        # only used to put back a value that did not exist (the root of an item is never deleted)
+        self._notify('data_changing', key)
+        self._accessors[2][key](self.data, self.setlist_index, self.preset_index, self._snapshot_key)
+        self._notify('data_changed', key)
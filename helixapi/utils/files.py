@@ -1,12 +1,47 @@
-import base64
 import json
 import zlib
 import binascii
+import io
+import itertools
+import logging
+import marshal
+import mmap
 import os
+import re
+import shutil
+import tempfile
+import uuid
 
 from enum import Enum
 import time
 
+from .json_backend import get_backend
+from .settings import Settings
+from .lazy import LazyArray, loads_lazy
+from .cache import DecodedCache
+
+# Size of the base64 chunks fed to the decompressor (must be a multiple of 4)
+DECODE_CHUNK_SIZE = 64 * 1024
+# Maximum size of the output of each decompression step
+DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+# The bytes that are not base 64 (line breaks, etc), removed before decoding so every chunk decodes whole
+_NOT_BASE64 = bytes(code for code in range(256) if not (chr(code).isascii() and (chr(code).isalnum() or chr(code) in '+/=')))
+# Size of the compressed chunks base 64 encoded at a time on export (must be a multiple of 3)
+ENCODE_CHUNK_SIZE = 48 * 1024
+# Levels of objects and arrays serialized member by member on export (down to the presets of a bundle)
+STREAM_DEPTH = 4
+
+# The permissions of a newly created file, for exports written to a temporary file first
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
+# Parsed templates by path (see TemplatePath.load)
+_template_cache = {}
+
+# The start of the "encoded_data" string in a bundle or setlist file
+_ENCODED_DATA_RE = re.compile(rb'"encoded_data"\s*:\s*"')
+
 class FileType(Enum):
     """File types for Helix bundle, setlist, and preset files.
     
@@ -176,7 +211,92 @@ class TemplatePath(Enum):
         file_type = FileType.get_member_by_name(type_name)
         return TemplatePath.get_by_file_type(file_type=file_type)
 
-    
+    @classmethod
+    def load(cls, template_path: str) -> tuple:
+        """Returns a copy of the data and metadata of a template.
+
+        Each template is only read and parsed the first time it is loaded. Every call
+        returns a new copy, so it can be changed freely.
+
+        Args:
+            template_path (str): The template path.
+
+        Returns:
+            tuple: (data, metadata) as returned by `Files._import_file`.
+
+        Examples:
+        ``` py
+        data, metadata = TemplatePath.load(TemplatePath.PRESET.value)
+        ```
+        """
+        if template_path not in _template_cache:
+            # stored marshalled, which is far quicker to copy from than a deep copy of the parsed data
+            _template_cache[template_path] = marshal.dumps(Files._import_file(template_path))
+        return marshal.loads(_template_cache[template_path])
+
+
+class CompressionProfile(Enum):
+    """Compression profiles for exporting Helix bundle and setlist files.
+
+    Attributes:
+        FAST (str): Fastest export, largest files (zlib level 1).
+        DEFAULT (str): The zlib default (level 6).
+        SMALLEST (str): Slowest export, smallest files (zlib level 9 with the largest memory level and filtered strategy).
+
+    Examples:
+    ``` py
+    profile = CompressionProfile.FAST
+    ```
+    """
+
+    FAST = 'fast'
+    DEFAULT = 'default'
+    SMALLEST = 'smallest'
+
+    @property
+    def options(self) -> dict:
+        """Returns the `zlib.compressobj` options for the profile.
+
+        Returns:
+            dict: The compression options.
+
+        Examples:
+        ``` py
+        CompressionProfile.FAST.options
+        ```
+        """
+        if self == CompressionProfile.FAST:
+            return {'level': 1}
+        elif self == CompressionProfile.SMALLEST:
+            return {'level': 9, 'memLevel': 9, 'strategy': zlib.Z_FILTERED}
+        return {'level': zlib.Z_DEFAULT_COMPRESSION}
+
+    @classmethod
+    def get_by_name(cls, name) -> 'CompressionProfile':
+        """Returns the compression profile based on its name.
+
+        Args:
+            name (str | CompressionProfile): The name of the profile (or the profile itself).
+
+        Returns:
+            CompressionProfile: The compression profile.
+
+        Raises:
+            ValueError: If the name is not a valid profile.
+
+        Examples:
+        ``` py
+        profile = CompressionProfile.get_by_name('fast')
+        ```
+        """
+        if isinstance(name, cls):
+            return name
+        for member in cls:
+            if str(name).lower() == member.value:
+                return member
+        raise ValueError(f"{name} is not a valid CompressionProfile name")
+
+
 class Files:
     """Performs operations on Helix bundle, setlist, and preset files."""
 
@@ -184,12 +304,13 @@ class Files:
         pass
 
     @staticmethod
-    def _get_unique_filename(file_name):
+    def _get_unique_filename(file_name, reserved=None):
         base, ext = os.path.splitext(file_name)
         counter = 1
         new_file_name = file_name
 
-        while os.path.exists(new_file_name):
+        # reserved holds names already claimed by files that have not been written yet
+        while os.path.exists(new_file_name) or (reserved is not None and new_file_name in reserved):
             new_file_name = f"{base} ({counter}){ext}"
             counter += 1
 
@@ -259,97 +380,233 @@ class Files:
             raise Exception("Directory is not writable:", directory)
             
     @staticmethod
-    def _decode_data(data: dict) -> bytes:
+    def _decode_stream(encoded_data, compression=None, keep_data=True) -> bytearray:
         """
-        Base 64 decodes data.
-        
+        Base 64 decodes and zlib decompresses data in chunks.
+
+        The encoded data is decoded one chunk at a time and fed straight into the
+        decompressor, so the full compressed payload is never held in memory. When the
+        "compression" block of the file is given, the crc32 and size of the decompressed
+        data are checked as it is produced, stopping as soon as it grows past its size.
+
         Args:
-            data (dict): The data to decode.
-        
+            encoded_data (str | bytes | memoryview): The base 64 encoded, zlib compressed data.
+            compression (dict, optional): The "compression" block of the file. Defaults to None (no checks).
+            keep_data (bool, optional): Keep the decompressed data. Defaults to True.
+
         Returns:
-            bytes: The decoded data.
+            bytearray: The decompressed data (empty if keep_data is False).
+
+        Raises:
+            Exception: If the data is truncated or does not match the crc32 or size of the file.
+            zlib.error: If the data is not valid zlib data.
 
         Examples:
         ``` py
-        Files._decode_data(data)
+        Files._decode_stream(encoded_data, compression=metadata["compression"])
         ```
-
-        Returns:
-            bytes
         """
-        return base64.b64decode(data)
+        compression = compression if isinstance(compression, dict) else {}
+        expected_crc32 = compression.get('crc32')
+        expected_size = compression.get('decompressed_size')
+
+        decompressor = zlib.decompressobj()
+        decompressed_data = bytearray()
+        crc32_value = 0
+        size = 0
+
+        def consume(output):
+            nonlocal crc32_value, size
+            size += len(output)
+            if expected_size is not None and size > expected_size:
+                raise Exception(f'Decompressed data is larger than its size in the file ({expected_size} bytes).')
+            if expected_crc32 is not None:
+                crc32_value = binascii.crc32(output, crc32_value)
+            if keep_data:
+                decompressed_data.extend(output)
+
+        # the characters left over after the last multiple of 4 are decoded with the next chunk
+        pending = b''
+        for start in range(0, len(encoded_data), DECODE_CHUNK_SIZE):
+            chunk = encoded_data[start:start + DECODE_CHUNK_SIZE]
+            chunk = pending + (chunk.encode('ascii', 'ignore') if isinstance(chunk, str) else bytes(chunk)).translate(None, _NOT_BASE64)
+            end = len(chunk) - len(chunk) % 4 if start + DECODE_CHUNK_SIZE < len(encoded_data) else len(chunk)
+            chunk, pending = binascii.a2b_base64(chunk[:end]), chunk[end:]
+            # bound the output of each step, so an oversized payload is caught before it is inflated
+            while chunk:
+                consume(decompressor.decompress(chunk, DECOMPRESS_CHUNK_SIZE))
+                chunk = decompressor.unconsumed_tail
+        consume(decompressor.flush())
+
+        if not decompressor.eof:
+            raise Exception('Compressed data is truncated.')
+        if expected_size is not None and size != expected_size:
+            raise Exception(f'Decompressed data is smaller than its size in the file ({size} of {expected_size} bytes).')
+        if expected_crc32 is not None and crc32_value != expected_crc32 & 0xffffffff:
+            raise Exception('Decompressed data does not match its crc32 in the file.')
+
+        return decompressed_data
 
     @staticmethod
-    def _encode_data(data):
+    def _decode_envelope(raw_data, keep_data=True):
         """
-        Base 64 encodes data.
-        
+        Parses the envelope of a bundle or setlist file and decodes its "encoded_data".
+
+        The "encoded_data" string is located in the raw bytes and decoded straight from
+        them, so it is never copied into a Python string and the rest of the envelope is
+        parsed without it. Files the scan does not understand are parsed in full.
+        The decoded data is checked against the crc32 and size in the envelope.
+
         Args:
-            data (bytes): The data to encode.
-        
+            raw_data (bytes | mmap.mmap): The raw contents of the file.
+            keep_data (bool, optional): Keep the decompressed data. Defaults to True.
+
         Returns:
-            str: The encoded data.
+            tuple: (metadata, decompressed data)
 
         Examples:
         ``` py
-        Files._encode_data(data)
+        metadata, decompressed_data = Files._decode_envelope(raw_data)
         ```
-
-        Returns:
-            str
         """
-        return base64.b64encode(data).decode('utf-8')
+        match = _ENCODED_DATA_RE.search(raw_data)
+        if match:
+            start = match.end()
+            end = raw_data.find(b'"', start)
+            # base 64 data never needs escaping, so a backslash means the string is not plain base 64
+            if end != -1 and raw_data.find(b'\\', start, end) == -1:
+                metadata = get_backend().loads(raw_data[:start] + raw_data[end:])
+                if metadata.get('encoded_data') == "":
+                    del metadata['encoded_data']
+                    with memoryview(raw_data) as view:
+                        with view[start:end] as encoded_data:
+                            return metadata, Files._decode_stream(encoded_data, metadata.get('compression'), keep_data=keep_data)
+
+        metadata = get_backend().loads(raw_data[:])
+        return metadata, Files._decode_stream(metadata.pop('encoded_data'), metadata.get('compression'), keep_data=keep_data)
 
     @staticmethod
-    def _decompress_data(compressed_data):
+    def verify(file_path: str) -> bool:
         """
-        Zlib decompresses data.
-        
+        Checks that a bundle, setlist, or preset file can be imported.
+
+        The encoded data of bundles and setlists is decoded in chunks and checked against
+        the crc32 and size stored in the file, without keeping the decoded data or building
+        any objects from it. Preset files are checked to be valid JSON.
+
         Args:
-            compressed_data (bytes): The data to decompress.
-        
+            file_path (str): The path to the file to check.
+
         Returns:
-            bytes: The decompressed data.
+            bool: True if the file is intact, False otherwise.
 
         Examples:
         ``` py
-        Files._decompress_data(compressed_data)
+        if not Files.verify(file_path):
+            print(f"{file_path} is corrupted")
         ```
-
-        Returns:
-            bytes
         """
-        return zlib.decompress(compressed_data)
+        try:
+            Files._check_existing_file(file_path)
+            with open(file_path, 'rb') as file:
+                if FileType.get_type(file_path) == FileType.PRESET or not os.fstat(file.fileno()).st_size:
+                    get_backend().loads(file.read())
+                    return True
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as raw_data:
+                    Files._decode_envelope(raw_data, keep_data=False)
+            return True
+        except Exception as e:
+            logging.warning(f"File failed verification: {file_path}: {e}")
+            return False
 
     @staticmethod
-    def _compress_data(data:dict):
+    def _dumps_compact(data) -> bytes:
         """
-        Zlib compresses data.
-        
+        Serializes data to compact JSON bytes.
+
+        Lazily loaded arrays are written element by element, with elements that were
+        never parsed copied back verbatim from the file they were loaded from.
+
         Args:
-            data (dict): The data to compress.
-        
+            data (dict): The data to serialize.
+
         Returns:
-            bytes: The compressed data.
+            bytes: The compact JSON.
 
         Examples:
         ``` py
-        Files._compress_data(data)
+        Files._dumps_compact(data)
         ```
+        """
+        if not isinstance(data, dict) or not any(isinstance(value, LazyArray) for value in data.values()):
+            return get_backend().dumps_compact(data)
+
+        members = []
+        for key, value in data.items():
+            if isinstance(value, LazyArray):
+                items = [value.raw(index) or Files._dumps_compact(value[index]) for index in range(len(value))]
+                value = b'[' + b','.join(items) + b']'
+            else:
+                value = Files._dumps_compact(value)
+            members.append(json.dumps(key).encode('utf-8') + b':' + value)
+        return b'{' + b','.join(members) + b'}'
 
-        Returns:
-            bytes
+    @staticmethod
+    def _iter_compact(data, depth=STREAM_DEPTH):
+        """
+        Serializes data to compact JSON bytes in chunks.
+
+        Objects and arrays down to the given depth are written member by member, anything
+        deeper (a preset in a bundle or setlist) is serialized in one go. Joined together
+        the chunks are the same as `Files._dumps_compact`.
+
+        Args:
+            data (Any): The data to serialize.
+            depth (int, optional): The number of levels written member by member. Defaults to STREAM_DEPTH.
+
+        Yields:
+            bytes: The next chunk of compact JSON.
+
+        Examples:
+        ``` py
+        for chunk in Files._iter_compact(data):
+            compressor.compress(chunk)
+        ```
         """
-        return zlib.compress(data)
+        if depth and isinstance(data, dict):
+            yield b'{'
+            for index, (key, value) in enumerate(data.items()):
+                yield (b',' if index else b'') + json.dumps(key).encode('utf-8') + b':'
+                yield from Files._iter_compact(value, depth - 1)
+            yield b'}'
+        elif depth and isinstance(data, (list, LazyArray)):
+            yield b'['
+            for index in range(len(data)):
+                if index:
+                    yield b','
+                raw = data.raw(index) if isinstance(data, LazyArray) else None
+                if raw is not None:
+                    yield raw
+                else:
+                    yield from Files._iter_compact(data[index], depth - 1)
+            yield b']'
+        else:
+            yield Files._dumps_compact(data)
 
     @staticmethod
-    def _import_file(file_path):
+    def _import_file(file_path, lazy=False):
         """
         Imports a bundle, setlist, or preset file.
         
         All contents of a preset file is returned as "data".
         All contents of bundle and setlist "encoded_data" key is decoded, decompressed, and returned as "data".
         All other keys from bundle and setlist are returned as "metadata".
+        When a cache directory is set in the settings, decoded bundles and setlists are cached
+        and importing an unchanged file again skips decoding.
+
+        Args:
+            file_path (str): The path to the file to import.
+            lazy (bool, optional): Only parse each setlist of a bundle when it is first accessed. Defaults to False.
 
         Returns:
             tuple: (data, metadata)
@@ -361,32 +618,48 @@ class Files:
         """
         Files._check_existing_file(file_path)
 
-        with open(file_path, 'r') as file:
-            file_data = json.load(file)
+        with open(file_path, 'rb') as file:
+            if FileType.get_type(file_path) == FileType.PRESET or not os.fstat(file.fileno()).st_size:
+                return get_backend().loads(file.read()), {}
 
-            if FileType.get_type(file_path) == FileType.PRESET:
-                return file_data, {}
-            
-            # decode
-            encoded_data = file_data.pop('encoded_data')
-            decoded_data = Files._decode_data(encoded_data)
+            # map the file rather than reading it, so processes reading the same files share the pages
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as raw_data:
+                # skip decoding if the file is in the decoded cache
+                cache = DecodedCache.from_settings()
+                cache_key = cache.key(file_path, raw_data) if cache else None
+                if cache_key:
+                    cached = cache.get(cache_key, lazy=lazy)
+                    if cached:
+                        return cached
 
-            # decompress
-            decompressed_data = Files._decompress_data(decoded_data)
-            decompressed_data = decompressed_data.strip().decode('utf-8')
-            decompressed_data = json.loads(decompressed_data)
+                # decode and decompress
+                file_data, decompressed_data = Files._decode_envelope(raw_data)
 
-            return decompressed_data, file_data
+        data = None
+        if lazy and FileType.get_type(file_path) == FileType.BUNDLE:
+            data = loads_lazy(decompressed_data, 'setlists')
+        if data is None:
+            data = get_backend().loads(decompressed_data)
+
+        # lazily loaded data is not cached, as that would mean parsing all of it
+        if cache_key and not isinstance(data.get('setlists'), LazyArray):
+            cache.put(cache_key, data, file_data, array_key='setlists')
+
+        return data, file_data
 
     @staticmethod
-    def _export_file(file_path, data, metadata):
+    def _export_file(file_path, data, metadata, compression=None):
         """
         Exports a bundle, setlist, or preset file.
+
+        The file is written as it is encoded (see `Files._write_encoded`), to a temporary file in
+        the same directory that replaces the file once it is complete.
         
         Args:
             file_path (str): The path to the file to export.
             data (dict): The data to export.
             metadata (dict): The metadata to export.
+            compression (str | CompressionProfile, optional): The compression profile for bundles and setlists. Defaults to None (the profile in the settings).
 
         Examples:    
         ```
@@ -394,46 +667,158 @@ class Files:
         ```
         """
         # error if file path is bad
+        Files._check_nonexisting_file(file_path)
+
+        Files._write_atomic(file_path, lambda file: Files._write_encoded(file, file_path, data, metadata, compression=compression))
+
+    @staticmethod
+    def _write_file(file_path, contents):
+        """
+        Writes the contents of an encoded bundle, setlist, or preset file.
+
+        The file is replaced only once it is complete, as with `Files._export_file`.
+
+        Args:
+            file_path (str): The path to the file to write.
+            contents (str): The file contents from `Files._encode_file`.
+
+        Examples:
+        ``` py
+        Files._write_file(file_path, contents)
+        ```
+        """
+        Files._write_atomic(file_path, lambda file: file.write(contents))
+
+    @staticmethod
+    def _write_atomic(file_path, write):
+        """
+        Writes a file through a temporary file in the same directory, which replaces the file once it is complete.
+
+        A failed write leaves an existing file as it was and no partially written file behind.
+        The file keeps the permissions of the file it replaces.
+
+        Args:
+            file_path (str): The path to the file to write.
+            write (callable): Called with the open text file to write the contents.
+
+        Examples:
+        ``` py
+        Files._write_atomic(file_path, lambda file: file.write(contents))
+        ```
+        """
+        temp_file = tempfile.NamedTemporaryFile('w', dir=os.path.dirname(os.path.abspath(file_path)), prefix='.export-', suffix='.tmp', delete=False)
+        try:
+            with temp_file as file:
+                write(file)
+            if os.path.isfile(file_path):
+                shutil.copymode(file_path, temp_file.name)
+            else:
+                os.chmod(temp_file.name, _NEW_FILE_MODE)
+            os.replace(temp_file.name, file_path)
+        except BaseException:
+            os.remove(temp_file.name)
+            raise
+
+    @staticmethod
+    def _encode_file(file_path, data, metadata, compression=None):
+        """
+        Encodes a bundle, setlist, or preset file without writing it.
+
+        Args:
+            file_path (str): The path the file will be exported to (used to pick the file type).
+            data (dict): The data to export.
+            metadata (dict): The metadata to export.
+            compression (str | CompressionProfile, optional): The compression profile for bundles and setlists. Defaults to None (the profile in the settings).
+
+        Returns:
+            str: The file contents.
+
+        Examples:
+        ``` py
+        contents = Files._encode_file(file_path, data, metadata)
+        ```
+        """
+        buffer = io.StringIO()
+        Files._write_encoded(buffer, file_path, data, metadata, compression=compression)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _write_encoded(file, file_path, data, metadata, compression=None):
+        """
+        Encodes a bundle, setlist, or preset file, writing it to a text stream as it goes.
+
+        The data is serialized in chunks that are fed straight into the compressor while its
+        crc32 and size are computed, so the full JSON is never held in memory. The envelope
+        is then written around the "encoded_data" string, which is base 64 encoded from the
+        compressed data one chunk at a time.
+
+        Args:
+            file (io.TextIOBase): The stream to write to.
+            file_path (str): The path the file will be exported to (used to pick the file type).
+            data (dict): The data to export.
+            metadata (dict): The metadata to export.
+            compression (str | CompressionProfile, optional): The compression profile for bundles and setlists. Defaults to None (the profile in the settings).
+
+        Examples:
+        ``` py
+        with open(file_path, 'w') as file:
+            Files._write_encoded(file, file_path, data, metadata)
+        ```
+        """
+        # error if file path is bad
         Files._check_nonexisting_file(file_path)        
 
         if FileType.get_type(file_path) == FileType.PRESET:
-            with open(file_path, 'w') as file:
-                json.dump(data, file, indent=1)
+            file.write(get_backend().dumps_pretty(data))
             return
 
         # error if template file path is bad
         template_file_path = TemplatePath.get_by_file_path(file_path)
         Files._check_existing_file(template_file_path)
 
-        # Create a copy of data to avoid modifying the original
-        data_copy = data.copy()        
-
         # save to later set in hlb/hls header
         if FileType.get_type(file_path) == FileType.SETLIST:
-            name = data_copy["meta"]["name"]
+            name = data["meta"]["name"]
         else:
             name = metadata["meta"]["name"]
 
-        decoded_data = data_copy
-        data_copy = json.dumps(decoded_data, separators=(',', ':'))
-        data_copy = data_copy.encode('utf-8')
-
-        compressed_data = Files._compress_data(data_copy)
-        encoded_data = Files._encode_data(compressed_data)
-        crc32_value = binascii.crc32(data_copy)
+        if compression is None:
+            compression = Settings().compression
+        compressor = zlib.compressobj(**CompressionProfile.get_by_name(compression).options)
+        compressed_data = bytearray()
+        crc32_value = 0
+        size = 0
+        # small chunks are gathered before compressing, as each compressor call has a cost
+        pending = bytearray()
+        for chunk in itertools.chain(Files._iter_compact(data), [None]):
+            if chunk is not None:
+                pending += chunk
+                if len(pending) < ENCODE_CHUNK_SIZE:
+                    continue
+            crc32_value = binascii.crc32(pending, crc32_value)
+            size += len(pending)
+            compressed_data += compressor.compress(pending)
+            pending.clear()
+        compressed_data += compressor.flush()
 
         if not metadata:
-            with open(template_file_path, 'r') as file:
-                metadata = json.load(file)
+            with open(template_file_path, 'rb') as template_file:
+                metadata = get_backend().loads(template_file.read())
                 metadata.pop('encoded_data')
 
         metadata['meta']['name'] = name
         metadata["meta"]["modifieddate"] = int(time.time())
 
-        metadata["encoded_data"] = encoded_data
-
-        metadata["compression"]["decompressed_size"] = len(data_copy)
+        metadata["compression"]["decompressed_size"] = size
         metadata["compression"]["crc32"] = crc32_value
- 
-        with open(file_path, 'w') as file:
-            json.dump(metadata, file, indent=1)
\ No newline at end of file
+
+        # lay out the envelope with a placeholder, then stream the encoded data in its place
+        placeholder = uuid.uuid4().hex
+        envelope = get_backend().dumps_pretty({**metadata, "encoded_data": placeholder})
+        head, tail = envelope.split(f'"{placeholder}"', 1)
+
+        file.write(head + '"')
+        with memoryview(compressed_data) as view:
+            for start in range(0, len(view), ENCODE_CHUNK_SIZE):
+                file.write(binascii.b2a_base64(view[start:start + ENCODE_CHUNK_SIZE], newline=False).decode('ascii'))
+        file.write('"' + tail)
@@ -1,27 +1,35 @@
 """Base module for models in the API."""
 import logging
-from .data_manager import DataManager
+import sys
+from .data_manager import DataManager, _MISSING
 from .files import FileType, Files, TemplatePath
 from .standards import Standards
 
 class ItemBase:
+    # items are created by the thousand, so they keep their attributes in slots rather than a __dict__
+    __slots__ = ('_cls_name', '_data_manager')
+
     def __init__(self, cls, data, metadata, setlist_index=None, preset_index=None, snapshot_index=None):
-        self._cls_name = cls.__name__.lower()
+        self._cls_name = sys.intern(cls.__name__.lower())
         self._data_manager = DataManager(cls=cls, data=data, metadata=metadata, setlist_index=setlist_index, preset_index=preset_index, snapshot_index=snapshot_index)
-        self._standards = Standards()
 
-    def _get_data(self, key):
-        return self._data_manager.get_data(key)
+    @property
+    def _standards(self):
+        return Standards()
+
+    def _get_data(self, key, default=_MISSING):
+        return self._data_manager.get_data(key, default)
 
     def _set_data(self, key, value):
         self._data_manager.set_data(key, value)
 
-    def _export_file(self, file_path=None):
+    def _export_file(self, file_path=None, compression=None):
         """
         Export the current item to a file.
 
         Args:
             file_path (str): Path to export the bundle file to.
+            compression (str | CompressionProfile, optional): The compression profile. Defaults to None (the profile in the settings).
 
         Raises:
             Exception: If the file path is not specified or the file type is incorrect.
@@ -34,7 +42,7 @@ class ItemBase:
         if not file_path:
             raise Exception('File path must be specified.')
         
-        Files._export_file(file_path=file_path, data=self._get_data(key='root'), metadata=self._data_manager.metadata)
+        Files._export_file(file_path=file_path, data=self._get_data(key='root'), metadata=self._data_manager.metadata, compression=compression)
 
     def _import_file(self, file_path=None):
         """
@@ -53,10 +61,23 @@ class ItemBase:
 
         if not file_path:
             # use template
-            data, metadata = Files._import_file(TemplatePath.get_by_file_type_name(self._cls_name))
+            data, metadata = TemplatePath.load(TemplatePath.get_by_file_type_name(self._cls_name))
         else:
             data, metadata = Files._import_file(file_path)
 
+        self._load_imported(data, metadata)
+
+    def _load_imported(self, data, metadata):
+        """
+        Load the data and metadata of an imported file into the current item.
+
+        Args:
+            data (dict): The imported data.
+            metadata (dict): The imported metadata.
+
+        Raises:
+            Exception: If the item type does not support imports.
+        """
         # Assign the relevant parts of the data and metadata
         if self._cls_name in ['setlist', 'preset']:
             self._set_data('root', data)
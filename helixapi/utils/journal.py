@@ -0,0 +1,224 @@
+"""
+Journal of the changes made to a bundle, for undo and redo.
+"""
+import contextlib
+from collections import deque
+
+from .data_manager import DataManager
+
+# The value of a change for a key that did not exist
+_ABSENT = object()
+
+
+class Journal:
+    """
+    A journal of the changes made to a bundle through its items, with undo and redo.
+
+    Each change is recorded as the value before and after it: a single value for a name,
+    tempo, etc, and a reference to the replaced setlist, preset or snapshot for imports,
+    resets and clones (which replace the whole item rather than changing it). Undo and redo
+    put those values back, so they cost as much as the change itself and the bundle is
+    never copied. Changes are recorded from the moment the journal is created.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is created by `Helix.journal`.
+
+    Examples:
+    ``` py
+    helix.setlists[0].presets[0].name = "Clean"
+    helix.journal.undo()
+    helix.journal.redo()
+    ```
+    """
+
+    # changes made while a group is open are undone and redone together
+    _group_depth = 0
+    _group_count = 0
+
+    def __init__(self, data: dict, limit: int = None) -> None:
+        """
+        Initialize the journal.
+
+        Args:
+            data (dict): The bundle data.
+            limit (int, optional): The maximum number of steps kept for undo. Defaults to None (no limit).
+        """
+        self._data = data
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+        self._group = None
+        self._pending = None
+        self._replaying = False
+        DataManager.add_listener(self)
+
+    @classmethod
+    @contextlib.contextmanager
+    def group(cls):
+        """
+        Record the changes made in the context as a single step.
+
+        Examples:
+        ``` py
+        with helix.journal.group():
+            preset.name = "Lead"
+            preset.tempo = 140
+        ```
+        """
+        cls._group_depth += 1
+        try:
+            yield
+        finally:
+            cls._group_depth -= 1
+            if not cls._group_depth:
+                cls._group_count += 1
+
+    @property
+    def can_undo(self) -> bool:
+        """
+        Check if there is a step to undo.
+
+        Returns:
+            bool: True if a step can be undone, False otherwise.
+        """
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        """
+        Check if there is a step to redo.
+
+        Returns:
+            bool: True if a step can be redone, False otherwise.
+        """
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        """
+        Forget every recorded step.
+        """
+        self._undo.clear()
+        self._redo.clear()
+        self._group = None
+
+    def _checkpoint(self) -> tuple:
+        # the steps as they are, to put them back when a batch is rolled back (the last step is
+        # copied, as changes made in a group that is still open are added to it)
+        undo = list(self._undo)
+        if undo:
+            undo[-1] = list(undo[-1])
+        return undo, list(self._redo), self._group
+
+    def _restore(self, checkpoint: tuple) -> None:
+        undo, self._redo, self._group = checkpoint
+        self._undo = deque(undo, maxlen=self._undo.maxlen)
+        self._pending = None
+
+    @contextlib.contextmanager
+    def _paused(self):
+        # changes made in the context are not recorded, as for undo and redo
+        replaying, self._replaying = self._replaying, True
+        try:
+            yield
+        finally:
+            self._replaying = replaying
+
+    def data_changing(self, data_manager: DataManager, key: str) -> None:
+        """
+        Keep the value about to be changed through a data manager.
+
+        Args:
+            data_manager (DataManager): The data manager of the item being changed.
+            key (str): The mapping key being set (name, root, etc).
+        """
+        if self._replaying or data_manager.data is not self._data:
+            return
+
+        if data_manager.mapping_key == 'setlist':
+            self._pending = (data_manager, key, data_manager.get_data(key, _ABSENT))
+            return
+
+        presets = self._data['setlists'][data_manager.setlist_index]['presets']
+        slot = presets[data_manager.preset_index]
+        if not slot or (data_manager.mapping_key == 'preset' and key == 'root'):
+            # the preset is filled from the template or replaced: keep a reference to the replaced slot
+            preset_manager = DataManager('preset', self._data, None, data_manager.setlist_index, data_manager.preset_index)
+            self._pending = (preset_manager, 'root', slot)
+        else:
+            self._pending = (data_manager, key, data_manager.get_data(key, _ABSENT))
+
+    def data_changed(self, data_manager: DataManager, key: str) -> None:
+        """
+        Record the change made through a data manager.
+
+        Args:
+            data_manager (DataManager): The data manager of the item that was changed.
+            key (str): The mapping key that was set (name, root, etc).
+        """
+        if self._pending is None:
+            return
+        manager, key, old = self._pending
+        self._pending = None
+        if key == 'root' and manager.mapping_key == 'preset':
+            new = self._data['setlists'][manager.setlist_index]['presets'][manager.preset_index]
+        else:
+            new = manager.get_data(key, _ABSENT)
+        if new is old:
+            return
+
+        change = (manager, key, old, new)
+        if Journal._group_depth and self._group == Journal._group_count and self._undo:
+            self._undo[-1].append(change)
+        else:
+            self._undo.append([change])
+            self._group = Journal._group_count if Journal._group_depth else None
+        self._redo.clear()
+
+    def _apply(self, changes, index: int) -> None:
+        with self._paused():
+            for change in changes:
+                manager, key, value = change[0], change[1], change[index]
+                if value is _ABSENT:
+                    manager.delete_data(key)
+                else:
+                    manager.set_data(key, value)
+        self._group = None
+
+    def undo(self) -> bool:
+        """
+        Undo the last step.
+
+        Returns:
+            bool: True if a step was undone, False if there was nothing to undo.
+
+        Examples:
+        ``` py
+        helix.journal.undo()
+        ```
+        """
+        if not self._undo:
+            return False
+        changes = self._undo.pop()
+        self._apply(reversed(changes), 2)
+        self._redo.append(changes)
+        return True
+
+    def redo(self) -> bool:
+        """
+        Redo the last step undone.
+
+        Returns:
+            bool: True if a step was redone, False if there was nothing to redo.
+
+        Examples:
+        ``` py
+        helix.journal.redo()
+        ```
+        """
+        if not self._redo:
+            return False
+        changes = self._redo.pop()
+        self._apply(changes, 3)
+        self._undo.append(changes)
+        return True
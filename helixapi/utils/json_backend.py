@@ -0,0 +1,217 @@
+"""
+JSON backends used to read and write Helix files.
+
+The standard library `json` module is always available. When orjson is installed it is
+used instead, falling back to the standard library for anything orjson would not write
+byte for byte the same way (non ASCII text, DEL, floats in exponent form, NaN, etc).
+"""
+import json
+import logging
+import math
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# orjson formats floats in exponent form and floats under 1e-4 differently than the standard library
+_EXPONENT_RE = re.compile(rb'e[-+]?[0-9]')
+_SMALL_FLOAT = b'0.0000'
+# Some orjson versions read integers over 64 bits as floats instead of failing. With those, data
+# with an integer of 20 digits or more is read by the standard library. The data is scanned in
+# windows, with the digits translated to "0", the characters a digit run follows in a string,
+# a fraction or an exponent translated to "x" and the rest to " ".
+_LOSSY_INTEGERS = orjson is not None and isinstance(orjson.loads(b'18446744073709551616'), float)
+_NUMBER_CHARACTERS = bytes(
+    ord('0') if chr(code) in '0123456789' else ord('x') if chr(code) in '.eE"' else ord(' ')
+    for code in range(256)
+)
+_LONG_INTEGER = b' ' + b'0' * 20
+_SCAN_WINDOW = 1024 * 1024
+
+
+def _has_long_integer(data) -> bool:
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    overlap = len(_LONG_INTEGER) - 1
+    with memoryview(data) as view:
+        for start in range(0, len(view), _SCAN_WINDOW):
+            # windows of the data are copied (not the whole data), each repeating the end of the previous one
+            window = b' ' + view[:_SCAN_WINDOW] if not start else bytes(view[start - overlap:start + _SCAN_WINDOW])
+            if window.translate(_NUMBER_CHARACTERS).find(_LONG_INTEGER) != -1:
+                return True
+    return False
+
+def _has_non_finite(data) -> bool:
+    # orjson writes NaN and Infinity as null, the standard library writes them as they are
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(value) for value in data)
+    return False
+
+
+class StdlibBackend:
+    """JSON backend using the standard library `json` module."""
+
+    name = 'stdlib'
+
+    def loads(self, data):
+        """
+        Deserialize JSON.
+
+        Args:
+            data (str | bytes | bytearray): The JSON to deserialize.
+
+        Returns:
+            Any: The deserialized data.
+        """
+        return json.loads(data)
+
+    def dumps_compact(self, data) -> bytes:
+        """
+        Serialize data to compact JSON (no whitespace).
+
+        Args:
+            data (Any): The data to serialize.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+        """
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+    def dumps_canonical(self, data) -> bytes:
+        """
+        Serialize data to compact JSON with the object keys sorted, so equal data always gives the same bytes.
+
+        Args:
+            data (Any): The data to serialize.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+        """
+        return json.dumps(data, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+    def dumps_pretty(self, data) -> str:
+        """
+        Serialize data to JSON indented by one space, the layout used for Helix files.
+
+        Args:
+            data (Any): The data to serialize.
+
+        Returns:
+            str: The JSON.
+        """
+        return json.dumps(data, indent=1)
+
+
+class OrjsonBackend(StdlibBackend):
+    """JSON backend using orjson, with the output kept identical to `StdlibBackend`."""
+
+    name = 'orjson'
+
+    def loads(self, data):
+        if _LOSSY_INTEGERS and _has_long_integer(data):
+            return super().loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN, Infinity and integers over 64 bits are only accepted by the standard library
+            return super().loads(data)
+
+    def _dumps(self, data, option=None):
+        try:
+            output = orjson.dumps(data, option=option)
+        except TypeError:
+            return None
+        # the standard library escapes DEL, orjson writes it as it is
+        if not output.isascii() or b'\x7f' in output or _SMALL_FLOAT in output:
+            return None
+        if b'null' in output and _has_non_finite(data):
+            return None
+        for match in _EXPONENT_RE.finditer(output):
+            if output[match.start() - 1:match.start()].isdigit():
+                return None
+        return output
+
+    def dumps_compact(self, data) -> bytes:
+        output = self._dumps(data)
+        if output is None:
+            return super().dumps_compact(data)
+        return output
+
+    def dumps_canonical(self, data) -> bytes:
+        output = self._dumps(data, option=orjson.OPT_SORT_KEYS)
+        if output is None:
+            return super().dumps_canonical(data)
+        return output
+
+    def dumps_pretty(self, data) -> str:
+        output = self._dumps(data, option=orjson.OPT_INDENT_2)
+        if output is None:
+            return super().dumps_pretty(data)
+        # orjson only indents by two spaces. Strings never contain a raw newline or NUL, so the spaces
+        # after a newline are indentation and NUL can mark lines that were already halved (deepest first).
+        depth = 1
+        while b'\n' + b'  ' * depth in output:
+            depth += 1
+        for level in range(depth - 1, 0, -1):
+            output = output.replace(b'\n' + b'  ' * level, b'\n' + b'\x00' * level)
+        return output.replace(b'\x00', b' ').decode('utf-8')
+
+
+BACKENDS = {
+    StdlibBackend.name: StdlibBackend,
+    OrjsonBackend.name: OrjsonBackend,
+}
+
+_backend = None
+
+
+def available_backends() -> list:
+    """
+    Get the names of the JSON backends that can be used in this environment.
+
+    Returns:
+        list: The backend names.
+    """
+    return [name for name in BACKENDS if name != OrjsonBackend.name or orjson is not None]
+
+
+def set_backend(name: str = None) -> None:
+    """
+    Select the JSON backend used to read and write files.
+
+    Args:
+        name (str, optional): The backend name ('stdlib' or 'orjson'). Defaults to None (the fastest available).
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+
+    Examples:
+    ``` py
+    set_backend('stdlib')
+    ```
+    """
+    global _backend
+    if name is None:
+        name = OrjsonBackend.name if orjson is not None else StdlibBackend.name
+    if name not in available_backends():
+        raise ValueError(f"JSON backend is not available: {name}")
+    _backend = BACKENDS[name]()
+    logging.debug("JSON backend: %s", name)
+
+
+def get_backend() -> StdlibBackend:
+    """
+    Get the JSON backend used to read and write files.
+
+    Returns:
+        StdlibBackend: The selected backend.
+    """
+    if _backend is None:
+        set_backend()
+    return _backend
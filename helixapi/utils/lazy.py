@@ -0,0 +1,224 @@
+"""
+Lazy parsing of large JSON arrays in decompressed bundle data.
+"""
+import bisect
+import json
+import re
+from array import array
+from collections.abc import MutableSequence
+from itertools import accumulate
+
+from .json_backend import get_backend
+
+# Every byte except the structural characters (quotes and brackets) is dropped when scanning
+_STRUCTURAL = b'"[]{}'
+_NON_STRUCTURAL = bytes(b for b in range(256) if b not in _STRUCTURAL)
+_SIGNS = bytes.maketrans(b'[]{}', bytes([1, 255, 1, 255]))
+_ESCAPE_RE = re.compile(rb'\\.', re.DOTALL)
+_BRACKET_RE = re.compile(rb'[\[\]{}]')
+_ARRAY_VALUE_RE = re.compile(rb'\s*:\s*\[')
+_BLOCK_SIZE = 64 * 1024
+
+
+class _Span:
+    """Byte span of an element that has not been parsed yet."""
+    __slots__ = ('start', 'end')
+
+    def __init__(self, start: int, end: int) -> None:
+        self.start = start
+        self.end = end
+
+
+class LazyArray(MutableSequence):
+    """
+    A JSON array whose elements are only parsed when first accessed.
+
+    Elements start out as byte spans into the decompressed buffer they were scanned from.
+    Reading an element parses its span with the JSON backend (or the given loader) and keeps
+    the result, so each element is parsed at most once. Elements of JSON buffers that were
+    never read can be written back verbatim with `raw`.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is created by `Files._import_file(file_path, lazy=True)`.
+    """
+
+    def __init__(self, buffer: bytes, spans: list, loads=None) -> None:
+        self._buffer = buffer
+        self._loads = loads
+        self._items = [_Span(start, end) for start, end in spans]
+        self._pending = len(self._items)
+
+    def _materialize(self, index: int):
+        item = self._items[index]
+        if isinstance(item, _Span):
+            item = (self._loads or get_backend().loads)(self._buffer[item.start:item.end])
+            self._items[index] = item
+            self._loaded()
+        return item
+
+    def _loaded(self) -> None:
+        self._pending -= 1
+        if not self._pending:
+            # every element is parsed, the scanned buffer is no longer needed
+            self._buffer = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(len(self._items))[index]]
+        return self._materialize(range(len(self._items))[index])
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            raise TypeError('LazyArray does not support slice assignment.')
+        if isinstance(self._items[index], _Span):
+            self._loaded()
+        self._items[index] = value
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            raise TypeError('LazyArray does not support slice deletion.')
+        if isinstance(self._items[index], _Span):
+            self._loaded()
+        del self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def insert(self, index: int, value) -> None:
+        self._items.insert(index, value)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LazyArray, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyArray({len(self._items)} items, {self._pending} unparsed)"
+
+    def is_loaded(self, index: int) -> bool:
+        """
+        Check if an element has been parsed.
+
+        Args:
+            index (int): The index of the element.
+
+        Returns:
+            bool: True if the element has been parsed, False otherwise.
+        """
+        return not isinstance(self._items[index], _Span)
+
+    def raw(self, index: int):
+        """
+        Get the original JSON bytes of an element that has not been parsed.
+
+        Args:
+            index (int): The index of the element.
+
+        Returns:
+            bytes: The JSON bytes of the element, or None if it has been parsed (or the buffer is not JSON).
+        """
+        item = self._items[index]
+        if isinstance(item, _Span) and self._loads is None:
+            return bytes(self._buffer[item.start:item.end])
+        return None
+
+
+def _bracket_offsets(buffer, indexes: list) -> list:
+    """
+    Find the byte offsets of brackets by their position among all brackets in the buffer.
+
+    Args:
+        buffer (bytes): The JSON buffer.
+        indexes (list): Sorted bracket positions (0 is the first bracket in the buffer).
+
+    Returns:
+        list: The byte offset of each bracket.
+    """
+    block_starts = list(range(0, len(buffer), _BLOCK_SIZE))
+    totals = list(accumulate(
+        sum(buffer.count(char, start, start + _BLOCK_SIZE) for char in (b'[', b']', b'{', b'}'))
+        for start in block_starts
+    ))
+
+    offsets = []
+    for index in indexes:
+        block = bisect.bisect_right(totals, index)
+        seen = totals[block - 1] if block else 0
+        for match in _BRACKET_RE.finditer(buffer, block_starts[block]):
+            if seen == index:
+                offsets.append(match.start())
+                break
+            seen += 1
+    return offsets
+
+
+def loads_lazy(buffer, key: str):
+    """
+    Parse a JSON object, leaving the array under a top level key unparsed.
+
+    The buffer is scanned once for the byte span of each element of the array and the
+    array is replaced with a `LazyArray`. The scan relies on bracket counting, so if any
+    string in the buffer contains a bracket (or the layout is not as expected) None is
+    returned and the caller should parse the buffer normally.
+
+    Args:
+        buffer (bytes): The JSON buffer.
+        key (str): The top level key holding the array.
+
+    Returns:
+        dict: The parsed object, or None if the buffer could not be scanned.
+
+    Examples:
+    ``` py
+    data = loads_lazy(decompressed_data, 'setlists')
+    ```
+    """
+    # brackets can only be counted directly if no string contains one
+    source = _ESCAPE_RE.sub(b'', buffer) if b'\\' in buffer else buffer
+    # (with the escapes removed, a string holding no brackets is reduced to an adjacent pair of quotes)
+    brackets = source.translate(None, _NON_STRUCTURAL).replace(b'""', b'')
+    if b'"' in brackets or not brackets.startswith(b'{'):
+        return None
+
+    # find the key at the top level of the object
+    needle = json.dumps(key).encode('utf-8')
+    position = buffer.find(needle)
+    while position != -1:
+        depth = buffer.count(b'{', 0, position) + buffer.count(b'[', 0, position) \
+            - buffer.count(b'}', 0, position) - buffer.count(b']', 0, position)
+        if depth == 1:
+            break
+        position = buffer.find(needle, position + 1)
+    else:
+        return None
+
+    match = _ARRAY_VALUE_RE.match(buffer, position + len(needle))
+    if not match:
+        return None
+    array_start = match.end() - 1
+
+    # walk the brackets from the start of the array, noting where each element opens and closes
+    first = sum(buffer.count(char, 0, array_start) for char in (b'[', b']', b'{', b'}'))
+    signs = array('b', brackets[first:].translate(_SIGNS))
+    bounds = []
+    for index, depth in enumerate(accumulate(signs)):
+        if depth == 0:
+            bounds.append(first + index)
+            break
+        if (depth == 2 and signs[index] == 1) or (depth == 1 and signs[index] == -1):
+            bounds.append(first + index)
+
+    offsets = _bracket_offsets(buffer, bounds)
+    array_end = offsets.pop()
+    spans = [(offsets[i], offsets[i + 1] + 1) for i in range(0, len(offsets), 2)]
+
+    # every element must be a container, anything in between is separators and whitespace
+    between = [buffer[end:start] for end, start in zip([array_start + 1] + [end for _, end in spans], [start for start, _ in spans] + [array_end])]
+    if any(part.strip(b' \t\r\n,') for part in between):
+        return None
+
+    data = get_backend().loads(buffer[:array_start] + b'[]' + buffer[array_end + 1:])
+    data[key] = LazyArray(buffer, spans)
+    return data
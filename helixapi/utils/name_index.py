@@ -0,0 +1,240 @@
+"""
+Index of the setlist, preset and snapshot names of a bundle.
+"""
+import bisect
+
+from .constants import MAX_SNAPSHOTS
+from .data_manager import DataManager
+
+
+class _NameTable:
+    """Locations by name, with the names kept sorted for prefix lookups."""
+    __slots__ = ('_names', '_exact', '_folded', '_sorted', '_sorted_folded')
+
+    def __init__(self) -> None:
+        self._names = {}
+        self._exact = {}
+        self._folded = {}
+        self._sorted = []
+        self._sorted_folded = []
+
+    def __contains__(self, location) -> bool:
+        return location in self._names
+
+    @staticmethod
+    def _add(table, sorted_keys, key, location, keep_sorted) -> None:
+        locations = table.get(key)
+        if locations is None:
+            table[key] = {location}
+            if keep_sorted:
+                bisect.insort(sorted_keys, key)
+        else:
+            locations.add(location)
+
+    @staticmethod
+    def _remove(table, sorted_keys, key, location) -> None:
+        locations = table[key]
+        locations.discard(location)
+        if not locations:
+            del table[key]
+            del sorted_keys[bisect.bisect_left(sorted_keys, key)]
+
+    def set(self, location, name, keep_sorted=True) -> None:
+        name = str(name)
+        old = self._names.get(location)
+        if old == name:
+            return
+        if old is not None:
+            self.discard(location)
+        self._names[location] = name
+        self._add(self._exact, self._sorted, name, location, keep_sorted)
+        self._add(self._folded, self._sorted_folded, name.casefold(), location, keep_sorted)
+
+    def discard(self, location) -> None:
+        name = self._names.pop(location, None)
+        if name is not None:
+            self._remove(self._exact, self._sorted, name, location)
+            self._remove(self._folded, self._sorted_folded, name.casefold(), location)
+
+    def sort(self) -> None:
+        # after adding names in bulk without keeping them sorted
+        self._sorted = sorted(self._exact)
+        self._sorted_folded = sorted(self._folded)
+
+    def find(self, name: str, prefix: bool = False, ignore_case: bool = False) -> list:
+        table, sorted_keys = (self._folded, self._sorted_folded) if ignore_case else (self._exact, self._sorted)
+        if ignore_case:
+            name = name.casefold()
+        if not prefix:
+            return sorted(table.get(name, ()))
+
+        locations = []
+        for position in range(bisect.bisect_left(sorted_keys, name), len(sorted_keys)):
+            key = sorted_keys[position]
+            if not key.startswith(name):
+                break
+            locations.extend(table[key])
+        return sorted(locations)
+
+
+class NameIndex:
+    """
+    An index of the names of the setlists, presets and snapshots of a bundle.
+
+    The index is built once from the bundle data and then kept up to date as names are
+    set (or whole setlists and presets are imported, cloned or filled) through the items,
+    so lookups by exact name are O(1) and prefix lookups O(log n). Empty preset slots are
+    not indexed. Changes made to the bundle data directly are not seen by the index.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is created by `Setlists.name_index`.
+
+    Examples:
+    ``` py
+    helix.setlists.name_index.find_presets("CLEAN", prefix=True, ignore_case=True)
+    ```
+    """
+
+    def __init__(self, data: dict) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            data (dict): The bundle data.
+        """
+        self._data = data
+        self._setlists = _NameTable()
+        self._presets = _NameTable()
+        self._snapshots = _NameTable()
+
+        DataManager._load_mapping()
+        self._setlist_name = DataManager._compile('setlist')[0]['name']
+        self._preset_name = DataManager._compile('preset')[0]['name']
+        self._snapshot_name = DataManager._compile('snapshot')[0]['name']
+
+        for setlist_index in range(len(data['setlists'])):
+            self._index_setlist(setlist_index, keep_sorted=False)
+        for table in (self._setlists, self._presets, self._snapshots):
+            table.sort()
+
+        # follow the changes made through the items
+        DataManager.add_listener(self)
+
+    def _index_setlist(self, setlist_index: int, keep_sorted: bool = True) -> None:
+        self._setlists.set((setlist_index,), self._setlist_name(self._data, setlist_index, None, None), keep_sorted)
+        for preset_index in range(len(self._data['setlists'][setlist_index]['presets'])):
+            self._index_preset(setlist_index, preset_index, keep_sorted)
+
+    def _index_preset(self, setlist_index: int, preset_index: int, keep_sorted: bool = True) -> None:
+        if not self._data['setlists'][setlist_index]['presets'][preset_index]:
+            self._presets.discard((setlist_index, preset_index))
+            for snapshot_index in range(MAX_SNAPSHOTS):
+                self._snapshots.discard((setlist_index, preset_index, snapshot_index))
+            return
+
+        self._presets.set((setlist_index, preset_index), self._preset_name(self._data, setlist_index, preset_index, None), keep_sorted)
+        for snapshot_index in range(MAX_SNAPSHOTS):
+            self._index_snapshot(setlist_index, preset_index, snapshot_index, keep_sorted)
+
+    def _index_snapshot(self, setlist_index: int, preset_index: int, snapshot_index: int, keep_sorted: bool = True) -> None:
+        try:
+            name = self._snapshot_name(self._data, setlist_index, preset_index, f"snapshot{snapshot_index}")
+        except KeyError:
+            self._snapshots.discard((setlist_index, preset_index, snapshot_index))
+            return
+        self._snapshots.set((setlist_index, preset_index, snapshot_index), name, keep_sorted)
+
+    def data_changing(self, data_manager: DataManager, key: str) -> None:
+        """
+        Called before a value is set through a data manager (the index only updates after).
+
+        Args:
+            data_manager (DataManager): The data manager of the item being changed.
+            key (str): The mapping key being set (name, root, etc).
+        """
+
+    def data_changed(self, data_manager: DataManager, key: str) -> None:
+        """
+        Update the index after a value was set through a data manager.
+
+        Args:
+            data_manager (DataManager): The data manager of the item that was changed.
+            key (str): The mapping key that was set (name, root, etc).
+        """
+        if data_manager.data is not self._data:
+            return
+
+        kind = data_manager.mapping_key
+        setlist_index = data_manager.setlist_index
+        preset_index = data_manager.preset_index
+        if kind == 'setlist':
+            if key == 'root':
+                self._index_setlist(setlist_index)
+            elif key == 'name':
+                self._setlists.set((setlist_index,), self._setlist_name(self._data, setlist_index, None, None))
+        elif (setlist_index, preset_index) not in self._presets or (kind == 'preset' and key == 'root'):
+            # the preset was replaced, or an empty slot was just filled
+            self._index_preset(setlist_index, preset_index)
+        elif kind == 'preset' and key == 'name':
+            self._presets.set((setlist_index, preset_index), self._preset_name(self._data, setlist_index, preset_index, None))
+        elif kind == 'snapshot' and key in ('name', 'root'):
+            self._index_snapshot(setlist_index, preset_index, data_manager.snapshot_index)
+
+    def find_setlists(self, name: str, prefix: bool = False, ignore_case: bool = False) -> list:
+        """
+        Find setlists by name.
+
+        Args:
+            name (str): The name (or the start of the name) to find.
+            prefix (bool, optional): Find the names starting with the given name. Defaults to False.
+            ignore_case (bool, optional): Ignore the case of the names. Defaults to False.
+
+        Returns:
+            list: The matching setlist indexes, sorted.
+
+        Examples:
+        ``` py
+        helix.setlists.name_index.find_setlists("LIVE")
+        ```
+        """
+        return [location[0] for location in self._setlists.find(name, prefix, ignore_case)]
+
+    def find_presets(self, name: str, prefix: bool = False, ignore_case: bool = False) -> list:
+        """
+        Find presets by name.
+
+        Args:
+            name (str): The name (or the start of the name) to find.
+            prefix (bool, optional): Find the names starting with the given name. Defaults to False.
+            ignore_case (bool, optional): Ignore the case of the names. Defaults to False.
+
+        Returns:
+            list: The matching (setlist_index, preset_index) locations, sorted.
+
+        Examples:
+        ``` py
+        setlist_index, preset_index = helix.setlists.name_index.find_presets("Clean Verb")[0]
+        ```
+        """
+        return self._presets.find(name, prefix, ignore_case)
+
+    def find_snapshots(self, name: str, prefix: bool = False, ignore_case: bool = False) -> list:
+        """
+        Find snapshots by name.
+
+        Args:
+            name (str): The name (or the start of the name) to find.
+            prefix (bool, optional): Find the names starting with the given name. Defaults to False.
+            ignore_case (bool, optional): Ignore the case of the names. Defaults to False.
+
+        Returns:
+            list: The matching (setlist_index, preset_index, snapshot_index) locations, sorted.
+
+        Examples:
+        ``` py
+        helix.setlists.name_index.find_snapshots("solo", ignore_case=True)
+        ```
+        """
+        return self._snapshots.find(name, prefix, ignore_case)
@@ -7,6 +7,7 @@ import logging
 from typing import Dict, Any
 
 DEFAULT_LOG_LEVEL = logging.INFO
+DEFAULT_CACHE_MAX_SIZE = 256
 
 class Settings:
     """Class for managing configuration settings."""
@@ -79,6 +80,51 @@ class Settings:
             return False
         return value
 
+    @property
+    def compression(self) -> str:
+        """
+        Get the compression profile used when exporting bundles and setlists from the settings.
+
+        One of "fast" (quickest saves), "default" or "smallest" (smallest files).
+
+        Returns:
+            str: The compression profile name.
+        """
+        value = self.settings.get("compression", "default")
+        if not isinstance(value, str):
+            return "default"
+        return value
+
+    @property
+    def cache_directory(self) -> str:
+        """
+        Get the directory used to cache decoded bundles and setlists from the settings.
+
+        Importing a bundle or setlist that is in the cache skips decoding. When empty, nothing is cached.
+
+        Returns:
+            str: The cache directory, or an empty string if caching is disabled.
+        """
+        directory = (self.settings.get("cache") or {}).get("directory", "")
+        if not isinstance(directory, str):
+            return ""
+        return os.path.expanduser(directory)
+
+    @property
+    def cache_max_size(self) -> int:
+        """
+        Get the maximum size of the decoded cache in megabytes from the settings.
+
+        The least recently used entries are removed when the cache grows over this size.
+
+        Returns:
+            int: The maximum cache size in megabytes.
+        """
+        value = (self.settings.get("cache") or {}).get("max_size", DEFAULT_CACHE_MAX_SIZE)
+        if not isinstance(value, int) or isinstance(value, bool):
+            return DEFAULT_CACHE_MAX_SIZE
+        return value
+
     @property
     def midi_targets(self) -> list:
         """
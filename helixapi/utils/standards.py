@@ -1,9 +1,71 @@
+import copy
+import functools
 import logging
 import re
 from .settings import Settings
 
+# The number of standardized names kept per item type
+MEMO_SIZE = 4096
+
+_CASINGS = {
+    'uppercase': str.upper,
+    'lowercase': str.lower,
+    'titlecase': str.title,
+}
+
+
+class CompiledStandard:
+    """
+    The standardization rules of one item type, compiled once and memoized.
+
+    The replacement patterns are compiled once and applied in order, as in the settings
+    (so a replacement can still change the result of an earlier one). A single alternation
+    of every pattern is searched first: a name none of them matches is only cased (patterns
+    with groups are not joined, as their references would shift). Results are memoized by name.
+
+    !!! note
+
+        This class is not intended to be instantiated directly.
+        It is created by `Standards.compile`.
+    """
+
+    def __init__(self, standards: dict) -> None:
+        """
+        Compile the rules.
+
+        Args:
+            standards (dict): The standards of the item type (casing and replacements).
+        """
+        # a copy of the rules, to tell when the standards were changed in place
+        self.standards = copy.deepcopy(standards)
+        self._replacements = [
+            (re.compile(pattern, flags=re.IGNORECASE), replacement)
+            for replacement, patterns in (standards.get('replacements') or {}).items()
+            for pattern in patterns or ()
+        ]
+        self._any = None
+        if self._replacements and not any(pattern.groups for pattern, _ in self._replacements):
+            try:
+                self._any = re.compile('|'.join(f'(?:{pattern.pattern})' for pattern, _ in self._replacements), flags=re.IGNORECASE)
+            except re.error:
+                # patterns that cannot be joined (inline flags) are always applied
+                pass
+        self._casing = _CASINGS.get((standards.get('casing') or '').lower())
+        self.apply = functools.lru_cache(maxsize=MEMO_SIZE)(self._apply)
+
+    def _apply(self, item_name: str) -> str:
+        if self._replacements and (self._any is None or self._any.search(item_name)):
+            for pattern, replacement in self._replacements:
+                item_name = pattern.sub(replacement, item_name)
+        if self._casing is not None:
+            item_name = self._casing(item_name)
+        return item_name
+
+
 class Standards:
     _standards_cache = None
+    # compiled rules by item type
+    _compiled = {}
 
     def __init__(self) -> None:
         if Standards._standards_cache is None:
@@ -11,6 +73,26 @@ class Standards:
             Standards._standards_cache = settings.standards
             logging.debug("Loaded standards: %s", Standards._standards_cache)
 
+    def compile(self, item_type: str) -> CompiledStandard:
+        """
+        Get the compiled rules of an item type, compiling them again if the standards changed.
+
+        Args:
+            item_type (str): The type of the item.
+
+        Returns:
+            CompiledStandard: The compiled rules, whose `apply(item_name)` returns the standardized name.
+
+        Example:
+            standardize = Standards().compile("preset").apply
+            new_names = [standardize(name) for name in names]
+        """
+        standards = Standards._standards_cache.get(item_type) or {}
+        compiled = Standards._compiled.get(item_type)
+        if compiled is None or compiled.standards != standards:
+            compiled = Standards._compiled[item_type] = CompiledStandard(standards)
+        return compiled
+
     def apply(self, item_name: str, item_type: str) -> str:
         """
         Apply standardization rules to an item name based on its type.
@@ -27,22 +109,6 @@ class Standards:
             new_name = standards.apply("Preset 1", "preset")
             print(new_name)
         """
-        standards = Standards._standards_cache.get(item_type, {})
-        casing = standards.get('casing', '').lower()
-        replacements = standards.get('replacements', {})
-
-        # Apply replacements
-        for replace_key, replace_values in replacements.items():
-            for replace_value in replace_values:
-                item_name = re.sub(replace_value, replace_key, item_name, flags=re.IGNORECASE)
-
-        # Apply casing
-        if casing == 'uppercase':
-            item_name = item_name.upper()
-        elif casing == 'lowercase':
-            item_name = item_name.lower()
-        elif casing == 'titlecase':
-            item_name = item_name.title()
-
+        item_name = self.compile(item_type).apply(item_name)
         logging.debug("Standardized item name: %s", item_name)
         return item_name
@@ -1,6 +1,7 @@
 import os
 import pytest
 import yaml
+from helixapi.utils.settings import Settings
 
 
 @pytest.fixture(scope="session")
@@ -63,6 +64,32 @@ def preset_template_path(template_dir):
     """Fixture to provide the path to the preset template file."""
     return os.path.join(template_dir, "preset.hlx")
 
+@pytest.fixture
+def override_settings():
+    """Fixture replacing settings sections for one test, restoring them afterwards."""
+    settings = Settings().settings
+    previous = {}
+
+    def override(section, value):
+        previous.setdefault(section, settings.get(section))
+        settings[section] = value
+        return value
+
+    yield override
+    for section, value in previous.items():
+        settings[section] = value
+
+@pytest.fixture
+def cache_dir(tmp_path, override_settings):
+    """Fixture enabling the cache in a temporary directory."""
+    override_settings("cache", {"directory": str(tmp_path / "cache"), "max_size": 256})
+    return str(tmp_path / "cache")
+
+@pytest.fixture
+def author_settings(override_settings):
+    """Fixture setting the author name in the settings."""
+    return override_settings("author", {"name": "Settings Author", "overwrite": False})
+
 @pytest.fixture
 def mock_standards_yaml():
     standards_yaml_content = """
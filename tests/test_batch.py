@@ -0,0 +1,94 @@
+import pytest
+from helixapi.helix import Helix
+
+class RecordingTargets(list):
+    """MIDI targets recording the messages sent instead of sending them."""
+    def __init__(self):
+        super().__init__(["port"])
+        self.system = self
+        self.sent = []
+
+    def send_cc(self, port, channel, control, value):
+        self.sent.append(("cc", control, value))
+
+    def send_pc(self, port, channel, program):
+        self.sent.append(("pc", program))
+
+@pytest.fixture
+def targets(monkeypatch):
+    helix = Helix()
+    targets = RecordingTargets()
+    monkeypatch.setattr(helix.midi.commands, "targets", targets)
+    return targets
+
+def test_batch_coalesces_midi(targets):
+    helix = Helix()
+    targets.sent.clear()
+    with helix.batch():
+        helix.setlists.active_index = 1
+        helix.setlists.active_index = 2
+        helix.setlists[2].presets.active_index = 5
+        helix.setlists[2].presets.active_index = 7
+        helix.setlists[2].presets[7].snapshots.active_index = 3
+        assert targets.sent == []
+
+    # only the final selection is sent, setlist first
+    assert targets.sent == [("cc", 69, 2), ("pc", 7), ("cc", 69, 3)]
+    assert helix.setlists.active_index == 2
+
+    targets.sent.clear()
+    helix.setlists.active_index = 1
+    assert targets.sent
+
+def test_batch_rollback(targets):
+    helix = Helix()
+    presets = helix.bundle.data["setlists"][0]["presets"]
+    helix.setlists[0].presets[0].name = "Kept"
+    setlist_name = helix.setlists[1].name
+    targets.sent.clear()
+
+    with pytest.raises(ValueError):
+        with helix.batch():
+            helix.setlists[0].presets[0].name = "Changed"
+            helix.setlists[0].presets[4].snapshots[2].name = "Filled"
+            helix.setlists[1].name = "RENAMED"
+            helix.setlists[0].presets.active_index = 4
+            helix.setlists[0].presets[1].name = "Far too long for a preset"
+
+    assert helix.setlists[0].presets[0].name == "Kept"
+    assert not presets[4]
+    assert helix.setlists[1].name == setlist_name
+    assert helix.setlists[0].presets.active_index == 0
+    assert helix.setlists[0].presets[0].active
+    assert targets.sent == []
+
+def test_batch_nested():
+    helix = Helix()
+    with helix.batch():
+        with pytest.raises(Exception):
+            with helix.batch():
+                pass
+
+def test_batch_rollback_journal(targets):
+    helix = Helix()
+    journal = helix.journal
+    helix.setlists[0].presets[0].name = "A"
+    helix.setlists[0].presets[0].name = "B"
+    assert journal.undo()
+
+    with pytest.raises(ValueError):
+        with helix.batch():
+            helix.setlists[0].presets[0].name = "C"
+            helix.setlists[0].presets[4].snapshots[2].name = "Filled"
+            helix.setlists[1].name = "RENAMED"
+            helix.setlists[0].presets[1].name = "Far too long for a preset"
+
+    # the changes of the rolled back batch and the rollback itself are not recorded
+    assert helix.setlists[0].presets[0].name == "A"
+    assert journal.redo()
+    assert helix.setlists[0].presets[0].name == "B"
+    assert journal.undo()
+    assert journal.undo()
+    assert helix.setlists[0].presets[0].name == "New Preset"
+    assert not journal.can_undo
+    assert not helix.bundle.data["setlists"][0]["presets"][4]
@@ -0,0 +1,138 @@
+import re
+import pytest
+from unittest import mock
+from helixapi.helix import Helix
+from helixapi.snapshot import LEDColor
+from helixapi.bulk import NameChange
+from helixapi.utils.standards import Standards
+from helixapi.utils.data_manager import DataManager
+
+@pytest.fixture
+def helix():
+    helix = Helix()
+    for preset_index in range(3):
+        preset = helix.setlists[0].presets[preset_index]
+        preset.name = f"PRESET {preset_index}"
+        preset.snapshots[1].name = "SOLO"
+    helix.setlists[2].presets[5].snapshots[4].name = "Big Solo"
+    return helix
+
+def test_snapshots_set_where(helix):
+    assert helix.snapshots.set_where(name_regex="(?i)solo", ledcolor=LEDColor.RED) == 4
+    assert helix.setlists[0].presets[2].snapshots[1].ledcolor == LEDColor.RED
+    assert helix.setlists[2].presets[5].snapshots[4].ledcolor == LEDColor.RED
+    assert helix.setlists[2].presets[5].snapshots[3].ledcolor == LEDColor.AUTO
+    # the number of the color is stored, as the setter does
+    assert helix.setlists[0].presets[0].snapshots[1]._get_data("ledcolor") == LEDColor.RED.value
+
+    # values already set are not counted, empty slots are skipped
+    assert helix.snapshots.set_where(name_regex="^SOLO$", ledcolor=LEDColor.RED) == 0
+    assert helix.snapshots.set_where(snapshot_index=7, ledcolor=LEDColor.BLUE) == 4
+    assert helix.setlists[1].presets[0]._get_data("root") is not None and not helix.bundle.data['setlists'][1]['presets'][0]
+
+    with pytest.raises(ValueError):
+        helix.snapshots.set_where(ledcolor=3)
+    with pytest.raises(ValueError):
+        helix.snapshots.set_where(name="x" * 17)
+
+    # names can be set too
+    assert helix.snapshots.set_where(setlist_index=0, snapshot_index=0, name="INTRO") == 3
+    assert helix.setlists[0].presets[1].snapshots[0].name == "INTRO"
+    with pytest.raises(Exception):
+        helix.snapshots.set_where(color=LEDColor.RED)
+
+def test_presets_set_where(helix):
+    assert helix.presets.set_where(setlist_index=0, preset_index=range(3), tempo=[90, 100, 110]) == 3
+    assert [helix.setlists[0].presets[index].tempo for index in range(3)] == [90, 100, 110]
+    assert helix.presets.set_where(name_regex=re.compile("^PRESET [12]"), band="My Band") == 2
+    assert helix.setlists[0].presets[2].band == "My Band"
+
+    with pytest.raises(Exception):
+        helix.presets.set_where(tempo=[90, 100])
+    with pytest.raises(Exception):
+        helix.presets.set_where(snapshot_index=0, tempo=90)
+
+    # every empty slot is filled when included
+    assert helix.presets.set_where(setlist_index=7, include_empty=True, tempo=100) == 128
+    assert helix.setlists[7].presets[127].tempo == 100
+
+def test_set_where_mask(helix):
+    columns = helix.to_columns()
+    mask = [name == "SOLO" and preset_index != 1 for name, preset_index in zip(columns["snapshot_name"], columns["preset_index"])]
+    assert helix.snapshots.set_where(mask=mask, ledcolor=LEDColor.GREEN) == 2
+    assert helix.setlists[0].presets[1].snapshots[1].ledcolor == LEDColor.AUTO
+    with pytest.raises(Exception):
+        helix.snapshots.set_where(mask=mask[:-1], ledcolor=LEDColor.GREEN)
+
+def test_set_where_listeners(helix):
+    journal = helix.journal
+    name_index = helix.setlists.name_index
+    assert helix.presets.set_where(setlist_index=0, preset_index=range(3), tempo=140) == 3
+    assert helix.snapshots.set_where(name_regex="^SOLO$", name="LEAD", ledcolor=LEDColor.RED) == 3
+    # the name index follows the bulk writes
+    assert name_index.find_snapshots("LEAD") == [(0, 0, 1), (0, 1, 1), (0, 2, 1)]
+
+    # a bulk write is a single step
+    assert journal.undo()
+    assert helix.setlists[0].presets[0].snapshots[1].ledcolor == LEDColor.AUTO
+    assert helix.setlists[0].presets[0].snapshots[1].name == "SOLO"
+    assert journal.undo()
+    assert [helix.setlists[0].presets[index].tempo for index in range(3)] == [120, 120, 120]
+    assert name_index.find_snapshots("LEAD") == []
+
+def test_set_where_other_listeners(helix):
+    other = Helix()
+    other.journal
+    set_data = mock.patch.object(DataManager, 'set_data', autospec=True, side_effect=DataManager.set_data)
+    # listeners following another bundle do not send the writes through data managers
+    with set_data as calls:
+        assert helix.presets.set_where(setlist_index=0, preset_index=range(3), tempo=140) == 3
+        assert calls.call_count == 0
+        helix.journal
+        assert helix.presets.set_where(setlist_index=0, preset_index=range(3), tempo=90) == 3
+        assert calls.call_count == 3
+    assert other.journal.undo() is False
+
+def test_standardize_all(helix, mock_standards_yaml):
+    Standards()
+    Standards._standards_cache = mock_standards_yaml
+    helix.setlists[1].name = "my_setlist"
+    helix.setlists[0].presets[1].name = "New_Preset"
+    helix.setlists[0].presets[2].snapshots[1].name = "lead"
+    journal = helix.journal
+
+    changes = helix.standardize_all()
+    assert changes == [
+        NameChange("setlist", 1, None, None, "my_setlist", "MY SETLIST"),
+        # the replacements are applied in order, so "_" becomes " " before "New Preset" is replaced
+        NameChange("preset", 0, 1, None, "New_Preset", "PRESET"),
+        NameChange("preset", 2, 5, None, "New Preset", "PRESET"),
+        NameChange("snapshot", 0, 2, 1, "lead", "SOLO"),
+        NameChange("snapshot", 2, 5, 4, "Big Solo", "BIG SOLO"),
+    ]
+    assert helix.setlists[1].name == "MY SETLIST"
+    assert helix.setlists[0].presets[1].name == "PRESET"
+    assert helix.setlists[2].presets[5].snapshots[4].name == "BIG SOLO"
+    # empty preset slots are not filled
+    assert not helix.bundle.data['setlists'][1]['presets'][0]
+    assert helix.standardize_all() == []
+
+    # the whole call is a single step
+    assert journal.undo()
+    assert helix.setlists[1].name == "my_setlist"
+    assert helix.setlists[2].presets[5].snapshots[4].name == "Big Solo"
+
+def test_presets_set_where_author(helix, author_settings):
+    helix.setlists[1].presets[0].author = "Me"
+    # the same data as the preset setters leave: the default author is applied to the presets changed
+    assert helix.presets.set_where(setlist_index=[0, 1], preset_index=[0, 3], song="Song") == 2
+    assert helix.setlists[0].presets[0].author == "Settings Author"
+    # explicit authors are kept, empty slots are skipped
+    assert helix.setlists[1].presets[0].author == "Me"
+    assert not helix.bundle.data["setlists"][0]["presets"][3]
+    assert helix.presets.set_where(setlist_index=0, preset_index=1, author="Band", tempo=90) == 1
+    assert helix.setlists[0].presets[1].author == "Band"
+    # presets that are not changed are left as they are
+    helix.bundle.data["setlists"][0]["presets"][2]["data"]["meta"]["author"] = ""
+    assert helix.presets.set_where(setlist_index=0, preset_index=2, tempo=helix.setlists[0].presets[2].tempo) == 0
+    assert helix.setlists[0].presets[2].author == ""
@@ -47,3 +47,33 @@ def test_bundle_import(temp_dir, bundle_template_path):
     # import previous export and confirm new name
     helix.bundle.import_bundle(file_path=file_path)
     assert helix.setlists[0].name == new_name
+
+def test_bundle_import_lazy(temp_dir, bundle_template_path):
+    helix = Helix()
+    helix.setlists[0].name = "test lazy"
+
+    file_path=os.path.join(temp_dir, "exported_lazy_bundle.hlb")
+    helix.bundle.export_bundle(file_path=file_path)
+
+    eager_data = Helix(file_path=file_path).bundle.data
+    helix = Helix(file_path=file_path, lazy=True)
+    assert helix.setlists[0].name == "test lazy"
+    assert helix.bundle.data['setlists'] == eager_data['setlists']
+
+def test_bundle_export_lazy_untouched(temp_dir):
+    from helixapi.utils.files import Files
+
+    file_path=os.path.join(temp_dir, "exported_lazy_untouched.hlb")
+    Helix().bundle.export_bundle(file_path=file_path)
+
+    bundle = Bundle(file_path=file_path, lazy=True)
+    bundle.data['setlists'][1]['meta']['name'] = "CHANGED"
+
+    # untouched setlists are written back without being parsed
+    export_path=os.path.join(temp_dir, "exported_lazy_untouched_2.hlb")
+    bundle.export_bundle(file_path=export_path)
+    assert not bundle.data['setlists'].is_loaded(0)
+
+    data, _ = Files._import_file(export_path)
+    assert data['setlists'][0]['meta']['name'] == "SETLIST 1"
+    assert data['setlists'][1]['meta']['name'] == "CHANGED"
@@ -0,0 +1,77 @@
+import os
+import shutil
+import pytest
+from helixapi.utils.cache import DecodedCache
+from helixapi.utils.files import Files
+from helixapi.utils.lazy import LazyArray
+
+@pytest.fixture
+def bundle_copy(tmp_path, bundle_template_path):
+    file_path = str(tmp_path / "bundle.hlb")
+    shutil.copyfile(bundle_template_path, file_path)
+    return file_path
+
+def test_cache_disabled_by_default():
+    assert DecodedCache.from_settings() is None
+
+def test_cache_hit(cache_dir, bundle_copy):
+    data, metadata = Files._import_file(bundle_copy)
+    assert len(os.listdir(cache_dir)) == 1
+
+    cache = DecodedCache.from_settings()
+    with open(bundle_copy, 'rb') as file:
+        key = cache.key(bundle_copy, file.read())
+    assert cache.get(key) == (data, metadata)
+    assert Files._import_file(bundle_copy) == (data, metadata)
+
+def test_cache_lazy_hit(cache_dir, bundle_copy):
+    data, metadata = Files._import_file(bundle_copy)
+    cached, _ = Files._import_file(bundle_copy, lazy=True)
+
+    assert isinstance(cached['setlists'], LazyArray)
+    assert not cached['setlists'].is_loaded(0)
+    assert cached['setlists'][0] == data['setlists'][0]
+    # elements loaded from the cache are not JSON, so they are serialized again on export
+    assert Files._dumps_compact(cached) == Files._dumps_compact(data)
+
+def test_cache_changed_file(cache_dir, bundle_copy):
+    data, metadata = Files._import_file(bundle_copy)
+    data['setlists'][0]['meta']['name'] = "CHANGED"
+    os.remove(bundle_copy)
+    Files._export_file(bundle_copy, data, metadata)
+
+    changed, _ = Files._import_file(bundle_copy)
+    assert changed['setlists'][0]['meta']['name'] == "CHANGED"
+
+def test_cache_eviction(cache_dir):
+    cache = DecodedCache.from_settings()
+    for index, key in enumerate(["first", "second"]):
+        cache.put(key, {"setlists": [{key: index}]}, {}, array_key='setlists')
+        os.utime(os.path.join(cache_dir, f"{key}.cache"), (index, index))
+    cache.max_size = os.path.getsize(os.path.join(cache_dir, "first.cache")) * 2
+
+    # reading "first" makes "second" the least recently used entry
+    assert cache.get("first") is not None
+    cache.put("third", {"setlists": [{"third": 2}]}, {}, array_key='setlists')
+
+    assert cache.get("second") is None
+    assert cache.get("first") == ({"setlists": [{"first": 0}]}, {})
+    assert cache.get("third") == ({"setlists": [{"third": 2}]}, {})
+
+def test_cache_corrupt_entry(cache_dir):
+    cache = DecodedCache.from_settings()
+    os.makedirs(cache_dir)
+    with open(os.path.join(cache_dir, "bad.cache"), 'wb') as file:
+        file.write(b'not a cache entry')
+    assert cache.get("bad") is None
+    assert not os.path.exists(os.path.join(cache_dir, "bad.cache"))
+
+def test_cache_unwritable(tmp_path, bundle_copy, override_settings, caplog):
+    # a cache directory that cannot be created never fails an import
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    override_settings("cache", {"directory": str(blocker / "cache"), "max_size": 256})
+    data, _ = Files._import_file(bundle_copy)
+    assert len(data["setlists"]) == 8
+    assert "Could not write cache entry" in caplog.text
+    assert sorted(os.listdir(tmp_path)) == ["bundle.hlb", "file"]
@@ -0,0 +1,57 @@
+import csv
+import io
+import math
+import pytest
+from helixapi.helix import Helix
+from helixapi.columns import Columns
+
+@pytest.fixture
+def helix():
+    helix = Helix()
+    helix.setlists[0].name = "LIVE"
+    preset = helix.setlists[0].presets[2]
+    preset.name = "LEAD"
+    preset.band = "My Band"
+    preset.tempo = 140
+    preset.snapshots[1].name = "SOLO"
+    helix.setlists[3].presets[0].name = "CLEAN"
+    return helix
+
+def test_to_columns_snapshots(helix):
+    columns = helix.to_columns()
+    assert isinstance(columns, Columns)
+    # only the two presets that were filled, with their eight snapshots each
+    assert len(columns) == 16
+    assert list(columns["setlist_index"]) == [0] * 8 + [3] * 8
+    assert list(columns["preset_index"]) == [2] * 8 + [0] * 8
+    assert list(columns["snapshot_index"]) == list(range(8)) * 2
+    assert columns["snapshot_name"][1] == "SOLO"
+    assert columns["setlist_name"][0] == "LIVE"
+    assert columns["band"][0] == "My Band" and columns["band"][8] is None
+    assert columns["tempo"].typecode == 'd' and columns["tempo"][0] == 140
+    assert columns["ledcolor"].typecode == 'i'
+
+def test_to_columns_presets(helix):
+    columns = helix.to_columns(level="preset")
+    assert "snapshot_index" not in columns
+    assert list(columns.rows()) == [
+        (0, 2, "LIVE", "LEAD", "", "My Band", None, 140),
+        (3, 0, "SETLIST 4", "CLEAN", "", None, None, 120),
+    ]
+    assert len(helix.to_columns(level="preset", include_empty=True)) == 1024
+
+    with pytest.raises(Exception):
+        helix.to_columns(level="block")
+
+def test_to_columns_csv(helix, tmp_path):
+    columns = helix.to_columns(level="preset")
+    columns["tempo"][1] = math.nan
+    rows = list(csv.reader(io.StringIO(columns.to_csv())))
+    assert rows[0] == columns.names
+    assert rows[1] == ["0", "2", "LIVE", "LEAD", "", "My Band", "", "140.0"]
+    assert rows[2][-1] == ""
+
+    file_path = str(tmp_path / "columns.csv")
+    assert columns.to_csv(file_path) is None
+    with open(file_path, newline='', encoding='utf-8') as file:
+        assert list(csv.reader(file)) == rows
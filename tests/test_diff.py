@@ -0,0 +1,72 @@
+import copy
+import os
+import pytest
+from helixapi.helix import Helix
+from helixapi.diff import Change, MerkleTree, diff, diff_files
+
+@pytest.fixture
+def helix():
+    helix = Helix()
+    helix.setlists[1].presets[0].name = "CLEAN"
+    return helix
+
+def test_diff_identical(helix):
+    data = helix.bundle.data
+    assert diff(data, copy.deepcopy(data)) == []
+    assert MerkleTree(data).digest == MerkleTree(copy.deepcopy(data)).digest
+
+def test_diff_changes(helix):
+    old = copy.deepcopy(helix.bundle.data)
+    helix.setlists[1].name = "LIVE"
+    helix.setlists[1].presets[0].name = "LEAD"
+    helix.setlists[1].presets[0].snapshots[2].name = "SOLO"
+    helix.setlists[3].presets[5].tempo = 140
+
+    changes = diff(old, helix.bundle.data)
+    assert all(isinstance(change, Change) for change in changes)
+    by_key = {(change.item, change.key): change for change in changes}
+    assert by_key[('setlist', 'name')].new == "LIVE"
+    assert by_key[('setlist', 'name')].setlist_index == 1
+    preset_name = by_key[('preset', 'name')]
+    assert (preset_name.kind, preset_name.old, preset_name.new) == ('changed', "CLEAN", "LEAD")
+    assert preset_name.path == 'setlists.1.presets.0.data.meta.name'
+    snapshot_name = by_key[('snapshot', 'name')]
+    assert (snapshot_name.setlist_index, snapshot_name.preset_index, snapshot_name.snapshot_index) == (1, 0, 2)
+
+    # the empty slot that was filled is reported once, for the whole preset
+    filled = by_key[('preset', 'root')]
+    assert (filled.kind, filled.old, filled.setlist_index, filled.preset_index) == ('added', None, 3, 5)
+    assert filled.new['data']['tone']['global']['@tempo'] == 140
+    assert len(changes) == 4
+
+def test_diff_roots(helix):
+    preset = helix.setlists[1].presets[0]
+    old_preset = copy.deepcopy(preset._get_data('root'))
+    old_setlist = copy.deepcopy(helix.setlists[1]._get_data('root'))
+    preset.tempo = 90
+
+    changes = diff(old_preset, preset._get_data('root'), root='preset')
+    assert [(change.path, change.item, change.key, change.new) for change in changes] == [('data.tone.global.@tempo', 'preset', 'tempo', 90)]
+    changes = diff(MerkleTree(old_setlist, root='setlist'), helix.setlists[1]._get_data('root'), root='setlist')
+    assert [(change.path, change.preset_index, change.key) for change in changes] == [('presets.0.data.tone.global.@tempo', 0, 'tempo')]
+
+    with pytest.raises(Exception):
+        MerkleTree(old_preset, root='snapshot')
+    with pytest.raises(Exception):
+        diff(MerkleTree(old_preset, root='preset'), old_setlist, root='setlist')
+
+def test_diff_files(helix, tmp_path):
+    old_path = os.path.join(tmp_path, "old.hlb")
+    new_path = os.path.join(tmp_path, "new.hlb")
+    helix.bundle.export_bundle(file_path=old_path)
+    helix.setlists[6].presets[9].name = "NEW"
+    helix.bundle.export_bundle(file_path=new_path)
+
+    changes = diff_files(old_path, new_path)
+    assert [(change.kind, change.item, change.key, change.setlist_index, change.preset_index) for change in changes] == [('added', 'preset', 'root', 6, 9)]
+    assert diff_files(old_path, old_path) == []
+
+    preset_path = os.path.join(tmp_path, "new.hlx")
+    helix.setlists[6].presets[9].export_preset(file_path=preset_path)
+    with pytest.raises(Exception):
+        diff_files(old_path, preset_path)
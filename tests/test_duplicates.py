@@ -0,0 +1,107 @@
+import os
+import pytest
+from unittest import mock
+from helixapi.helix import Helix
+from helixapi.duplicates import DuplicateGroup, ToneHashCache, find_duplicate_files, tone_hash
+from helixapi.utils.files import Files
+
+@pytest.fixture
+def helix():
+    helix = Helix()
+    presets = helix.setlists[0].presets
+    presets[0].tempo = 100
+    presets[1].tempo = 140
+    # same tone as presets[0], with its own name, date and editor state
+    presets.clone(0, 5)
+    presets[5].name = "COPY"
+    presets[5]._get_data('root')['data']['meta']['modifieddate'] = 1
+    presets[5]._get_data('root')['data']['tone']['global']['@current_snapshot'] = 3
+    helix.setlists[4].presets[9].tempo = 100
+    return helix
+
+@pytest.fixture
+def hash_cache(cache_dir):
+    """Fixture keeping the tone hashes in a temporary cache directory."""
+    ToneHashCache.clear()
+    yield cache_dir
+    ToneHashCache.clear()
+
+def test_tone_hash(helix):
+    presets = helix.setlists[0].presets
+    assert tone_hash(presets[0]._get_data('root')) == tone_hash(presets[5]._get_data('root'))
+    assert tone_hash(presets[0]._get_data('root')) != tone_hash(presets[1]._get_data('root'))
+    assert tone_hash({}) is None
+
+def test_find_duplicates(helix):
+    groups = helix.find_duplicates()
+    assert len(groups) == 1
+    assert isinstance(groups[0], DuplicateGroup)
+    assert [(preset.setlist_index, preset.preset_index) for preset in groups[0].presets] == [(0, 0), (0, 5), (4, 9)]
+    assert [preset.name for preset in groups[0].presets] == ["New Preset", "COPY", "New Preset"]
+
+def test_find_duplicate_files(helix, hash_cache, tmp_path):
+    library = tmp_path / "library"
+    os.makedirs(library / "downloads")
+    presets = helix.setlists[0].presets
+    presets[0].export_preset(file_path=str(library / "a.hlx"))
+    presets[1].export_preset(file_path=str(library / "b.hlx"))
+    presets[5].export_preset(file_path=str(library / "downloads" / "c.hlx"))
+    helix.setlists[0].export_setlist(file_path=str(library / "live.hls"))
+
+    groups = find_duplicate_files(str(library))
+    assert [[(os.path.basename(preset.file_path), preset.setlist_index, preset.preset_index) for preset in group.presets] for group in groups] == [
+        [("a.hlx", None, 0), ("live.hls", 0, 0), ("live.hls", 0, 5), ("c.hlx", None, 0)],
+        [("b.hlx", None, 0), ("live.hls", 0, 1)],
+    ]
+    assert len(find_duplicate_files(str(library), recursive=False)[0].presets) == 3
+    assert os.path.exists(os.path.join(hash_cache, "tone_hashes.marshal"))
+
+    # unchanged files are not read again, even by a new process (the saved hashes are loaded)
+    ToneHashCache.clear()
+    with mock.patch.object(Files, '_import_file', wraps=Files._import_file) as import_file:
+        assert find_duplicate_files(str(library)) == groups
+        assert import_file.call_count == 0
+        presets[1].tempo = 100
+        presets[1].export_preset(file_path=str(library / "b.hlx"))
+        os.utime(library / "b.hlx", ns=(1, 1))
+        groups = find_duplicate_files(str(library))
+        assert import_file.call_count == 1
+    assert len(groups[0].presets) == 5
+
+def test_find_duplicate_files_corrupt(helix, hash_cache, tmp_path, caplog):
+    library = tmp_path / "library"
+    os.makedirs(library)
+    presets = helix.setlists[0].presets
+    presets[0].export_preset(file_path=str(library / "a.hlx"))
+    presets[5].export_preset(file_path=str(library / "b.hlx"))
+    helix.setlists[0].export_setlist(file_path=str(library / "live.hls"))
+    with open(library / "live.hls", "r+") as file:
+        file.truncate(os.path.getsize(library / "live.hls") // 2)
+    with open(library / "broken.hlx", "w") as file:
+        file.write("{not json")
+
+    # the files that cannot be decoded are skipped with a warning
+    groups = find_duplicate_files(str(library))
+    assert [[os.path.basename(preset.file_path) for preset in group.presets] for group in groups] == [["a.hlx", "b.hlx"]]
+    assert "live.hls" in caplog.text and "broken.hlx" in caplog.text
+
+    # the hashes of files that were removed are forgotten, in memory and in the saved cache
+    os.remove(library / "b.hlx")
+    assert find_duplicate_files(str(library)) == []
+    ToneHashCache.clear()
+    ToneHashCache()
+    assert [os.path.basename(path) for path in ToneHashCache._entries] == ["a.hlx"]
+
+def test_find_duplicate_files_unsaved(helix, hash_cache, tmp_path, caplog):
+    library = tmp_path / "library"
+    os.makedirs(library)
+    presets = helix.setlists[0].presets
+    presets[0].export_preset(file_path=str(library / "a.hlx"))
+    presets[5].export_preset(file_path=str(library / "b.hlx"))
+    # a cache directory that cannot be created does not lose the results of the scan
+    with open(hash_cache, "w") as file:
+        file.write("not a directory")
+    groups = find_duplicate_files(str(library))
+    assert [[os.path.basename(preset.file_path) for preset in group.presets] for group in groups] == [["a.hlx", "b.hlx"]]
+    assert "Could not save the tone hashes" in caplog.text
+    assert sorted(os.listdir(tmp_path)) == ["cache", "library"]
@@ -1,6 +1,6 @@
 import pytest
 import os
-from helixapi.utils.files import Files, FileType, TemplatePath
+from helixapi.utils.files import DECODE_CHUNK_SIZE, CompressionProfile, Files, FileType, TemplatePath
 
 def test_files_filetype():
     assert FileType.BUNDLE.value == 'hlb'
@@ -50,6 +50,14 @@ def test_files_templatepath_get_by_file_type_name():
     assert TemplatePath.get_by_file_type_name('setlist') == TemplatePath.SETLIST.value
     assert TemplatePath.get_by_file_type_name('preset') == TemplatePath.PRESET.value
 
+def test_files_templatepath_load(preset_template_path):
+    data, metadata = TemplatePath.load(TemplatePath.PRESET.value)
+    assert (data, metadata) == Files._import_file(preset_template_path)
+
+    # every load is an independent copy
+    data['data']['meta']['name'] = 'changed'
+    assert TemplatePath.load(TemplatePath.PRESET.value)[0]['data']['meta']['name'] != 'changed'
+
 def test_files_check_existing_file():
     file_path = os.path.join(os.path.dirname(__file__), '..', 'helixapi', 'templates', 'bundle.hlb')
     Files._check_existing_file(file_path)
@@ -61,4 +69,172 @@ def test_files_check_existing_file_no_path():
 def test_files_check_existing_file_no_file():
     file_path = os.path.join(os.path.dirname(__file__), '..', 'helixapi', 'templates', 'does_not_exist.hlb')
     with pytest.raises(Exception, match="File does not exist"):
-        Files._check_existing_file(file_path)
\ No newline at end of file
+        Files._check_existing_file(file_path)
+
+def test_files_decode_stream(setlist_template_path):
+    import base64
+    import json
+    import zlib
+
+    with open(setlist_template_path, 'r') as file:
+        encoded_data = json.load(file)['encoded_data']
+
+    # chunked decoding must match decoding the whole payload at once
+    assert Files._decode_stream(encoded_data) == zlib.decompress(base64.b64decode(encoded_data))
+
+def test_files_import_file_setlist(setlist_template_path):
+    data, metadata = Files._import_file(setlist_template_path)
+
+    assert data['meta']['name'] == 'SETLIST 1'
+    assert len(data['presets']) == 128
+    assert 'encoded_data' not in metadata
+    assert metadata['schema'] == 'L6Setlist'
+
+def test_files_decode_envelope(setlist_template_path):
+    import json
+
+    with open(setlist_template_path, 'rb') as file:
+        raw_data = file.read()
+    metadata = json.loads(raw_data)
+    expected = Files._decode_stream(metadata.pop('encoded_data'))
+
+    assert Files._decode_envelope(raw_data) == (metadata, expected)
+
+    # an escaped "/" cannot be decoded in place, so the envelope is parsed in full
+    escaped = raw_data.replace(b'/', b'\\/')
+    assert escaped != raw_data
+    assert Files._decode_envelope(escaped) == (metadata, expected)
+
+def test_files_import_file_wrapped(temp_dir, setlist_template_path):
+    import base64
+    import binascii
+    import json
+    import zlib
+
+    data, _ = Files._import_file(setlist_template_path)
+    data['presets'][0]['padding'] = os.urandom(96 * 1024).hex()
+    decompressed = json.dumps(data).encode('utf-8')
+    with open(setlist_template_path, 'r') as file:
+        metadata = json.load(file)
+    metadata['compression']['decompressed_size'] = len(decompressed)
+    metadata['compression']['crc32'] = binascii.crc32(decompressed)
+
+    # base 64 wrapped in lines (stored as "\n" escapes), longer than a decoding chunk
+    metadata['encoded_data'] = base64.encodebytes(zlib.compress(decompressed)).decode('ascii')
+    assert len(metadata['encoded_data']) > 2 * DECODE_CHUNK_SIZE
+    file_path = os.path.join(temp_dir, 'wrapped.hls')
+    with open(file_path, 'w') as file:
+        json.dump(metadata, file)
+
+    assert Files._import_file(file_path)[0] == data
+    assert Files._decode_stream(metadata['encoded_data'].encode('ascii')) == decompressed
+
+def _write_setlist(file_path, setlist_template_path, change):
+    import json
+
+    with open(setlist_template_path, 'r') as file:
+        metadata = json.load(file)
+    change(metadata)
+    with open(file_path, 'w') as file:
+        json.dump(metadata, file)
+    return file_path
+
+def test_files_verify(temp_dir, setlist_template_path, preset_template_path):
+    assert Files.verify(setlist_template_path)
+    assert Files.verify(preset_template_path)
+    assert not Files.verify(os.path.join(temp_dir, 'does_not_exist.hls'))
+
+def test_files_verify_crc32(temp_dir, setlist_template_path):
+    def change(metadata):
+        metadata['compression']['crc32'] += 1
+    file_path = _write_setlist(os.path.join(temp_dir, 'verify_crc32.hls'), setlist_template_path, change)
+
+    assert not Files.verify(file_path)
+    with pytest.raises(Exception, match="crc32"):
+        Files._import_file(file_path)
+
+def test_files_verify_size(temp_dir, setlist_template_path):
+    def change(metadata):
+        metadata['compression']['decompressed_size'] = 1000
+    file_path = _write_setlist(os.path.join(temp_dir, 'verify_size.hls'), setlist_template_path, change)
+
+    assert not Files.verify(file_path)
+    with pytest.raises(Exception, match="larger than its size"):
+        Files._import_file(file_path)
+
+def test_files_verify_truncated(temp_dir, setlist_template_path):
+    def change(metadata):
+        metadata['encoded_data'] = metadata['encoded_data'][:len(metadata['encoded_data']) // 2 // 4 * 4]
+    file_path = _write_setlist(os.path.join(temp_dir, 'verify_truncated.hls'), setlist_template_path, change)
+
+    assert not Files.verify(file_path)
+    with pytest.raises(Exception, match="truncated"):
+        Files._import_file(file_path)
+
+def test_files_iter_compact(bundle_template_path):
+    from helixapi.utils.lazy import loads_lazy
+
+    data, _ = Files._import_file(bundle_template_path)
+    assert b''.join(Files._iter_compact(data)) == Files._dumps_compact(data)
+
+    lazy_data = loads_lazy(Files._dumps_compact(data), 'setlists')
+    assert b''.join(Files._iter_compact(lazy_data)) == Files._dumps_compact(data)
+
+def test_files_export_file_failure(temp_dir, setlist_template_path):
+    data, metadata = Files._import_file(setlist_template_path)
+    data['presets'][0] = {'unserializable': object()}
+
+    # a file that fails to encode is not left half written
+    file_path = os.path.join(temp_dir, 'export_failure.hls')
+    with pytest.raises(TypeError):
+        Files._export_file(file_path, data, metadata)
+    assert not os.path.exists(file_path)
+
+def test_files_export_file_failure_keeps_existing(temp_dir, setlist_template_path):
+    data, metadata = Files._import_file(setlist_template_path)
+    file_path = os.path.join(temp_dir, 'export_existing.hls')
+    Files._export_file(file_path, data, metadata)
+    with open(file_path, 'rb') as file:
+        contents = file.read()
+
+    # a failed export over an existing file leaves it as it was, and no temporary file behind
+    files = sorted(os.listdir(temp_dir))
+    data['presets'][0] = {'unserializable': object()}
+    with pytest.raises(TypeError):
+        Files._export_file(file_path, data, metadata)
+    with open(file_path, 'rb') as file:
+        assert file.read() == contents
+    assert sorted(os.listdir(temp_dir)) == files
+
+def test_files_write_file_failure_keeps_existing(temp_dir):
+    file_path = os.path.join(temp_dir, 'write_existing.hlx')
+    with open(file_path, 'w') as file:
+        file.write('existing')
+    files = sorted(os.listdir(temp_dir))
+
+    # contents that fail to be written part way leave the file as it was, and no temporary file behind
+    with pytest.raises(UnicodeEncodeError):
+        Files._write_file(file_path, 'x' * 10 + '\ud800')
+    with open(file_path) as file:
+        assert file.read() == 'existing'
+    assert sorted(os.listdir(temp_dir)) == files
+
+@pytest.mark.parametrize("profile", list(CompressionProfile))
+def test_files_export_compression_profiles(temp_dir, setlist_template_path, profile):
+    data, metadata = Files._import_file(setlist_template_path)
+
+    file_path = os.path.join(temp_dir, f"compression_{profile.value}.hls")
+    Files._export_file(file_path, data, metadata, compression=profile.value)
+
+    # every profile must load back to the same data
+    imported_data, imported_metadata = Files._import_file(file_path)
+    assert imported_data == data
+    assert imported_metadata['compression']['type'] == 'zlib'
+
+def test_files_compression_profile_get_by_name():
+    assert CompressionProfile.get_by_name('fast') == CompressionProfile.FAST
+    assert CompressionProfile.get_by_name('SMALLEST') == CompressionProfile.SMALLEST
+    assert CompressionProfile.get_by_name(CompressionProfile.DEFAULT) == CompressionProfile.DEFAULT
+
+    with pytest.raises(ValueError):
+        CompressionProfile.get_by_name('invalid')
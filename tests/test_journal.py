@@ -0,0 +1,106 @@
+import pytest
+from helixapi.helix import Helix
+from helixapi.utils.journal import Journal
+
+def test_journal_undo_redo():
+    helix = Helix()
+    journal = helix.journal
+    setlist = helix.setlists[0]
+    old_name = setlist.name
+    assert not journal.can_undo
+
+    setlist.name = "FIRST"
+    setlist.name = "SECOND"
+    assert journal.undo()
+    assert setlist.name == "FIRST"
+    assert journal.undo()
+    assert setlist.name == old_name
+    assert not journal.undo()
+
+    assert journal.redo()
+    assert journal.redo()
+    assert setlist.name == "SECOND"
+    assert not journal.redo()
+
+    # a new change drops the steps left to redo
+    journal.undo()
+    setlist.name = "THIRD"
+    assert not journal.can_redo
+
+def test_journal_empty_slot():
+    helix = Helix()
+    journal = helix.journal
+    presets = helix.bundle.data["setlists"][0]["presets"]
+
+    # filling an empty slot (and writing its author) is one step, undone by emptying the slot
+    helix.setlists[0].presets[3].band = "My Band"
+    helix.setlists[0].presets[3].snapshots[1].name = "Solo"
+    journal.undo()
+    assert presets[3]["data"]["meta"]["band"] == "My Band"
+    journal.undo()
+    assert not presets[3]
+    journal.redo()
+    assert presets[3]["data"]["meta"]["band"] == "My Band"
+    journal.redo()
+    assert helix.setlists[0].presets[3].snapshots[1].name == "Solo"
+
+def test_journal_missing_value():
+    helix = Helix()
+    helix.setlists[0].presets[0].name = "Filled"
+    journal = helix.journal
+    meta = helix.bundle.data["setlists"][0]["presets"][0]["data"]["meta"]
+    assert "song" not in meta
+
+    helix.setlists[0].presets[0].song = "My Song"
+    journal.undo()
+    assert "song" not in meta
+    journal.redo()
+    assert meta["song"] == "My Song"
+
+def test_journal_import(preset_template_path):
+    helix = Helix()
+    preset = helix.setlists[0].presets[0]
+    preset.name = "Before"
+    journal = helix.journal
+    before = helix.bundle.data["setlists"][0]["presets"][0]
+
+    # an import replaces the preset, undo puts the same preset back without copying it
+    preset.import_preset(file_path=preset_template_path)
+    assert preset.name != "Before"
+    journal.undo()
+    assert helix.bundle.data["setlists"][0]["presets"][0] is before
+    assert preset.name == "Before"
+
+def test_journal_group():
+    helix = Helix()
+    journal = helix.journal
+    setlists = helix.setlists
+    names = [setlists[0].name, setlists[1].name]
+
+    with journal.group():
+        setlists[0].name = "A"
+        setlists[1].name = "B"
+    setlists[0].name = "C"
+
+    journal.undo()
+    assert [setlists[0].name, setlists[1].name] == ["A", "B"]
+    journal.undo()
+    assert [setlists[0].name, setlists[1].name] == names
+
+def test_journal_name_index():
+    helix = Helix()
+    index = helix.setlists.name_index
+    journal = helix.journal
+    helix.setlists[0].presets[2].name = "Indexed"
+    assert index.find_presets("Indexed") == [(0, 2)]
+    journal.undo()
+    assert index.find_presets("Indexed") == []
+
+def test_journal_limit():
+    helix = Helix()
+    journal = Journal(helix.bundle.data, limit=2)
+    for name in ("A", "B", "C"):
+        helix.setlists[0].name = name
+    assert journal.undo() and journal.undo()
+    assert not journal.undo()
+    assert helix.setlists[0].name == "A"
@@ -0,0 +1,58 @@
+import pytest
+import json
+import math
+from helixapi.utils import json_backend
+from helixapi.utils.files import Files
+from helixapi.utils.json_backend import StdlibBackend, available_backends, get_backend, set_backend
+
+PARITY_DATA = {
+    "floats": [0.5, 0.0, -0.0, 1.0, 0.1, 1e-05, 1e16, 123.456, -48.0],
+    "non_finite": [math.nan, math.inf, -math.inf, {"tempo": math.nan, "empty": None}],
+    "ints": [0, -1, 57737216, 2 ** 70],
+    "text": ["", "New Preset", "café", "quote \" and \\ slash /"],
+    "control": ["tab \t", "delete \x7f", "\x1f"],
+    "empty": [{}, []],
+    "nested": {"a": {"b": [1, {"c": None, "d": True, "e": False}]}},
+}
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    set_backend(request.param)
+    yield get_backend()
+    set_backend()
+
+def test_json_backend_default():
+    set_backend()
+    expected = 'orjson' if json_backend.orjson is not None else 'stdlib'
+    assert get_backend().name == expected
+
+def test_json_backend_unknown():
+    with pytest.raises(ValueError):
+        set_backend('unknown')
+
+def test_json_backend_parity(backend, preset_template_path, setlist_template_path):
+    stdlib = StdlibBackend()
+    preset_data, _ = Files._import_file(preset_template_path)
+    setlist_data, _ = Files._import_file(setlist_template_path)
+
+    # each case on its own too, as one case orjson does not write (non ASCII text) sends the whole data to the standard library
+    for data in (PARITY_DATA, *PARITY_DATA.values(), preset_data, setlist_data):
+        assert backend.dumps_compact(data) == stdlib.dumps_compact(data)
+        assert backend.dumps_pretty(data) == stdlib.dumps_pretty(data)
+        assert backend.dumps_canonical(data) == stdlib.dumps_canonical(data)
+        # NaN is not equal to itself, so the data read back is compared serialized
+        assert stdlib.dumps_compact(backend.loads(stdlib.dumps_compact(data))) == stdlib.dumps_compact(data)
+
+def test_json_backend_matches_json_module(backend, preset_template_path):
+    data, _ = Files._import_file(preset_template_path)
+
+    # files must keep the exact layout json.dump(..., indent=1) has always written
+    assert backend.dumps_pretty(data) == json.dumps(data, indent=1)
+    assert backend.dumps_compact(data) == json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def test_json_backend_loads_long_numbers(backend):
+    # integers over 64 bits are read exactly, long digit runs in strings and fractions are left to the backend
+    data = b'{"id": "123456789012345678901234", "fraction": 0.1234567890123456789012, "big": [' + str(2 ** 70).encode() + b']}'
+    expected = json.loads(data)
+    assert backend.loads(data) == expected
+    assert backend.loads(bytearray(data)) == expected
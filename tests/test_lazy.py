@@ -0,0 +1,40 @@
+import pytest
+import json
+from helixapi.utils.lazy import LazyArray, loads_lazy
+
+BUNDLE_JSON = b'{"setlists" : [ {"meta": {"name": "A"}, "presets": [{}, {}]}, {"meta": {"name": "B"}, "presets": []} ], "other": [1, 2]}'
+
+def test_lazy_loads():
+    data = loads_lazy(BUNDLE_JSON, 'setlists')
+
+    assert isinstance(data['setlists'], LazyArray)
+    assert len(data['setlists']) == 2
+    assert data['other'] == [1, 2]
+    assert data['setlists'] == json.loads(BUNDLE_JSON)['setlists']
+
+def test_lazy_materializes_on_access():
+    data = loads_lazy(BUNDLE_JSON, 'setlists')
+    setlists = data['setlists']
+
+    assert not setlists.is_loaded(0)
+    assert setlists.raw(1) == b'{"meta": {"name": "B"}, "presets": []}'
+
+    assert setlists[0]['meta']['name'] == 'A'
+    assert setlists.is_loaded(0)
+    assert setlists.raw(0) is None
+    assert not setlists.is_loaded(1)
+
+    # parsed elements are kept, so changes stick
+    setlists[0]['meta']['name'] = 'C'
+    assert setlists[0]['meta']['name'] == 'C'
+
+def test_lazy_brackets_in_strings():
+    # bracket counting is not possible, so the caller must parse normally
+    assert loads_lazy(b'{"setlists": [{"meta": {"name": "[A]"}}]}', 'setlists') is None
+
+def test_lazy_escaped_quotes():
+    data = loads_lazy(b'{"setlists": [{"meta": {"name": "\\"A\\""}}]}', 'setlists')
+    assert data['setlists'][0]['meta']['name'] == '"A"'
+
+def test_lazy_non_container_elements():
+    assert loads_lazy(b'{"setlists": [1, {}]}', 'setlists') is None
@@ -0,0 +1,46 @@
+import pytest
+from helixapi.helix import Helix
+
+def test_name_index_setlists():
+    helix = Helix()
+    index = helix.setlists.name_index
+    assert index.find_setlists(helix.setlists[3].name) == [3]
+
+    helix.setlists[3].name = "LIVE"
+    assert index.find_setlists("LIVE") == [3]
+    assert index.find_setlists("live", ignore_case=True) == [3]
+
+def test_name_index_presets():
+    helix = Helix()
+    index = helix.setlists.name_index
+
+    # empty preset slots are not indexed
+    assert index.find_presets(helix.setlists[0].presets[0].name) == []
+
+    helix.setlists[0].presets[4].name = "Clean Verb"
+    helix.setlists[1].presets[2].name = "Clean Dry"
+    helix.setlists[1].presets[9].name = "Lead"
+    assert index.find_presets("Clean Verb") == [(0, 4)]
+    assert index.find_presets("Clean", prefix=True) == [(0, 4), (1, 2)]
+    assert index.find_presets("CLEAN", prefix=True) == []
+    assert index.find_presets("CLEAN", prefix=True, ignore_case=True) == [(0, 4), (1, 2)]
+
+    # renaming moves the preset in the index
+    helix.setlists[0].presets[4].name = "Lead"
+    assert index.find_presets("Clean Verb") == []
+    assert index.find_presets("Lead") == [(0, 4), (1, 9)]
+
+def test_name_index_snapshots():
+    helix = Helix()
+    index = helix.setlists.name_index
+
+    # filling a preset slot indexes the preset and its snapshots
+    helix.setlists[2].presets[5].snapshots[3].name = "Solo"
+    assert index.find_snapshots("Solo") == [(2, 5, 3)]
+    assert index.find_presets(helix.setlists[2].presets[5].name) == [(2, 5)]
+
+    helix.setlists[2].presets.clone(5, 6)
+    assert index.find_snapshots("solo", ignore_case=True) == [(2, 5, 3), (2, 6, 3)]
+
+    helix.setlists[2].presets[6].reset_preset()
+    assert index.find_snapshots("Solo") == [(2, 5, 3)]
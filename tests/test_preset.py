@@ -3,6 +3,8 @@ import os
 from helixapi.helix import Helix
 from helixapi.utils.constants import MAX_PRESETS
 from helixapi.utils.standards import Standards
+from helixapi.utils.data_manager import _preset_view
+from helixapi.setlists import Setlists
 
 def test_preset_initialization():
     helix = Helix()
@@ -32,6 +34,53 @@ def test_preset_properties():
     assert preset.song == "My Song"
 
 
+def test_preset_empty_slots_not_filled():
+    helix = Helix()
+    presets = helix.bundle.data['setlists'][0]['presets']
+    assert not presets[5]
+
+    # reading presets of empty slots reads the shared template
+    names = [preset.name for preset in helix.setlists[0].presets]
+    assert names[5] == _preset_view()['data']['meta']['name']
+    assert helix.setlists[0].presets[5].author == ""
+    assert not any(presets)
+
+    # the first write fills the slot with a copy of the template
+    helix.setlists[0].presets[5].name = "Filled"
+    assert presets[5]['data']['meta']['name'] == "Filled"
+    assert _preset_view()['data']['meta']['name'] == names[5]
+    assert not presets[4] and not presets[6]
+
+
+def test_preset_author_default(author_settings):
+    helix = Helix()
+    preset = helix.setlists[0].presets[0]
+    assert preset.author == ""
+
+    # the author is written with the first change to the preset
+    preset.name = "Authored"
+    assert preset.author == "Settings Author"
+
+    # an explicit author is kept
+    preset = helix.setlists[0].presets[1]
+    preset.author = "Me"
+    preset.name = "Mine"
+    assert preset.author == "Me"
+
+
+def test_preset_author_overwrite(author_settings):
+    helix = Helix()
+    helix.setlists[0].presets[0].author = "Someone"
+
+    # a new preset object for the same data overwrites the author with its first change
+    author_settings["overwrite"] = True
+    helix.setlists = Setlists(data=helix.bundle.data)
+    preset = helix.setlists[0].presets[0]
+    assert preset.author == "Someone"
+    preset.song = "Song"
+    assert preset.author == "Settings Author"
+
+
 def test_preset_export(temp_dir):
     # Test export_preset method
     helix = Helix()
@@ -194,3 +243,26 @@ def test_preset_standardize(mock_standards_yaml):
     helix.setlists[0].presets[0].name = "New Preset"
     helix.setlists[0].presets[0].standardize()
     assert helix.setlists[0].presets[0].name == "Preset"
+
+
+def test_compiled_standards(mock_standards_yaml):
+    _ = Standards()
+    Standards._standards_cache = mock_standards_yaml
+
+    compiled = Standards().compile("preset")
+    assert compiled.apply("New_Preset") == "PRESET"
+    assert compiled.apply("clean") == "CLEAN"
+    # the results are memoized and the rules compiled once
+    assert compiled.apply.cache_info().hits == 0
+    assert Standards().apply("clean", "preset") == "CLEAN"
+    assert compiled.apply.cache_info().hits == 1
+    assert Standards().compile("preset") is compiled
+
+    # rules changed in place are compiled again
+    Standards._standards_cache['preset']['replacements']['Lead'] = ['solo']
+    assert Standards().compile("preset") is not compiled
+    assert Standards().apply("my solo", "preset") == "MY LEAD"
+
+    # patterns with groups are applied as they are
+    Standards._standards_cache['preset']['replacements'] = {r'\2 \1': [r'(\w+)-(\w+)']}
+    assert Standards().apply("Lead-Rhythm", "preset") == "RHYTHM LEAD"
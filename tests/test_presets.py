@@ -50,4 +50,77 @@ def test_presets_clone():
 
     helix.setlists[0].presets.clone(0, 1)
 
-    assert helix.setlists[0].presets[0].name == helix.setlists[0].presets[1].name
\ No newline at end of file
+    assert helix.setlists[0].presets[0].name == helix.setlists[0].presets[1].name
+
+def test_presets_clone_subtree():
+    helix = Helix()
+    presets = helix.bundle.data['setlists'][0]['presets']
+    helix.setlists[0].presets[0].name = "source"
+    target = helix.setlists[0].presets[2]
+
+    helix.setlists[0].presets.clone(0, 2)
+
+    # only the source preset is copied into the target slot, which keeps its index
+    assert presets[2] == presets[0] and presets[2] is not presets[0]
+    assert helix.setlists[0].presets[2] is target and target.index == 2
+    assert not presets[1]
+
+    helix.setlists[0].presets[0].name = "changed"
+    assert target.name == "source"
+
+def test_presets_import_parallel(temp_dir):
+    import os
+    helix = Helix()
+
+    file_paths = []
+    for index in range(4):
+        helix.setlists[0].presets[index].name = f"parallel {index}"
+        file_path = os.path.join(temp_dir, f"parallel_{index}.hlx")
+        helix.setlists[0].presets[index].export_preset(file_path=file_path)
+        file_paths.append(file_path)
+
+    # import in reverse order, presets must follow the order of the file paths
+    helix.setlists[1].presets.import_presets(list(reversed(file_paths)), max_workers=2)
+    assert [helix.setlists[1].presets[index].name for index in range(4)] == [f"parallel {index}" for index in reversed(range(4))]
+
+def test_presets_import_parallel_missing_file(temp_dir, preset_template_path):
+    import os
+    helix = Helix()
+    helix.setlists[0].presets[0].name = "changed"
+    helix.setlists[0].presets[1].name = "unchanged"
+
+    file_paths = [preset_template_path, os.path.join(temp_dir, "missing.hlx")]
+    with pytest.raises(Exception, match="File does not exist"):
+        helix.setlists[0].presets.import_presets(file_paths, max_workers=2)
+
+    # items before the failing file are imported, as with a serial import
+    assert helix.setlists[0].presets[0].name == "New Preset"
+    assert helix.setlists[0].presets[1].name == "unchanged"
+
+def test_presets_export_parallel(tmp_path):
+    import os
+    helix = Helix()
+    helix.setlists[0].presets[1].name = "renamed"
+
+    failures = helix.setlists[0].presets.export_presets(file_path=str(tmp_path), max_workers=2)
+    assert failures == {}
+
+    # presets with the same name get unique suffixes, as with a serial export
+    file_names = os.listdir(tmp_path)
+    assert len(file_names) == len(helix.setlists[0].presets)
+    assert "renamed.hlx" in file_names
+    assert "New Preset.hlx" in file_names
+    assert "New Preset (1).hlx" in file_names
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_presets_export_parallel_failures(tmp_path, max_workers):
+    import os
+    helix = Helix()
+
+    # a directory in the way of one file only fails that file, in either mode
+    os.mkdir(os.path.join(str(tmp_path), "preset_3.hlx"))
+    failures = helix.setlists[0].presets._export_files(str(tmp_path), generic_names=True, max_workers=max_workers)
+    assert list(failures) == [os.path.join(os.path.abspath(tmp_path), "preset_3.hlx")]
+    assert os.path.isfile(os.path.join(str(tmp_path), "preset_4.hlx"))
+    # and no temporary file is left behind
+    assert sorted(os.listdir(tmp_path)) == sorted(f"preset_{index}.hlx" for index in range(len(helix.setlists[0].presets)))
@@ -0,0 +1,52 @@
+import os
+import re
+import pytest
+from helixapi.helix import Helix
+from helixapi.preset import Preset
+from helixapi.query import Query, PresetRecord
+
+@pytest.fixture
+def helix():
+    helix = Helix()
+    presets = helix.setlists[0].presets
+    presets[0].name = "CLEAN 1"
+    presets[0].tempo = 100
+    presets[3].name = "LEAD 1"
+    presets[3].tempo = 140
+    presets[3].band = "My Band"
+    helix.setlists[2].presets[7].name = "CLEAN 2"
+    helix.setlists[2].presets[7].tempo = 120
+    return helix
+
+def test_query_presets(helix):
+    records = helix.query.presets(name=re.compile("^CLEAN"))
+    assert [(record.setlist_index, record.preset_index) for record in records] == [(0, 0), (2, 7)]
+    assert isinstance(records[0], PresetRecord)
+    assert records[1].name == "CLEAN 2" and records[1].tempo == 120 and records[1].file_path is None
+
+    # every filter must match, empty slots are skipped
+    assert [record.name for record in helix.query.presets(tempo_range=(110, None))] == ["LEAD 1", "CLEAN 2"]
+    assert [record.name for record in helix.query.presets(band="My Band", tempo_range=(100, 140))] == ["LEAD 1"]
+    assert helix.query.presets(name=lambda name: name.endswith("9")) == []
+    assert len(helix.query.presets()) == 3
+
+def test_query_presets_live(helix):
+    presets = helix.query.presets(name="LEAD 1", live=True)
+    assert presets == [helix.setlists[0].presets[3]]
+    assert isinstance(presets[0], Preset)
+
+    with pytest.raises(Exception):
+        Query.files([]).presets(live=True)
+
+def test_query_files(helix, tmp_path):
+    bundle_path = os.path.join(tmp_path, "query.hlb")
+    preset_path = os.path.join(tmp_path, "query.hlx")
+    helix.bundle.export_bundle(file_path=bundle_path)
+    helix.setlists[2].presets[7].export_preset(file_path=preset_path)
+
+    records = Query.files([bundle_path, preset_path]).presets(name=re.compile("CLEAN"))
+    assert [(record.file_path, record.setlist_index, record.preset_index, record.name) for record in records] == [
+        (bundle_path, 0, 0, "CLEAN 1"),
+        (bundle_path, 2, 7, "CLEAN 2"),
+        (preset_path, None, 0, "CLEAN 2"),
+    ]
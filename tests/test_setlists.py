@@ -47,3 +47,28 @@ def test_setlists_clone():
     helix.setlists.clone(0, 1)
 
     assert helix.setlists[0].name == helix.setlists[1].name
+
+def test_setlists_import_parallel(temp_dir, setlist_template_path):
+    import os
+    helix = Helix()
+
+    helix.setlists[0].name = "parallel"
+    file_path = os.path.join(temp_dir, "parallel_setlist.hls")
+    helix.setlists[0].export_setlist(file_path=file_path)
+
+    helix.setlists.import_setlists([setlist_template_path, file_path], max_workers=None)
+    assert helix.setlists[0].name == "SETLIST 1"
+    assert helix.setlists[1].name == "parallel"
+
+def test_setlists_lazy_items():
+    helix = Helix()
+
+    # only the active setlist (and its active preset) is created up front
+    assert [helix.setlists._items.is_created(index) for index in range(MAX_SETLISTS)] == [True] + [False] * (MAX_SETLISTS - 1)
+    assert helix.setlists[0].presets._items.created_count() == 1
+
+    # uncreated setlists keep their index when swapped
+    helix.setlists.swap(2, 3)
+    assert not helix.setlists._items.is_created(2)
+    assert [setlist.index for setlist in helix.setlists] == [0, 1, 3, 2, 4, 5, 6, 7]
+    assert helix.setlists._items.created_count() == MAX_SETLISTS
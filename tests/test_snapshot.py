@@ -20,8 +20,10 @@ def test_snapshot_properties():
     snapshot.name = "Test snapshot"
     assert snapshot.name == "Test snapshot"
 
+    assert snapshot.ledcolor == LEDColor.AUTO
     snapshot.ledcolor = LEDColor.RED
     assert snapshot.ledcolor == LEDColor.RED
+    assert snapshot._get_data("ledcolor") == LEDColor.RED.value
 
 def test_snapshot_active():
     helix = Helix()